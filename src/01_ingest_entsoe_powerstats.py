@@ -1,69 +1,278 @@
-﻿import glob
+﻿import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+from collections import Counter
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from instrument import stage, step
+from timeparse import DateUTCParser
+from zones import LOAD_STORE
 
 IN_GLOB = r"data/raw/entsoe/monthly_hourly_load_values_*.csv"
-OUT_PATH = r"data/processed/entsoe_ro_hourly.parquet"
-
-def read_entsoe_file(path: str) -> pd.DataFrame:
-    # încearcă tab, apoi ;, apoi ,
-    for sep in ["\t", ";", ","]:
-        try:
-            df = pd.read_csv(path, sep=sep, encoding="utf-8-sig")
-            # dacă separatorul e corect, ar trebui să avem coloana CountryCode
-            if "CountryCode" in df.columns and "DateUTC" in df.columns and "Value" in df.columns:
-                return df
-        except Exception:
-            pass
-
-    # fallback: dacă e o singură coloană cu header cu ';', repară prin split
-    df0 = pd.read_csv(path, encoding="utf-8-sig")
-    if df0.shape[1] == 1:
-        col = df0.columns[0]
-        if ";" in col:
-            df = pd.read_csv(path, sep=";", encoding="utf-8-sig")
-            return df
-
-    raise RuntimeError(f"Nu pot detecta separatorul corect pentru: {path}. Columns={list(df0.columns)}")
+STORE_DIR = LOAD_STORE
+# câte un part per (fișier sursă, zone, year, month), ca un fișier schimbat să poată fi înlocuit exact;
+# store-ul citit de 03/09 are un singur part per partiție, reconstruit din acestea fără ore dublate
+PARTS_DIR = r"data/processed/entsoe_parts"
+MANIFEST_PATH = r"data/processed/entsoe_manifest.json"
+# versiunea structurii store + manifest; alta -> reprocesare completă
+LAYOUT = 2
+
+# None = toate țările din fișiere (fiecare devine o zonă); --zones RO DE ... restrânge lista
+COUNTRIES = None
+USECOLS = ["CountryCode", "DateUTC", "Value"]
+SEPARATORS = ["\t", ";", ","]
+SNIFF_BYTES = 64 * 1024
+CHUNK_ROWS = 500_000
+HASH_BLOCK = 1024 * 1024
+
+OUT_SCHEMA = pa.schema([("time", pa.timestamp("ns")), ("load_mw", pa.float64())])
+
+def sniff_sep(path: str) -> str:
+    # citim doar primii octeți și alegem separatorul după linia de header
+    with open(path, "rb") as fh:
+        head = fh.read(SNIFF_BYTES).decode("utf-8-sig", errors="replace")
+    header = head.splitlines()[0] if head else ""
+
+    for sep in SEPARATORS:
+        cols = [c.strip().strip('"') for c in header.split(sep)]
+        if all(c in cols for c in USECOLS):
+            return sep
+
+    raise RuntimeError(f"Nu pot detecta separatorul corect pentru: {path}. Header={header[:200]!r}")
+
+def read_entsoe_file(path: str, usecols=None) -> pd.DataFrame:
+    # un singur read_csv, cu separatorul detectat din header
+    sep = sniff_sep(path)
+    return pd.read_csv(path, sep=sep, encoding="utf-8-sig", usecols=usecols)
+
+def iter_entsoe_chunks(path: str, countries=COUNTRIES, chunksize: int = CHUNK_ROWS):
+    # citire pe bucăți, doar coloanele necesare; dacă sunt cerute anumite țări, filtrăm înainte de parsare
+    sep = sniff_sep(path)
+    reader = pd.read_csv(
+        path, sep=sep, encoding="utf-8-sig",
+        usecols=USECOLS, dtype=str, chunksize=chunksize,
+    )
+    for chunk in reader:
+        chunk["CountryCode"] = chunk["CountryCode"].str.strip().str.upper()
+        if countries is not None:
+            chunk = chunk[chunk["CountryCode"].isin(countries)]
+        if len(chunk):
+            yield chunk
+
+def parse_chunk(df: pd.DataFrame, parser: DateUTCParser, key=None) -> pd.DataFrame:
+    # formatul DateUTC e detectat o dată per fișier și refolosit pe toate bucățile lui
+    out = pd.DataFrame({
+        "zone": df["CountryCode"],
+        "time": parser.parse(df["DateUTC"], key=key),
+        "load_mw": pd.to_numeric(df["Value"], errors="coerce"),
+    })
+    return out.dropna(subset=["zone", "time", "load_mw"])
+
+def ingest_file(path: str, countries=COUNTRIES, chunksize: int = CHUNK_ROWS, parser=None) -> pd.DataFrame:
+    # un fișier lunar are câteva zeci de mii de rânduri (toate țările) -> îl putem ține întreg
+    parser = parser or DateUTCParser()
+    parts = [parse_chunk(c, parser, key=path) for c in iter_entsoe_chunks(path, countries, chunksize)]
+    if not parts:
+        return pd.DataFrame({"zone": pd.Series(dtype=str), "time": pd.Series(dtype="datetime64[ns]"),
+                             "load_mw": pd.Series(dtype="float64")})
+    df = pd.concat(parts, ignore_index=True)
+    return df.sort_values(["zone", "time"]).drop_duplicates().reset_index(drop=True)
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
 
+def load_manifest(path: str = MANIFEST_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"files": {}}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+def save_manifest(manifest: dict, path: str = MANIFEST_PATH):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def file_changed(path: str, entry) -> tuple:
+    # (schimbat?, hash) - dacă size și mtime coincid nu mai citim fișierul deloc
+    st = os.stat(path)
+    if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+        return False, entry["sha256"]
+    digest = file_sha256(path)
+    return (entry is None or entry["sha256"] != digest), digest
+
+def covers(have, want) -> bool:
+    # zonele deja ingerate dintr-un fișier (None = toate) acoperă cererea curentă (None = toate)?
+    return have is None or (want is not None and set(want) <= set(have))
+
+def union_zones(a, b):
+    return None if a is None or b is None else sorted(set(a) | set(b))
+
+def remove_parts(entry, parts_dir: str = PARTS_DIR, zones=None) -> set:
+    # part-urile fișierului (doar ale zonelor date, None = toate) -> șterse și scoase din intrare;
+    # întoarce partițiile atinse (zone=/year=/month=), ca să fie reconstruite în store
+    touched = set()
+    parts = (entry or {}).get("parts", {})
+    for rel in list(parts):
+        if zones is not None and rel.split("/")[0].split("=")[1] not in zones:
+            continue
+        part = os.path.join(parts_dir, rel)
+        if os.path.exists(part):
+            os.remove(part)
+        touched.add(os.path.dirname(rel))
+        del parts[rel]
+    return touched
+
+def write_parts(path: str, df: pd.DataFrame, parts_dir: str = PARTS_DIR) -> dict:
+    # un fișier sursă -> câte un part per (zone, year, month), numit după fișierul sursă,
+    # ca să-l putem înlocui/șterge exact când sursa se schimbă
+    stem = os.path.splitext(os.path.basename(path))[0]
+    parts = {}
+    keys = df["time"].dt.year * 100 + df["time"].dt.month
+    for (zone, key), grp in df.groupby([df["zone"], keys], sort=True):
+        rel = os.path.join(f"zone={zone}", f"year={key // 100}", f"month={key % 100:02d}", f"{stem}.parquet")
+        out = os.path.join(parts_dir, rel)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(grp, schema=OUT_SCHEMA, preserve_index=False), out)
+        parts[rel.replace(os.sep, "/")] = len(grp)
+    return parts
+
+def merge_partitions(partitions, parts_dir: str = PARTS_DIR, store_dir: str = STORE_DIR) -> int:
+    # fiecare partiție atinsă -> <store>/zone=/year=/month=/part-0.parquet din toate part-urile ei.
+    # Fișiere sursă suprapuse (re-exporturi, corecții): o oră prezentă în mai multe fișiere se ia doar din
+    # fișierul cu numele cel mai mare (ultimul export). Dublurile din interiorul unui fișier rămân, pentru
+    # raportul din 05 și repararea din 03/09. Întoarce numărul de rânduri eliminate.
+    dropped = 0
+    for rel in sorted(partitions):
+        out_dir = os.path.join(store_dir, rel)
+        files = sorted(glob.glob(os.path.join(parts_dir, rel, "*.parquet")))
+        if not files:
+            shutil.rmtree(out_dir, ignore_errors=True)
+            continue
+        df = pd.concat([pq.read_table(f).to_pandas().assign(src=i) for i, f in enumerate(files)], ignore_index=True)
+        merged = df[df["src"] == df.groupby("time")["src"].transform("max")].sort_values("time", kind="stable")
+        dropped += len(df) - len(merged)
+        os.makedirs(out_dir, exist_ok=True)
+        out = os.path.join(out_dir, "part-0.parquet")
+        pq.write_table(pa.Table.from_pandas(merged.drop(columns="src"), schema=OUT_SCHEMA, preserve_index=False),
+                       out + ".tmp")
+        os.replace(out + ".tmp", out)
+    return dropped
+
+@stage("01_ingest")
 def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--full", action="store_true",
+                    help="ignoră manifestul și reprocesează toate fișierele (cu --zones: doar zonele acelea)")
+    ap.add_argument("--zones", nargs="+", default=None,
+                    help="doar aceste țări (implicit toate); zonele ingerate anterior rămân în store")
+    args = ap.parse_args()
+    countries = set(z.upper() for z in args.zones) if args.zones else COUNTRIES
+
     files = sorted(glob.glob(IN_GLOB))
     if not files:
         raise FileNotFoundError(f"Nu găsesc fișiere: {IN_GLOB}")
 
-    dfs = []
-    for f in files:
-        df = read_entsoe_file(f)
-        df["__file"] = f
-        dfs.append(df)
+    manifest = load_manifest()
+    # manifest scris pentru alt store (ex. vechiul entsoe_ro_hourly) sau altă structură, ori --full fără
+    # --zones -> reprocesare completă. Cu --zones, doar zonele cerute se reprocesează; celelalte rămân.
+    wipe = (manifest.get("store") != STORE_DIR or manifest.get("layout") != LAYOUT
+            or (args.full and countries is None))
+    if wipe:
+        manifest = {"files": {}}
+        for d in (STORE_DIR, PARTS_DIR):
+            shutil.rmtree(d, ignore_errors=True)
+    # zonele ingerate se țin per fișier ("zones", None = toate); manifestele vechi le aveau global
+    legacy = manifest.pop("zones", None) or None
+    for entry in manifest["files"].values():
+        entry.setdefault("zones", legacy)
+    manifest.update(store=STORE_DIR, layout=LAYOUT)
+    os.makedirs(STORE_DIR, exist_ok=True)
+
+    known = manifest["files"]
+    current = {os.path.normpath(f).replace(os.sep, "/") for f in files}
+    touched = set()
 
-    df = pd.concat(dfs, ignore_index=True)
+    # fișiere dispărute din sursă -> scoatem și partițiile lor
+    for key in sorted(set(known) - current):
+        touched |= remove_parts(known.pop(key))
+        print("Removed:", key)
 
-    # România
-    df = df[df["CountryCode"].astype(str).str.upper() == "RO"].copy()
+    parser = DateUTCParser()
+    processed, skipped = 0, 0
+    for f in files:
+        key = os.path.normpath(f).replace(os.sep, "/")
+        entry = known.get(key)
+        changed, digest = file_changed(f, entry)
+        st = os.stat(f)
+        have = entry["zones"] if entry else []
 
-    # parse datetime (ex: 01-01-2019 00:00 sau 10/08/2021 00:00)
-    # încercăm întâi zi-lună-an, apoi zi/lună/an
-    dt = pd.to_datetime(df["DateUTC"], format="%d-%m-%Y %H:%M", errors="coerce")
-    dt2 = pd.to_datetime(df["DateUTC"], format="%d/%m/%Y %H:%M", errors="coerce")
-    df["time"] = dt.fillna(dt2)
+        if changed:
+            # conținut nou -> toate zonele ingerate până acum din fișier, plus cele cerute acum
+            want, drop = union_zones(have, countries), None
+        elif args.full:
+            want = drop = countries
+        elif covers(have, countries):
+            # doar mtime s-a schimbat (ex. copiere) -> actualizăm manifestul fără reprocesare
+            entry["mtime"] = st.st_mtime
+            skipped += 1
+            continue
+        else:
+            # fișier neschimbat, dar cu zone cerute acum pentru prima dată -> doar acestea
+            want = None if countries is None else sorted(set(countries) - set(have))
+            drop = want
 
-    df["load_mw"] = pd.to_numeric(df["Value"], errors="coerce")
+        entry = entry if entry and not changed else {"zones": [], "parts": {}}
+        touched |= remove_parts(known.get(key), zones=drop)
+        with step("ingest_file") as rec:
+            out = ingest_file(f, countries=want, parser=parser)
+            parts = write_parts(f, out) if not out.empty else {}
+            touched |= {os.path.dirname(rel) for rel in parts}
+            rec.update(rows=len(out), file=key)
+        entry["parts"].update(parts)
+        entry.update(size=st.st_size, mtime=st.st_mtime, sha256=digest,
+                     rows=int(sum(entry["parts"].values())), zones=union_zones(entry["zones"], want))
+        known[key] = entry
+        processed += 1
+        print(f"Ingested: {key} rows={len(out)} zones={out['zone'].nunique()}")
 
-    df = df.dropna(subset=["time", "load_mw"]).sort_values("time")
+    with step("merge", rows=len(touched)):
+        dropped = merge_partitions(touched)
+    save_manifest(manifest)
 
-    out = df[["time", "load_mw"]].drop_duplicates()
+    # valori DateUTC care nu se potrivesc cu niciun format cunoscut
+    rep = parser.report()
+    bad = rep[rep["unknown"] > 0]
+    if len(bad):
+        print("\nUnknown DateUTC formats (rows dropped):")
+        print(bad[["key", "format", "rows", "unknown", "examples"]].to_string(index=False))
 
-    # coverage pe ani
-    out["year"] = out["time"].dt.year
-    print("Hourly rows per year (RO):")
-    print(out.groupby("year")["time"].count().sort_index())
+    # coverage pe zone și ani, direct din manifest (fără să recitim store-ul; rânduri din surse, înainte de merge)
+    per_year = Counter()
+    for entry in known.values():
+        for rel, n in entry["parts"].items():
+            zone, year = (p.split("=")[1] for p in rel.split("/")[:2])
+            per_year[(zone, int(year))] += n
 
-    out = out.drop(columns=["year"])
-    out.to_parquet(OUT_PATH, index=False)
+    print("Hourly rows per zone and year:")
+    counts = pd.Series(per_year, dtype="int64")
+    if len(counts):
+        print(counts.rename_axis(["zone", "year"]).unstack(fill_value=0).to_string())
 
-    print("\nSaved:", OUT_PATH)
-    print("Rows:", len(out))
-    print("Time range:", out["time"].min(), "->", out["time"].max())
+    print("\nSaved:", STORE_DIR)
+    print("Files processed:", processed, "| unchanged:", skipped, "| partitions rebuilt:", len(touched),
+          "| rows overlapping a later file dropped:", dropped)
+    print("Zones:", len({z for z, _ in per_year}), "| rows:", sum(per_year.values()))
 
 if __name__ == "__main__":
     main()
@@ -1,39 +1,57 @@
-﻿import requests
+﻿import argparse
+import os
+
 import pandas as pd
 
-LAT, LON = 44.4268, 26.1025
+from instrument import stage, step
+from openmeteo import ARCHIVE_URL, CACHE_DIR, OpenMeteoFetcher
+from zones import STATIONS_DIR, parse_zones, station_zones, stations_list
+
+OUT_DIR = STATIONS_DIR
+# fișierul vechi, cu o singură stație, folosit de 03 când nu există stațiile
+LEGACY_STATION = "bucuresti"
+LEGACY_OUT = "data/raw/openmeteo/openmeteo_bucharest_hourly.parquet"
+
 START = "2019-01-01"
 END   = "2023-12-31"
-TIMEZONE = "Europe/Bucharest"
 
+@stage("02_fetch")
 def main():
-    url = "https://archive-api.open-meteo.com/v1/archive"
-    params = {
-        "latitude": LAT,
-        "longitude": LON,
-        "start_date": START,
-        "end_date": END,
-        "hourly": "temperature_2m,precipitation,windspeed_10m,relative_humidity_2m",
-        "timezone": TIMEZONE
-    }
-
-    r = requests.get(url, params=params, timeout=120)
-    r.raise_for_status()
-    data = r.json()
-
-    df = pd.DataFrame({
-        "time": pd.to_datetime(data["hourly"]["time"]),
-        "temp_c": data["hourly"]["temperature_2m"],
-        "precip_mm": data["hourly"]["precipitation"],
-        "wind_ms": data["hourly"]["windspeed_10m"],
-        "rh_pct": data["hourly"]["relative_humidity_2m"],
-    })
-
-    out = "data/raw/openmeteo/openmeteo_bucharest_hourly.parquet"
-    df.to_parquet(out, index=False)
-    print("Saved:", out, "rows=", len(df))
-    print(df.head(3))
-    print(df.tail(3))
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--zones", nargs="+", default=None, help="zonele ale căror stații se descarcă (implicit toate)")
+    ap.add_argument("--stations", default=None, help="o listă de stații anume, în locul listelor pe zone")
+    ap.add_argument("--start", default=START)
+    ap.add_argument("--end", default=END)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--years-per-request", type=int, default=1)
+    ap.add_argument("--base-url", default=ARCHIVE_URL, help="ex. un server HTTP local pentru teste offline")
+    ap.add_argument("--cache-dir", default=CACHE_DIR)
+    ap.add_argument("--offline", action="store_true", help="doar din cache, fără cereri HTTP")
+    args = ap.parse_args()
+
+    # o stație aflată în listele mai multor zone se descarcă o singură dată
+    lists = [args.stations] if args.stations else [stations_list(z) for z in parse_zones(args.zones, station_zones())]
+    stations = pd.concat([pd.read_csv(p) for p in lists], ignore_index=True).drop_duplicates("station")
+    print(f"Stations: {len(stations)} from {len(lists)} list(s)")
+    fetcher = OpenMeteoFetcher(
+        base_url=args.base_url,
+        cache_dir=args.cache_dir,
+        max_workers=args.workers,
+        offline=args.offline,
+    )
+    with step("fetch") as rec:
+        frames = fetcher.fetch_many(stations, args.start, args.end, years_per_chunk=args.years_per_request)
+        rec.update(rows=sum(len(df) for df in frames.values()), http=fetcher.misses, cached=fetcher.hits)
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    for station, df in frames.items():
+        out = os.path.join(OUT_DIR, f"{station}.parquet")
+        df.to_parquet(out, index=False)
+        print("Saved:", out, "rows=", len(df))
+        if station == LEGACY_STATION:
+            df.to_parquet(LEGACY_OUT, index=False)
+
+    print(f"\nRequests: {fetcher.misses} HTTP, {fetcher.hits} from cache ({args.cache_dir})")
 
 if __name__ == "__main__":
     main()
@@ -1,30 +1,25 @@
-﻿import pandas as pd
-
-ENTSOE_IN = "data/processed/entsoe_ro_hourly.parquet"
-METEO_IN  = "data/raw/openmeteo/openmeteo_bucharest_hourly.parquet"
-OUT_PARQUET = "data/final/dataset_daily.parquet"
-OUT_CSV     = "data/final/dataset_daily.csv"
-
-def main():
-    load = pd.read_parquet(ENTSOE_IN)
-    load["time"] = pd.to_datetime(load["time"])
-    load = load.sort_values("time").set_index("time")
-
-    # Consum zilnic: medie MW
-    load_daily = load["load_mw"].resample("D").mean().to_frame("load_mw_daily_mean")
-
-    meteo = pd.read_parquet(METEO_IN)
-    meteo["time"] = pd.to_datetime(meteo["time"])
-    meteo = meteo.sort_values("time").set_index("time")
-
-    meteo_daily = pd.DataFrame({
-        "temp_c_mean": meteo["temp_c"].resample("D").mean(),
-        "temp_c_min":  meteo["temp_c"].resample("D").min(),
-        "temp_c_max":  meteo["temp_c"].resample("D").max(),
-        "precip_mm_sum": meteo["precip_mm"].resample("D").sum(),
-        "wind_ms_mean": meteo["wind_ms"].resample("D").mean(),
-        "rh_pct_mean": meteo["rh_pct"].resample("D").mean(),
-    })
+﻿import argparse
+
+import pandas as pd
+
+from daily import daily_load, daily_meteo
+from hourly import read_hourly_load, read_hourly_meteo
+from instrument import stage, step
+from storage import DAILY_ROW_GROUP, daily_store, read_range, write_partitioned
+from zones import available_zones, map_zones, parse_zones
+
+def build_zone(zone: str) -> dict:
+    # o singură grupare pe zi per sursă; agregatele extra se configurează în daily.DAILY_EXTRAS
+    with step("load") as rec:
+        load = read_hourly_load(zone=zone)
+        rec.update(rows=len(load), zone=zone)
+    with step("meteo") as rec:
+        meteo = read_hourly_meteo(zone=zone)
+        rec.update(rows=len(meteo), zone=zone)
+    with step("aggregate") as rec:
+        load_daily = daily_load(load)
+        meteo_daily = daily_meteo(meteo)
+        rec.update(rows=len(load_daily), zone=zone)
 
     df = load_daily.join(meteo_daily, how="inner").reset_index().rename(columns={"time": "date"})
     df["weekday"] = df["date"].dt.weekday
@@ -32,12 +27,31 @@ def main():
     df["year"] = df["date"].dt.year
     df["is_weekend"] = (df["weekday"] >= 5).astype(int)
 
-    df.to_parquet(OUT_PARQUET, index=False)
-    df.to_csv(OUT_CSV, index=False)
+    out = daily_store(zone)
+    with step("write", rows=len(df)) as rec:
+        rec["zone"] = zone
+        write_partitioned(df, out, "date", DAILY_ROW_GROUP)
+    return {"zone": zone, "path": out, "rows": len(df), "years": df["year"].nunique(),
+            "start": df["date"].min().date(), "end": df["date"].max().date()}
 
-    print("Saved:", OUT_PARQUET, "rows=", len(df))
-    print(df.head(3))
-    print(df.tail(3))
+@stage("03_daily")
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--zones", nargs="+", default=None,
+                    help="implicit: toate zonele cu consum ingerat și listă de stații")
+    ap.add_argument("--workers", type=int, default=None, help="procese (câte o zonă per proces)")
+    args = ap.parse_args()
+
+    zones = parse_zones(args.zones, available_zones())
+    if not zones:
+        raise FileNotFoundError("Nicio zonă cu consum ingerat (01) și listă de stații (stations_<zonă>.csv)")
+
+    summary = pd.DataFrame(map_zones(build_zone, zones, args.workers).values())
+    print(summary.to_string(index=False))
+    if len(zones) == 1:
+        df = read_range(summary["path"].iloc[0], "date")
+        print(df.head(3))
+        print(df.tail(3))
 
 if __name__ == "__main__":
     main()
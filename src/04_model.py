@@ -4,39 +4,28 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 
-FEATURES = [
-    "temp_c_mean","temp_c_min","temp_c_max",
-    "precip_mm_sum","wind_ms_mean","rh_pct_mean",
-    "weekday","month","is_weekend"
-]
-TARGET = "load_mw_daily_mean"
+from cache import fit_model, load_split
+from features import FEATURES, TARGET
+from instrument import stage, step
 
+@stage("04_model")
 def main():
-    df = pd.read_parquet("data/final/dataset_daily.parquet")
+    # split-ul (feature-uri, fără NaN, test = ultimul an) și modelele vin din cache dacă datele nu s-au schimbat
+    with step("load_split") as rec:
+        split = load_split()
+        rec["rows"] = len(split["train"]) + len(split["test"])
+    train, test = split["train"], split["test"]
+    print(f"Train rows: {len(train)}, test rows: {len(test)} (test year {split['test_year']})")
 
-    # Curățare: elimină rândurile unde target sau oricare feature este NaN
-    keep_cols = ["year"] + FEATURES + [TARGET]
-    before = len(df)
-    df = df.dropna(subset=keep_cols).copy()
-    after = len(df)
-    print(f"Dropped rows with NaN: {before - after} (remaining {after})")
+    X_test, y_test = test[FEATURES], test[TARGET]
 
-    y = df[TARGET]
-    X = df[FEATURES]
+    with step("LinearRegression", rows=len(train)):
+        lr = fit_model(LinearRegression(), split)
+        pred_lr = lr.predict(X_test)
 
-    # test = ultimul an
-    last_year = df["year"].max()
-    train_mask = df["year"] < last_year
-
-    X_train, y_train = X[train_mask], y[train_mask]
-    X_test,  y_test  = X[~train_mask], y[~train_mask]
-
-    lr = LinearRegression().fit(X_train, y_train)
-    pred_lr = lr.predict(X_test)
-
-    rf = RandomForestRegressor(n_estimators=400, random_state=42)
-    rf.fit(X_train, y_train)
-    pred_rf = rf.predict(X_test)
+    with step("RandomForest", rows=len(train)):
+        rf = fit_model(RandomForestRegressor(n_estimators=400, random_state=42), split)
+        pred_rf = rf.predict(X_test)
 
     def report(name, pred):
         mae = mean_absolute_error(y_test, pred)
@@ -46,7 +35,7 @@ def main():
     report("LinearRegression", pred_lr)
     report("RandomForest", pred_rf)
 
-    imp = pd.Series(rf.feature_importances_, index=X.columns).sort_values(ascending=False)
+    imp = pd.Series(rf.feature_importances_, index=FEATURES).sort_values(ascending=False)
     print("\\nTop feature importances (RF):")
     print(imp.head(10))
 
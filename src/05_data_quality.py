@@ -0,0 +1,81 @@
+﻿import argparse
+import json
+
+import pandas as pd
+
+from hourly import read_hourly_load, read_hourly_meteo
+from instrument import stage, step
+from quality import LIMITS, QUALITY_CONFIG, save_config, validate_and_repair
+from weather import WEATHER_VARS
+
+COVERAGE_OUT = "results/quality_coverage.csv"
+ISSUES_OUT = "results/quality_issues.csv"
+SUMMARY_OUT = "results/quality_summary.json"
+
+def parse_limits(items) -> dict:
+    limits = dict(LIMITS)
+    for item in items or []:
+        col, hours = item.split("=")
+        limits[col] = int(hours)
+    return limits
+
+@stage("05_quality")
+def main():
+    ap = argparse.ArgumentParser(description="validare + reparare pe seriile orare (după ingest, înainte de 03/09)")
+    ap.add_argument("--limit", action="append", metavar="COL=ORE",
+                    help="gol maxim completat prin interpolare, ex. --limit load_mw=6 (implicit quality.LIMITS); "
+                         "salvat și folosit de 03/09")
+    ap.add_argument("--drop-outliers", action="store_true",
+                    help="scoate și outlierii de consum (quality.OUTLIER_Z) și îi completează ca pe goluri; "
+                         "implicit sunt doar raportați")
+    args = ap.parse_args()
+    limits = parse_limits(args.limit)
+
+    with step("read") as rec:
+        sources = {
+            "load": read_hourly_load(repair=False)[["time", "load_mw"]],
+            "meteo": read_hourly_meteo(repair=False)[["time"] + WEATHER_VARS],
+        }
+        rec["rows"] = sum(len(df) for df in sources.values())
+
+    coverage, issues, summary = [], [], {"limits": limits, "drop_outliers": args.drop_outliers}
+    for name, df in sources.items():
+        with step(f"validate_{name}", rows=len(df)):
+            repaired, iss, cov = validate_and_repair(df, limits=limits, drop_outliers=args.drop_outliers)
+        coverage.append(cov.assign(source=name))
+        issues.append(iss.assign(source=name))
+
+        counts = iss.groupby("kind")["hours"].agg(["count", "sum"])
+        summary[name] = {
+            "rows_in": int(len(df)),
+            "hours_grid": int(len(repaired)),
+            "start": str(repaired["time"].iloc[0]),
+            "end": str(repaired["time"].iloc[-1]),
+            "issues": {k: {"runs": int(r["count"]), "hours": int(r["sum"])} for k, r in counts.iterrows()},
+            "missing_after_repair": {c: int(repaired[c].isna().sum()) for c in repaired.columns.drop("time")},
+        }
+
+        print(f"\n[{name}] {len(df)} rows -> {len(repaired)} hours ({summary[name]['start']} .. {summary[name]['end']})")
+        print(counts.rename(columns={"count": "runs", "sum": "hours"}).to_string() if len(counts) else "no issues")
+        print("Missing after repair:", summary[name]["missing_after_repair"])
+
+    coverage = pd.concat(coverage, ignore_index=True)
+    coverage = coverage[["source"] + list(coverage.columns.drop("source"))]
+    issues = pd.concat(issues, ignore_index=True)
+    issues = issues[["source"] + list(issues.columns.drop("source"))]
+    coverage.to_csv(COVERAGE_OUT, index=False)
+    issues.to_csv(ISSUES_OUT, index=False)
+    with open(SUMMARY_OUT, "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+    save_config(limits, args.drop_outliers)
+
+    low = coverage[coverage["coverage_pct"] < 100]
+    print("\nMonths with remaining gaps:")
+    print(low[["source", "column", "year", "month", "missing_hours", "coverage_pct"]].to_string(index=False) if len(low) else "none")
+    print("\nSaved:", COVERAGE_OUT)
+    print("Saved:", ISSUES_OUT)
+    print("Saved:", SUMMARY_OUT)
+    print("Saved:", QUALITY_CONFIG, "(setările folosite de 03/09)")
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,29 @@
 import numpy as np
 from sklearn.metrics import mean_absolute_error, mean_squared_error
 
-def main():
-    df = pd.read_parquet('data/final/dataset_daily.parquet')
-    df['date'] = pd.to_datetime(df['date'])
+from cache import load_split
+from calendar_table import N_DAY_TYPES, fill_day_types
+from instrument import stage, step
 
-    last_year = df['year'].max()
-    train = df[df['year'] < last_year].copy()
-    test  = df[df['year'] == last_year].copy()
+@stage("06_baseline")
+def main():
+    # același split ca 04/07/08 (din cache)
+    with step("load_split") as rec:
+        split = load_split()
+        rec["rows"] = len(split["train"]) + len(split["test"])
+    train, test = split['train'], split['test']
 
-    # Baseline 1: medie pe (month, weekday) din train
-    grp = train.groupby(['month','weekday'])['load_mw_daily_mean'].mean()
-    pred = test.set_index(['month','weekday']).index.map(grp).to_numpy()
+    # Baseline 1: medie pe (month, day_type) din train; day_type = ziua săptămânii, sărbătoare sau zi punte
+    with step("baseline", rows=len(test)):
+        grp = train.groupby(['month','day_type'])['load_mw_daily_mean'].mean()
+        means = np.full((13, N_DAY_TYPES), np.nan)
+        means[grp.index.get_level_values(0), grp.index.get_level_values(1)] = grp.to_numpy()
+        pred = fill_day_types(means)[test['month'].to_numpy(dtype=int), test['day_type'].to_numpy(dtype=int)]
 
     mae = mean_absolute_error(test['load_mw_daily_mean'], pred)
     rmse = np.sqrt(mean_squared_error(test['load_mw_daily_mean'], pred))
 
-    print(f"Baseline (month+weekday mean): MAE={mae:.2f}, RMSE={rmse:.2f}")
+    print(f"Baseline (month+day type mean): MAE={mae:.2f}, RMSE={rmse:.2f}")
 
 if __name__ == '__main__':
     main()
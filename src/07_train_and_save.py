@@ -1,44 +1,89 @@
-﻿import pandas as pd
-import joblib
-from sklearn.ensemble import RandomForestRegressor
+﻿import argparse
+import os
+import shutil
+from functools import partial
 
-FEATURES = [
-    "temp_c_mean","temp_c_min","temp_c_max",
-    "precip_mm_sum","wind_ms_mean","rh_pct_mean",
-    "weekday","month","is_weekend"
-]
-TARGET = "load_mw_daily_mean"
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error
 
-def main():
-    df = pd.read_parquet("data/final/dataset_daily.parquet")
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.dropna(subset=FEATURES + [TARGET, "year"]).copy()
+from cache import fit_model, load_split
+from features import FEATURES, TARGET
+from forest import export_forest
+from instrument import stage, step
+from storage import daily_zones
+from tuning import final_estimator
+from zones import map_zones, model_paths, parse_zones
 
-    last_year = df["year"].max()
-    train = df[df["year"] < last_year].copy()
-    test  = df[df["year"] == last_year].copy()
+# modelul fiecărei zone: models/rf_model.joblib (zona implicită) sau models/zones/zone=XX/rf_model.joblib,
+# plus aceeași pădure aplatizată în array-uri .npy (memory-mapped de dashboard), în rf_model_flat/
+ZONE_METRICS_OUT = "results/zone_metrics.csv"
 
-    X_train, y_train = train[FEATURES], train[TARGET]
-    X_test,  y_test  = test[FEATURES],  test[TARGET]
+def train_zone(zone: str, n_jobs: int = -1) -> dict:
+    model_out, flat_out = model_paths(zone)
+    with step("load_split") as rec:
+        split = load_split(zone=zone)
+        rec.update(rows=len(split["train"]) + len(split["test"]), zone=zone)
+    train, test = split["train"], split["test"]
+    last_year = split["test_year"]
 
-    model = RandomForestRegressor(
-        n_estimators=500,
-        random_state=42,
-        n_jobs=-1
-    )
-    model.fit(X_train, y_train)
+    # configurația din results/best_config.json (13_tune.py), altfel RF-ul implicit
+    model_name, estimator = final_estimator()
+    if "n_jobs" in estimator.get_params():
+        estimator.set_params(n_jobs=n_jobs)
+    with step("fit", rows=len(train)) as rec:
+        model = fit_model(estimator, split)
+        rec.update(model=model_name, zone=zone)
 
     payload = {
         "model": model,
+        "model_name": model_name,
+        "zone": zone,
         "features": FEATURES,
         "target": TARGET,
         "train_years": sorted(train["year"].unique().tolist()),
         "test_year": int(last_year),
     }
-    joblib.dump(payload, "models/rf_model.joblib")
-    print("Saved model -> models/rf_model.joblib")
-    print("Train years:", payload["train_years"], "Test year:", payload["test_year"])
-    print("Train rows:", len(train), "Test rows:", len(test))
+    os.makedirs(os.path.dirname(model_out), exist_ok=True)
+    with step("save"):
+        joblib.dump(payload, model_out)
+
+    if model_name == "RandomForest":
+        with step("export_flat"):
+            export_forest(model, flat_out, meta={k: v for k, v in payload.items() if k != "model"})
+    elif os.path.isdir(flat_out):
+        # formatul aplatizat e doar pentru păduri; altfel dashboard-ul ar încărca modelul vechi
+        shutil.rmtree(flat_out)
+
+    pred = model.predict(test[FEATURES])
+    return {
+        "zone": zone, "model": model_name, "path": model_out,
+        "train_years": f"{payload['train_years'][0]}-{payload['train_years'][-1]}", "test_year": payload["test_year"],
+        "n_train": len(train), "n_test": len(test),
+        "MAE": mean_absolute_error(test[TARGET], pred),
+        "RMSE": float(np.sqrt(mean_squared_error(test[TARGET], pred))),
+    }
+
+@stage("07_train")
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--zones", nargs="+", default=None, help="implicit: toate zonele cu set zilnic (03)")
+    ap.add_argument("--workers", type=int, default=None, help="procese (câte o zonă per proces)")
+    args = ap.parse_args()
+
+    zones = parse_zones(args.zones, daily_zones())
+    # o zonă -> toate nucleele în pădure; mai multe -> paralelism între zone, câte un fir per model
+    fn = partial(train_zone, n_jobs=-1 if len(zones) == 1 else 1)
+    summary = pd.DataFrame(map_zones(fn, zones, args.workers).values())
+
+    for r in summary.itertuples():
+        print(f"[{r.zone}] {r.model} -> {r.path} | train {r.train_years} ({r.n_train} rows), "
+              f"test {r.test_year} ({r.n_test} rows) | MAE={r.MAE:.2f} RMSE={r.RMSE:.2f}")
+    if len(zones) > 1:
+        os.makedirs(os.path.dirname(ZONE_METRICS_OUT), exist_ok=True)
+        summary.drop(columns=["path"]).to_csv(ZONE_METRICS_OUT, index=False)
+        print("Saved:", ZONE_METRICS_OUT)
 
 if __name__ == "__main__":
     main()
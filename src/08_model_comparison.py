@@ -1,23 +1,32 @@
 ﻿import pandas as pd
 import numpy as np
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+from sklearn.metrics import mean_absolute_error, mean_pinball_loss, mean_squared_error
 from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
 
-FEATURES = [
-    "temp_c_mean","temp_c_min","temp_c_max",
-    "precip_mm_sum","wind_ms_mean","rh_pct_mean",
-    "weekday","month","is_weekend"
-]
-TARGET = "load_mw_daily_mean"
+from cache import fit_model, load_split
+from calendar_table import N_DAY_TYPES, fill_day_types
+from features import FEATURES, TARGET
+from forest import QUANTILES, forest_quantiles
+from instrument import stage, step
+from tuning import final_estimator
 
 def rmse(y_true, y_pred):
     return float(np.sqrt(mean_squared_error(y_true, y_pred)))
 
-def baseline_month_weekday(train: pd.DataFrame, test: pd.DataFrame) -> np.ndarray:
-    grp_mw = train.groupby(["month", "weekday"])[TARGET].mean()
-    key = list(zip(test["month"], test["weekday"]))
-    pred = pd.Series(key).map(grp_mw).to_numpy()
+def interval_metrics(y_true, q: np.ndarray) -> dict:
+    # q: (n, len(QUANTILES)) -> acoperirea intervalului P10-P90 și pinball loss pe fiecare cuantilă
+    out = {"coverage_p10_p90": float(np.mean((y_true >= q[:, 0]) & (y_true <= q[:, -1])))}
+    for j, a in enumerate(QUANTILES):
+        out[f"pinball_p{round(a * 100)}"] = mean_pinball_loss(y_true, q[:, j], alpha=a)
+    return out
+
+def baseline_month_daytype(train: pd.DataFrame, test: pd.DataFrame) -> np.ndarray:
+    # media pe (month, day_type): zilele săptămânii + sărbători legale + zile punte (calendar_table);
+    # tabel 13 x N_DAY_TYPES indexat direct, sărbătorile fără istoric în acea lună iau duminica
+    grp = train.groupby(["month", "day_type"])[TARGET].mean()
+    means = np.full((13, N_DAY_TYPES), np.nan)
+    means[grp.index.get_level_values(0), grp.index.get_level_values(1)] = grp.to_numpy()
+    pred = fill_day_types(means)[test["month"].to_numpy(dtype=int), test["day_type"].to_numpy(dtype=int)]
 
     # fallback month mean -> global mean
     if np.isnan(pred).any():
@@ -30,25 +39,25 @@ def baseline_month_weekday(train: pd.DataFrame, test: pd.DataFrame) -> np.ndarra
 
     return pred
 
+@stage("08_compare")
 def main():
-    df = pd.read_parquet("data/final/dataset_daily.parquet")
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.dropna(subset=FEATURES + [TARGET, "year"]).copy()
-
-    test_year = int(df["year"].max())
-    train = df[df["year"] < test_year].copy()
-    test  = df[df["year"] == test_year].copy()
+    # același split și același model ca în 07 (configurația din 13_tune.py, dacă există) -> refolosite din cache
+    with step("load_split") as rec:
+        split = load_split()
+        rec["rows"] = len(split["train"]) + len(split["test"])
+    train, test = split["train"], split["test"]
+    test_year = split["test_year"]
 
     y_test = test[TARGET].to_numpy()
-    X_train, y_train = train[FEATURES], train[TARGET]
     X_test = test[FEATURES]
 
     rows = []
 
     # Baseline
-    pred_base = baseline_month_weekday(train, test)
+    with step("baseline", rows=len(test)):
+        pred_base = baseline_month_daytype(train, test)
     rows.append({
-        "model": "Baseline(month+weekday mean)",
+        "model": "Baseline(month+day type mean)",
         "test_year": test_year,
         "MAE": mean_absolute_error(y_test, pred_base),
         "RMSE": rmse(y_test, pred_base),
@@ -56,8 +65,9 @@ def main():
     })
 
     # Linear Regression
-    lr = LinearRegression().fit(X_train, y_train)
-    pred_lr = lr.predict(X_test)
+    with step("LinearRegression", rows=len(train)):
+        lr = fit_model(LinearRegression(), split)
+        pred_lr = lr.predict(X_test)
     rows.append({
         "model": "LinearRegression",
         "test_year": test_year,
@@ -66,16 +76,20 @@ def main():
         "n_test": len(test)
     })
 
-    # Random Forest
-    rf = RandomForestRegressor(n_estimators=500, random_state=42, n_jobs=-1)
-    rf.fit(X_train, y_train)
-    pred_rf = rf.predict(X_test)
+    # modelul final din 07
+    model_name, estimator = final_estimator()
+    with step(model_name, rows=len(train)):
+        model = fit_model(estimator, split)
+        # pădurile: media și cuantilele pe arbori dintr-o singură trecere; altfel doar predicția punctuală
+        bands = forest_quantiles(model, X_test)
+        pred_rf = bands[0] if bands is not None else model.predict(X_test)
     rows.append({
-        "model": "RandomForest",
+        "model": model_name,
         "test_year": test_year,
         "MAE": mean_absolute_error(y_test, pred_rf),
         "RMSE": rmse(y_test, pred_rf),
-        "n_test": len(test)
+        "n_test": len(test),
+        **(interval_metrics(y_test, bands[1]) if bands is not None else {}),
     })
 
     out = pd.DataFrame(rows).sort_values("RMSE")
@@ -83,7 +97,7 @@ def main():
     out.to_csv(out_path, index=False)
 
     print("Saved:", out_path)
-    print(out)
+    print(out.round(3).to_string(index=False))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,19 @@
+﻿from hourly import build_hourly_dataset, read_hourly_load, read_hourly_meteo
+from instrument import stage, step
+from storage import HOURLY_ROW_GROUP, HOURLY_STORE, write_partitioned
+
+@stage("09_hourly")
+def main():
+    with step("build") as rec:
+        df = build_hourly_dataset(read_hourly_load(), read_hourly_meteo())
+        rec["rows"] = len(df)
+    with step("write", rows=len(df)):
+        write_partitioned(df, HOURLY_STORE, "time", HOURLY_ROW_GROUP)
+
+    print("Saved:", HOURLY_STORE, "rows=", len(df))
+    print(f"In-memory size: {df.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+    print(df.dtypes)
+    print(df.head(3))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+﻿import numpy as np
+import joblib
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from hourly import HOURLY_FEATURES, HOURLY_TARGET
+from instrument import stage, step
+from storage import read_hourly
+
+FEATURES = HOURLY_FEATURES
+TARGET = HOURLY_TARGET
+MODEL_OUT = "models/rf_hourly_model.joblib"
+
+@stage("10_train_hourly")
+def main():
+    with step("read") as rec:
+        df = read_hourly(columns=["year"] + FEATURES + [TARGET])
+        df = df.dropna(subset=FEATURES + [TARGET, "year"])
+        rec["rows"] = len(df)
+
+    last_year = df["year"].max()
+    train_mask = (df["year"] < last_year).to_numpy()
+
+    # float32 contiguu: RandomForest lucrează intern în float32, deci fără copii suplimentare
+    X = np.ascontiguousarray(df[FEATURES].to_numpy(dtype=np.float32))
+    y = df[TARGET].to_numpy(dtype=np.float32)
+    X_train, y_train = X[train_mask], y[train_mask]
+    X_test,  y_test  = X[~train_mask], y[~train_mask]
+
+    # setări pentru memorie/timp: bootstrap pe o fracțiune din rânduri și frunze minime mai mari
+    # (arbori mai mici -> model mai mic pe disc și în RAM)
+    model = RandomForestRegressor(
+        n_estimators=200,
+        max_samples=0.3,
+        min_samples_leaf=5,
+        max_features=0.6,
+        random_state=42,
+        n_jobs=-1
+    )
+    with step("fit", rows=len(X_train)):
+        model.fit(X_train, y_train)
+
+    with step("predict", rows=len(X_test)):
+        pred = model.predict(X_test)
+    mae = mean_absolute_error(y_test, pred)
+    rmse = np.sqrt(mean_squared_error(y_test, pred))
+    print(f"RandomForest (hourly): MAE={mae:.2f}, RMSE={rmse:.2f}")
+
+    payload = {
+        "model": model,
+        "features": FEATURES,
+        "target": TARGET,
+        "train_years": sorted(df.loc[train_mask, "year"].unique().tolist()),
+        "test_year": int(last_year),
+    }
+    with step("save"):
+        joblib.dump(payload, MODEL_OUT)
+    print("Saved model ->", MODEL_OUT)
+    print("Train years:", payload["train_years"], "Test year:", payload["test_year"])
+    print("Train rows:", len(X_train), "Test rows:", len(X_test))
+
+if __name__ == "__main__":
+    main()
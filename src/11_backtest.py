@@ -0,0 +1,59 @@
+﻿import argparse
+import os
+import time
+
+from backtest import default_models, make_folds, run_backtest
+from features import FEATURES, TARGET, add_features
+from instrument import stage, step
+from storage import read_daily
+
+FOLDS_OUT = "results/backtest_folds.csv"
+SUMMARY_OUT = "results/backtest_summary.csv"
+
+@stage("11_backtest")
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--freq", choices=["year", "month"], default="month")
+    ap.add_argument("--mode", choices=["expanding", "rolling"], default="expanding")
+    ap.add_argument("--window-days", type=int, default=3 * 365, help="fereastra de train pentru --mode rolling")
+    ap.add_argument("--min-train-days", type=int, default=2 * 365)
+    ap.add_argument("--n-estimators", type=int, default=500)
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="1 = serial")
+    args = ap.parse_args()
+
+    with step("features") as rec:
+        df = add_features(read_daily())
+        df = df.dropna(subset=FEATURES + [TARGET]).sort_values("date").reset_index(drop=True)
+        rec["rows"] = len(df)
+
+    # feature-urile se calculează o singură dată; procesele primesc doar matricea memory-mapped
+    X = df[FEATURES].to_numpy(dtype=float)
+    y = df[TARGET].to_numpy(dtype=float)
+    folds = make_folds(df["date"], freq=args.freq, mode=args.mode,
+                       min_train_days=args.min_train_days, window_days=args.window_days)
+    models = default_models(FEATURES, n_estimators=args.n_estimators)
+    print(f"Folds: {len(folds)} ({args.freq}, {args.mode}) x models: {len(models)} | workers: {args.workers}")
+
+    t0 = time.perf_counter()
+    with step("backtest", rows=len(df)) as rec:
+        res = run_backtest(X, y, folds, models, workers=args.workers)
+        rec.update(folds=len(folds), models=len(models), workers=args.workers)
+    elapsed = time.perf_counter() - t0
+
+    res.to_csv(FOLDS_OUT, index=False)
+    summary = (
+        res.groupby("model")
+        .agg(folds=("fold", "count"), MAE_mean=("MAE", "mean"), MAE_std=("MAE", "std"),
+             RMSE_mean=("RMSE", "mean"), RMSE_std=("RMSE", "std"), n_test=("n_test", "sum"))
+        .sort_values("RMSE_mean")
+        .reset_index()
+    )
+    summary.to_csv(SUMMARY_OUT, index=False)
+
+    print("Saved:", FOLDS_OUT)
+    print("Saved:", SUMMARY_OUT)
+    print(summary)
+    print(f"Elapsed: {elapsed:.1f}s (sum of fit times: {res['fit_seconds'].sum():.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+﻿import argparse
+import time
+
+import pandas as pd
+
+from serving import FLAT_MODEL_PATH, MAX_BATCH_ROWS, MAX_WAIT_MS, MODEL_PATH, Predictor, load_payload, read_file, serve, validate
+
+def main():
+    ap = argparse.ArgumentParser(description="Predicții cu modelul RF salvat: batch din fișier sau server HTTP local")
+    ap.add_argument("--model", default=MODEL_PATH, help=f"payload joblib sau directorul aplatizat ({FLAT_MODEL_PATH})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("batch", help="fișier CSV / JSON / Arrow / Parquet -> CSV cu predicții")
+    b.add_argument("input")
+    b.add_argument("--output", default=None, help="implicit: <input>_pred.csv")
+
+    s = sub.add_parser("serve", help="POST /predict (JSON, CSV sau Arrow), GET /health")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=8000)
+    s.add_argument("--max-batch-rows", type=int, default=MAX_BATCH_ROWS)
+    s.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS, help="cât așteaptă un lot după prima cerere")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    payload = load_payload(args.model)
+    print(f"Loaded {args.model} in {time.perf_counter() - t0:.2f}s | features: {len(payload['features'])}")
+
+    if args.cmd == "batch":
+        df = read_file(args.input)
+        X = validate(df, payload["features"])
+        t0 = time.perf_counter()
+        pred = Predictor(payload).predict(X)
+        elapsed = time.perf_counter() - t0
+
+        out = df.copy()
+        out[f"{payload.get('target', 'load')}_pred"] = pred
+        path = args.output or args.input.rsplit(".", 1)[0] + "_pred.csv"
+        out.to_csv(path, index=False)
+        print(f"Rows: {len(X)} | predict: {elapsed:.2f}s ({len(X) / max(elapsed, 1e-9):,.0f} rows/s)")
+        print("Saved:", path)
+    else:
+        server = serve(payload, args.host, args.port, args.max_batch_rows, args.max_wait_ms)
+        print(f"Serving on http://{args.host}:{args.port} (POST /predict, GET /health)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+if __name__ == "__main__":
+    main()
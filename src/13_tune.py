@@ -0,0 +1,56 @@
+﻿import argparse
+import os
+import time
+
+from cache import load_split
+from features import FEATURES, TARGET
+from instrument import stage, step
+from tuning import BEST_CONFIG, ESTIMATORS, full_search, sample_configs, save_best, successive_halving, tuning_folds
+
+RESULTS_OUT = "results/tuning_results.csv"
+
+@stage("13_tune")
+def main():
+    ap = argparse.ArgumentParser(description="căutare de hiperparametri RF/GBM cu successive halving pe fold-uri lunare")
+    ap.add_argument("--models", nargs="+", choices=list(ESTIMATORS), default=list(ESTIMATORS))
+    ap.add_argument("--candidates", type=int, default=27)
+    ap.add_argument("--eta", type=int, default=3, help="la fiecare rundă rămâne 1/eta din candidați")
+    ap.add_argument("--months", type=int, default=9, help="fold-uri lunare din finalul perioadei de train")
+    ap.add_argument("--strategy", choices=["halving", "full"], default="halving",
+                    help="full = fiecare candidat pe toate fold-urile (referința naivă)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count(), help="1 = serial")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    # matricele vin din cache-ul de split-uri; anul de test nu intră în căutare
+    with step("load_split") as rec:
+        split = load_split()
+        rec["rows"] = len(split["train"])
+    train = split["train"].sort_values("date").reset_index(drop=True)
+    X = train[FEATURES].to_numpy(dtype=float)
+    y = train[TARGET].to_numpy(dtype=float)
+    folds = tuning_folds(train["date"], args.months)
+    configs = sample_configs(args.models, args.candidates, seed=args.seed)
+    print(f"{len(configs)} candidates ({', '.join(args.models)}) | {len(folds)} monthly folds "
+          f"({folds[-1][0]} .. {folds[0][0]}) | strategy: {args.strategy} | workers: {args.workers}")
+
+    t0 = time.perf_counter()
+    with step(args.strategy, rows=len(X)) as rec:
+        if args.strategy == "halving":
+            ranked = successive_halving(X, y, folds, configs, eta=args.eta, workers=args.workers)
+        else:
+            ranked = full_search(X, y, folds, configs, workers=args.workers)
+        rec.update(candidates=len(configs), folds=len(folds), fits=int(ranked["folds"].sum()), workers=args.workers)
+    elapsed = time.perf_counter() - t0
+
+    ranked.to_csv(RESULTS_OUT, index=False)
+    best = save_best(ranked, extra={"strategy": args.strategy, "split_key": split["key"]})
+
+    print(ranked.head(10)[["rank", "id", "model", "folds", "RMSE_mean", "MAE_mean", "params"]].to_string(index=False))
+    print(f"Fits: {int(ranked['folds'].sum())} | elapsed: {elapsed:.1f}s")
+    print("Saved:", RESULTS_OUT)
+    print("Saved:", BEST_CONFIG, "->", best["model"], best["params"])
+    print("Next: python src/07_train_and_save.py (uses the best config)")
+
+if __name__ == "__main__":
+    main()
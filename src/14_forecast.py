@@ -0,0 +1,127 @@
+﻿import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from features import LOOKBACK, TARGET
+from forecast import (FORECAST_DIR, HORIZON, METEO_COLS, History, forecast_daily, forecast_files, lead_metrics,
+                      read_forecasts, recursive_forecast, weather_cube)
+from instrument import stage, step
+from serving import load_payload
+from storage import daily_path, read_range
+from zones import DEFAULT_ZONE, model_paths, stations_list
+
+# run: prognoza pentru datele de emitere din --forecast-dir; backfill: reluarea a --years ani de emiteri
+OUT_DIR = "results"
+
+def out_path(name: str, zone: str) -> str:
+    suffix = "" if zone == DEFAULT_ZONE else f"_{zone}"
+    return os.path.join(OUT_DIR, f"{name}{suffix}.csv")
+
+def load_weather(forecast_dir: str, zone: str, issues=None) -> pd.DataFrame:
+    # prognozele stațiilor zonei, ponderate cu populația -> (issue, date) x METEO_COLS
+    weights = pd.read_csv(stations_list(zone)).set_index("station")["population"]
+    weights = weights[weights > 0]
+    with step("read_forecasts") as rec:
+        files = forecast_files(forecast_dir, weights.index)
+        if issues is not None:
+            files = files[files["issue"].isin(issues)]
+        long = read_forecasts(files)
+        rec.update(rows=len(long), files=len(files), zone=zone)
+    with step("weather_daily") as rec:
+        daily = forecast_daily(long, weights)
+        rec["rows"] = len(daily)
+    return daily
+
+@stage("14_forecast")
+def main():
+    ap = argparse.ArgumentParser(description="Prognoză recursivă pe mai multe zile din fișiere de prognoză meteo")
+    ap.add_argument("--zone", default=DEFAULT_ZONE)
+    ap.add_argument("--horizon", type=int, default=HORIZON, help="zile (inclusiv ziua emiterii)")
+    ap.add_argument("--forecast-dir", default=FORECAST_DIR, help="<dir>/<stație>/<YYYY-MM-DD>.json")
+    ap.add_argument("--model", default=None, help="implicit: modelul zonei din 07 (aplatizat dacă există)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run", help="prognoză pentru datele de emitere găsite (sau --issues)")
+    r.add_argument("--issues", nargs="+", default=None, help="YYYY-MM-DD ...")
+
+    b = sub.add_parser("backfill", help="reluarea emiterilor istorice, cu erorile pe zi de orizont")
+    b.add_argument("--years", type=float, default=2.0, help="ultimii ani din setul zilnic")
+    b.add_argument("--start", default=None)
+    b.add_argument("--end", default=None)
+    b.add_argument("--weather", choices=["auto", "forecast", "observed"], default="auto",
+                   help="auto: prognoza unde există fișiere, altfel meteo observat (prognoză perfectă)")
+    args = ap.parse_args()
+
+    joblib_path, flat_path = model_paths(args.zone)
+    model_path = args.model or (flat_path if os.path.isdir(flat_path) else joblib_path)
+    payload = load_payload(model_path)
+    with step("history") as rec:
+        hist_df = read_range(daily_path(args.zone), "date", columns=["date", TARGET] + METEO_COLS)
+        rec.update(rows=len(hist_df), zone=args.zone)
+    last = hist_df["date"].max()
+
+    if args.cmd == "run":
+        issues = pd.DatetimeIndex(pd.to_datetime(args.issues)) if args.issues else None
+        daily = load_weather(args.forecast_dir, args.zone, issues)
+        if issues is None:
+            issues = pd.DatetimeIndex(daily.index.get_level_values("issue").unique())
+        if not len(issues):
+            raise FileNotFoundError(f"Nicio prognoză meteo în {args.forecast_dir} pentru stațiile din {stations_list(args.zone)}")
+        issues = issues.sort_values()
+        history = History(hist_df, issues[-1] + pd.Timedelta(days=args.horizon))
+        weather = weather_cube(daily, issues, args.horizon)
+        source = np.full(len(issues), "forecast")
+    else:
+        end = pd.Timestamp(args.end) if args.end else last
+        start = pd.Timestamp(args.start) if args.start else end - pd.DateOffset(days=round(args.years * 365.25)) + pd.Timedelta(days=1)
+        # prima emitere are nevoie de LOOKBACK zile de istoric
+        start = max(start, hist_df["date"].min() + pd.Timedelta(days=LOOKBACK))
+        issues = pd.date_range(start, end, freq="D")
+        history = History(hist_df, issues[-1] + pd.Timedelta(days=args.horizon))
+        observed = None
+        if args.weather != "forecast":
+            observed = history.window(history.meteo, history.positions(issues), 0, args.horizon)
+        if args.weather == "observed":
+            weather = observed
+            source = np.full(len(issues), "observed")
+        else:
+            weather = weather_cube(load_weather(args.forecast_dir, args.zone, issues), issues, args.horizon)
+            has_fc = ~np.isnan(weather).all(axis=(1, 2))
+            if observed is not None:
+                weather = np.where(has_fc[:, None, None], weather, observed)
+            source = np.where(has_fc, "forecast", "observed" if observed is not None else "missing")
+
+    with step("recursive", rows=len(issues) * args.horizon) as rec:
+        out = recursive_forecast(payload, history, issues, weather, args.horizon, args.zone)
+        rec.update(issues=len(issues), horizon=args.horizon, zone=args.zone)
+    out.insert(2, "weather", np.repeat(source, args.horizon))
+
+    skipped = out.groupby("issue_date")["pred"].apply(lambda s: s.isna().all())
+    print(f"[{args.zone}] {payload.get('model_name', 'model')} | emiteri: {len(issues)} "
+          f"({issues[0].date()}..{issues[-1].date()}) | orizont: {args.horizon} zile | "
+          f"fără predicție: {int(skipped.sum())}")
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+    if args.cmd == "run":
+        if skipped.any():
+            print(f"Lipsește consumul observat din zilele dinaintea emiterii (setul zilnic se oprește la {last.date()})")
+        path = out_path("forecast", args.zone)
+        out.to_csv(path, index=False)
+        latest = out[out["issue_date"] == out["issue_date"].max()]
+        print(latest.drop(columns=["issue_date"]).round(1).to_string(index=False))
+        print("Saved:", path)
+        return
+
+    out["actual"] = history.load[history.positions(pd.DatetimeIndex(out["target_date"]))]
+    print("Sursa meteo:", pd.Series(source).value_counts().to_dict())
+    metrics = lead_metrics(out)
+    print(metrics.round(3).to_string(index=False))
+    path, metrics_path = out_path("forecast_backfill", args.zone), out_path("forecast_backfill_metrics", args.zone)
+    out.to_csv(path, index=False)
+    metrics.to_csv(metrics_path, index=False)
+    print("Saved:", path, metrics_path)
+
+if __name__ == "__main__":
+    main()
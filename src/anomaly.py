@@ -0,0 +1,108 @@
+﻿import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from cache import FEATURES_VERSION, ArtifactCache, make_key
+from calendar_table import N_DAY_TYPES, calendar_table, fill_day_types
+from features import TARGET
+from storage import daily_path, read_range
+from zones import DEFAULT_ZONE
+
+COLUMNS = ["date", TARGET, "month", "temp_c_mean", "precip_mm_sum", "wind_ms_mean"]
+
+MAD_SCALE = 1.4826
+ROLL_WINDOW = 90
+ROLL_MIN_PERIODS = 30
+
+def _robust_z(resid: np.ndarray) -> np.ndarray:
+    med = np.nanmedian(resid)
+    mad = np.nanmedian(np.abs(resid - med))
+    if mad == 0 or np.isnan(mad):
+        sd = np.nanstd(resid)
+        mad = sd if sd != 0 else 1.0
+    return (resid - med) / (MAD_SCALE * mad)
+
+def rolling_robust_z(resid: np.ndarray, window: int = ROLL_WINDOW, min_periods: int = ROLL_MIN_PERIODS) -> np.ndarray:
+    # varianta locală: centrul = mediana mobilă (fereastră trecută de `window` zile), scala = mediana
+    # mobilă a abaterilor absolute față de acel centru. Mediana mobilă din pandas folosește un skiplist,
+    # deci fiecare trecere e O(n log w), fără a resorta fereastra la fiecare zi.
+    r = pd.Series(resid)
+    center = r.rolling(window, min_periods=min_periods).median()
+    dev = r - center
+    scale = dev.abs().rolling(window, min_periods=min_periods).median().to_numpy()
+    scale = np.where(scale > 0, scale, np.nan)
+    return dev.to_numpy() / (MAD_SCALE * scale)
+
+def _digest(df: pd.DataFrame) -> str:
+    hashed = pd.util.hash_pandas_object(df[["date", TARGET]], index=False).to_numpy()
+    return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+class AnomalyModel:
+    # baseline (month, day_type) ținut ca sume/numărări 13 x N_DAY_TYPES: zilele noi se adaugă în O(zile noi),
+    # iar baseline-ul pe fiecare rând e un lookup cu indici întregi (fără groupby / zip+map).
+    # day_type (ziua săptămânii / sărbătoare / zi punte) vine din tabelul calendaristic, indexat pe zi,
+    # deci sărbătorile au propriul baseline în loc să apară ca anomalii
+
+    def __init__(self, window: int = ROLL_WINDOW, country: str = DEFAULT_ZONE):
+        self.window = window
+        self.country = country
+        self.sums = np.zeros((13, N_DAY_TYPES))
+        self.counts = np.zeros((13, N_DAY_TYPES))
+        self.frame = pd.DataFrame(columns=COLUMNS + ["day_type", "holiday"])
+        self.digest = _digest(self.frame)
+
+    def update(self, new_days: pd.DataFrame):
+        new = new_days[COLUMNS].copy()
+        cal = calendar_table(self.country)
+        new["day_type"] = cal.lookup(new["date"], ["day_type"])["day_type"]
+        new["holiday"] = cal.holiday_name(new["date"])
+        y = new[TARGET].to_numpy(dtype=float)
+        ok = ~np.isnan(y)
+        m = new["month"].to_numpy(dtype=int)[ok]
+        w = new["day_type"].to_numpy(dtype=int)[ok]
+        np.add.at(self.sums, (m, w), y[ok])
+        np.add.at(self.counts, (m, w), 1)
+
+        frames = [f for f in (self.frame, new) if len(f)]
+        self.frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else new.reset_index(drop=True)
+        self.digest = _digest(self.frame)
+        self._score()
+        return self
+
+    def baseline(self) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return fill_day_types(np.where(self.counts > 0, self.sums / np.maximum(self.counts, 1), np.nan))
+
+    def _score(self):
+        f = self.frame
+        base = self.baseline()[f["month"].to_numpy(dtype=int), f["day_type"].to_numpy(dtype=int)]
+        resid = f[TARGET].to_numpy(dtype=float) - base
+        f["baseline_mw"] = base
+        f["residual"] = resid
+        f["z_robust"] = _robust_z(resid)
+        f["z_rolling"] = rolling_robust_z(resid, self.window)
+
+    @property
+    def scores(self) -> pd.DataFrame:
+        return self.frame
+
+def load_scores(data_path: str = None, cache: ArtifactCache = None, window: int = ROLL_WINDOW,
+                zone: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # scorurile se calculează o singură dată per versiune a setului; starea e persistată în cache,
+    # iar dacă fișierul doar a primit zile noi la final, se adaugă doar acelea
+    cache = cache or ArtifactCache()
+    data_path = data_path or daily_path(zone)
+    df = read_range(data_path, "date", columns=COLUMNS)
+
+    # FEATURES_VERSION include și tabelul calendaristic -> starea se reconstruiește când se schimbă regulile
+    key = make_key("anomaly-state", os.path.abspath(data_path), window, zone, FEATURES_VERSION)
+    state = cache.get(key)
+    n = len(state.frame) if state is not None else 0
+
+    if state is None or n > len(df) or _digest(df.iloc[:n]) != state.digest:
+        state = cache.put(key, AnomalyModel(window, zone).update(df))
+    elif n < len(df):
+        state = cache.put(key, state.update(df.iloc[n:]))
+    return state.scores
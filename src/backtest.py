@@ -0,0 +1,129 @@
+﻿import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+from threadpoolctl import threadpool_limits
+
+from calendar_table import N_DAY_TYPES, day_types, fill_day_types
+
+class MonthDayTypeMean:
+    # baseline-ul din 06/08 ca estimator: media pe (month, day_type) -> month -> media globală;
+    # day_type se reconstruiește din coloanele weekday / is_holiday / is_bridge ale matricei
+    def __init__(self, month_col: int, weekday_col: int, holiday_col: int, bridge_col: int):
+        self.month_col = month_col
+        self.weekday_col = weekday_col
+        self.holiday_col = holiday_col
+        self.bridge_col = bridge_col
+
+    def _keys(self, X):
+        m = X[:, self.month_col].astype(int)
+        t = day_types(X[:, self.weekday_col], X[:, self.holiday_col], X[:, self.bridge_col]).astype(int)
+        return m, t
+
+    def fit(self, X, y):
+        m, t = self._keys(X)
+        self.global_ = float(np.mean(y))
+        key = m * N_DAY_TYPES + t
+        sums = np.bincount(key, weights=y, minlength=13 * N_DAY_TYPES)
+        cnts = np.bincount(key, minlength=13 * N_DAY_TYPES)
+        with np.errstate(invalid="ignore"):
+            self.mt_ = fill_day_types((sums / cnts).reshape(13, N_DAY_TYPES))
+            self.m_ = np.bincount(m, weights=y, minlength=13) / np.bincount(m, minlength=13)
+        return self
+
+    def predict(self, X):
+        m, t = self._keys(X)
+        pred = self.mt_[m, t]
+        pred = np.where(np.isnan(pred), self.m_[m], pred)
+        return np.where(np.isnan(pred), self.global_, pred)
+
+def default_models(features, n_estimators: int = 500) -> dict:
+    cols = [features.index(c) for c in ("month", "weekday", "is_holiday", "is_bridge")]
+    # factory-uri picklable (partial pe clase), ca să poată fi trimise la procese
+    return {
+        "Baseline(month+day type mean)": partial(MonthDayTypeMean, *cols),
+        "LinearRegression": LinearRegression,
+        # n_jobs=1: paralelismul e la nivel de fold, nu în interiorul pădurii
+        "RandomForest": partial(RandomForestRegressor, n_estimators=n_estimators, random_state=42, n_jobs=1),
+    }
+
+def make_folds(dates: pd.Series, freq: str = "year", mode: str = "expanding",
+               min_train_days: int = 365, window_days=None) -> list:
+    # dates sortate crescător -> [(fold, train_start, cut, test_end)] ca intervale de poziții
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    period = dates.to_period("Y" if freq == "year" else "M")
+    starts = np.flatnonzero(np.r_[True, period[1:] != period[:-1]])
+    bounds = np.r_[starts, len(dates)]
+
+    folds = []
+    for i in range(len(starts)):
+        cut, end = bounds[i], bounds[i + 1]
+        if cut == 0 or (dates[cut] - dates[0]).days < min_train_days:
+            continue
+        lo = 0
+        if mode == "rolling" and window_days:
+            lo = int(np.searchsorted(dates, dates[cut] - pd.Timedelta(days=window_days)))
+        folds.append((str(period[cut]), lo, cut, end))
+    return folds
+
+# --- worker: matricele sunt memory-mapped, deci nu se trimit prin pickle la fiecare task ---
+
+_SHARED = {}
+
+def _init_worker(x_path: str, y_path: str, single_thread: bool = False):
+    if single_thread:
+        # fără suprasubscriere: modelele cu OpenMP/BLAS (ex. HistGradientBoosting) rulează pe un fir per proces
+        threadpool_limits(1)
+    _SHARED["X"] = np.load(x_path, mmap_mode="r")
+    _SHARED["y"] = np.load(y_path, mmap_mode="r")
+
+def _run_task(task):
+    fold, lo, cut, end, name, factory = task
+    X, y = _SHARED["X"], _SHARED["y"]
+    t0 = time.perf_counter()
+    model = factory().fit(np.asarray(X[lo:cut]), np.asarray(y[lo:cut]))
+    pred = model.predict(np.asarray(X[cut:end]))
+    y_test = np.asarray(y[cut:end])
+    return {
+        "fold": fold,
+        "model": name,
+        "train_rows": cut - lo,
+        "n_test": end - cut,
+        "MAE": mean_absolute_error(y_test, pred),
+        "RMSE": float(np.sqrt(mean_squared_error(y_test, pred))),
+        "fit_seconds": time.perf_counter() - t0,
+    }
+
+def run_backtest(X: np.ndarray, y: np.ndarray, folds: list, models: dict, workers: int = None,
+                 pairs: list = None) -> pd.DataFrame:
+    # models: {nume: factory fără argumente}; workers=1 -> rulare serială în procesul curent;
+    # pairs: [(fold, nume)] dacă nu trebuie rulat tot produsul fold-uri x modele
+    if pairs is None:
+        pairs = [(f, name) for f in folds for name in models]
+    tasks = [(f, lo, cut, end, name, models[name]) for (f, lo, cut, end), name in pairs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path, y_path = os.path.join(tmp, "X.npy"), os.path.join(tmp, "y.npy")
+        np.save(x_path, np.ascontiguousarray(X, dtype=np.float64))
+        np.save(y_path, np.ascontiguousarray(y, dtype=np.float64))
+
+        if workers == 1:
+            _init_worker(x_path, y_path)
+            rows = [_run_task(t) for t in tasks]
+            _SHARED.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(x_path, y_path, True)) as pool:
+                # task-urile lungi (RF pe fold-urile mari) primele -> mai puțin timp mort la final
+                order = sorted(range(len(tasks)), key=lambda i: -(tasks[i][2] - tasks[i][1]))
+                results = dict(zip(order, pool.map(_run_task, [tasks[i] for i in order])))
+                rows = [results[i] for i in range(len(tasks))]
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,64 @@
+﻿import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import default_models, make_folds, run_backtest
+from features import FEATURES, TARGET, add_features
+from storage import read_daily
+
+OUT_PATH = "results/bench_backtest.csv"
+
+def main():
+    ap = argparse.ArgumentParser(description="11_backtest: rulare serială vs pool de procese, aceleași fold-uri")
+    ap.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count()}),
+                    help="1 = serial (referința)")
+    ap.add_argument("--freq", choices=["year", "month"], default="month")
+    ap.add_argument("--n-estimators", type=int, default=100)
+    ap.add_argument("--repeats", type=int, default=1)
+    args = ap.parse_args()
+    workers = sorted(set(args.workers) | {1})
+
+    df = add_features(read_daily())
+    df = df.dropna(subset=FEATURES + [TARGET]).sort_values("date").reset_index(drop=True)
+    X = df[FEATURES].to_numpy(dtype=float)
+    y = df[TARGET].to_numpy(dtype=float)
+    folds = make_folds(df["date"], freq=args.freq, min_train_days=2 * 365)
+    models = default_models(FEATURES, n_estimators=args.n_estimators)
+    print(f"Folds: {len(folds)} ({args.freq}) x models: {len(models)} | CPUs: {os.cpu_count()}")
+
+    rows, reference, serial_fit = [], None, None
+    for w in workers:
+        best, res = np.inf, None
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            res = run_backtest(X, y, folds, models, workers=w)
+            best = min(best, time.perf_counter() - t0)
+        metrics = res.sort_values(["fold", "model"])[["MAE", "RMSE"]].to_numpy()
+        if reference is None:
+            # prima rulare e cea serială: timpii ei per task sunt munca reală, fără concurență pe CPU
+            reference, serial_fit = metrics, res["fit_seconds"]
+        rows.append({
+            "workers": w,
+            "seconds": best,
+            "fit_seconds_sum": res["fit_seconds"].sum(),
+            # limita de jos pe w nuclee libere: munca serială împărțită egal, dar nu sub cel mai lung task
+            "ideal_seconds": max(serial_fit.sum() / w, serial_fit.max()),
+            "same_metrics": bool(np.allclose(metrics, reference)),
+        })
+        print(f"  workers={w}: {best:.2f}s")
+
+    out = pd.DataFrame(rows)
+    serial = out.loc[out["workers"] == 1, "seconds"].iloc[0]
+    out["speedup"] = serial / out["seconds"]
+    out["efficiency"] = out["speedup"] / out["workers"]
+    print(out.round(3).to_string(index=False))
+
+    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
+    out.assign(freq=args.freq, n_estimators=args.n_estimators, cpus=os.cpu_count()).to_csv(OUT_PATH, index=False)
+    print("Saved:", OUT_PATH)
+
+if __name__ == "__main__":
+    main()
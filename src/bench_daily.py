@@ -0,0 +1,87 @@
+﻿import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from daily import DAILY_EXTRAS, daily_load, daily_meteo
+
+def synthetic_hourly(years: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    t = pd.date_range("1990-01-01", periods=years * 8760, freq="h")
+    n = len(t)
+    doy = t.dayofyear.to_numpy()
+    temp = 12 - 12 * np.cos(2 * np.pi * doy / 365.25) + rng.normal(0, 3, n)
+    meteo = pd.DataFrame({
+        "time": t,
+        "temp_c": temp,
+        "precip_mm": rng.exponential(0.1, n),
+        "wind_ms": rng.gamma(2, 1.5, n),
+        "rh_pct": rng.integers(30, 100, n),
+    })
+    load = pd.DataFrame({"time": t, "load_mw": 6500 + 40 * np.abs(temp - 16) + rng.normal(0, 200, n)})
+    return load, meteo
+
+def old_build(load: pd.DataFrame, meteo: pd.DataFrame) -> pd.DataFrame:
+    # implementarea veche din 03: câte un resample per coloană
+    load = load.set_index("time")
+    meteo = meteo.set_index("time")
+    load_daily = load["load_mw"].resample("D").mean().to_frame("load_mw_daily_mean")
+    meteo_daily = pd.DataFrame({
+        "temp_c_mean": meteo["temp_c"].resample("D").mean(),
+        "temp_c_min":  meteo["temp_c"].resample("D").min(),
+        "temp_c_max":  meteo["temp_c"].resample("D").max(),
+        "precip_mm_sum": meteo["precip_mm"].resample("D").sum(),
+        "wind_ms_mean": meteo["wind_ms"].resample("D").mean(),
+        "rh_pct_mean": meteo["rh_pct"].resample("D").mean(),
+    })
+    return load_daily.join(meteo_daily, how="inner")
+
+def old_build_with_extras(load: pd.DataFrame, meteo: pd.DataFrame) -> pd.DataFrame:
+    # aceleași agregate extra ca în daily.DAILY_EXTRAS, în stilul vechi (un resample fiecare)
+    df = old_build(load, meteo)
+    l = load.set_index("time")["load_mw"]
+    m = meteo.set_index("time")["temp_c"]
+    df["load_mw_daily_max"] = l.resample("D").max()
+    df["load_mw_daily_min"] = l.resample("D").min()
+    df["load_peak_hour"] = l.resample("D").apply(lambda s: s.idxmax().hour)
+    df["hdh18"] = (18 - m).clip(lower=0).resample("D").sum()
+    df["cdh22"] = (m - 22).clip(lower=0).resample("D").sum()
+    df["temp_c_q10"] = m.resample("D").quantile(0.1)
+    df["temp_c_q90"] = m.resample("D").quantile(0.9)
+    return df
+
+def new_build(load: pd.DataFrame, meteo: pd.DataFrame, extras=DAILY_EXTRAS) -> pd.DataFrame:
+    return daily_load(load, extras).join(daily_meteo(meteo, extras), how="inner")
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=int, default=40)
+    args = ap.parse_args()
+
+    load, meteo = synthetic_hourly(args.years)
+    print(f"Synthetic hourly rows: {len(load)} ({args.years} years)")
+
+    t_old, a = timed(old_build, load, meteo)
+    t_old_x, ax = timed(old_build_with_extras, load, meteo)
+    t_new_base, _ = timed(new_build, load, meteo, {})
+    t_new, b = timed(new_build, load, meteo)
+
+    same = all(np.allclose(a[c], b[c], equal_nan=True) for c in a.columns)
+    same_x = all(np.allclose(ax[c], b[c], equal_nan=True) for c in ax.columns)
+
+    print(pd.DataFrame([
+        {"variant": "old: resample per column (base only)", "seconds": round(t_old, 3), "aggregates": a.shape[1]},
+        {"variant": "old: resample per column (+ extras)", "seconds": round(t_old_x, 3), "aggregates": ax.shape[1]},
+        {"variant": "new: one groupby per source (base only)", "seconds": round(t_new_base, 3), "aggregates": a.shape[1]},
+        {"variant": "new: one groupby per source (+ extras)", "seconds": round(t_new, 3), "aggregates": b.shape[1]},
+    ]).to_string(index=False))
+    print("Base columns identical:", same, "| extras identical:", same_x)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+﻿import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(SRC_DIR, "dashboard.py")
+OUT_PATH = "results/dashboard_timing.csv"
+
+PAGES = ["Overview", "EDA", "Anomalii", "Predicții", "Model Comparison"]
+
+def timed_run(at: AppTest, action=None) -> float:
+    t0 = time.perf_counter()
+    if action is not None:
+        action(at)
+    at.run()
+    elapsed = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--timeout", type=float, default=300)
+    args = ap.parse_args()
+
+    # `streamlit run` pune directorul scriptului în sys.path; AppTest nu
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+    rows = []
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    rows.append({"step": "first render (Overview)", "seconds": timed_run(at)})
+
+    for rep in range(args.repeat):
+        for page in PAGES:
+            sec = timed_run(at, lambda a: a.sidebar.radio[0].set_value(page))
+            rows.append({"step": f"open {page}" if rep == 0 else f"rerun {page}", "seconds": sec})
+
+        # interacțiuni pe pagina de predicții (ultima deschisă înainte de Model Comparison)
+        at.sidebar.radio[0].set_value("Predicții").run()
+        for delta in (-5.0, 0.5, 7.5):
+            sec = timed_run(at, lambda a: a.slider[0].set_value(delta))
+            rows.append({"step": "Predicții: temp slider", "seconds": sec})
+
+        at.sidebar.radio[0].set_value("Anomalii").run()
+        for thr in (2.5, 4.0):
+            sec = timed_run(at, lambda a: a.slider[0].set_value(thr))
+            rows.append({"step": "Anomalii: threshold slider", "seconds": sec})
+
+    res = pd.DataFrame(rows)
+    summary = res.groupby("step", sort=False)["seconds"].agg(["count", "median", "max"]).reset_index()
+    print(summary.round(3).to_string(index=False))
+
+    summary.insert(0, "run_at", datetime.now().isoformat(timespec="seconds"))
+    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
+    summary.to_csv(OUT_PATH, mode="a", header=not os.path.exists(OUT_PATH), index=False)
+    print("Appended:", OUT_PATH)
+
+if __name__ == "__main__":
+    main()
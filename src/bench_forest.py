@@ -0,0 +1,67 @@
+﻿import argparse
+import os
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from cache import load_split
+from forest import FlatForest, forest_quantiles
+
+MODEL_PATH = "models/rf_model.joblib"
+FLAT_MODEL_PATH = "models/rf_model_flat"
+
+def dir_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+def measured(fn):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000, help="rânduri sintetice pentru predicția batch")
+    args = ap.parse_args()
+
+    payload, t_joblib, m_joblib = measured(lambda: joblib.load(MODEL_PATH))
+    flat, t_flat, m_flat = measured(lambda: FlatForest.load(FLAT_MODEL_PATH))
+    rf, features = payload["model"], payload["features"]
+    # predicția sklearn, cu n_jobs=1, adună arborii în ordine -> comparabilă bit cu bit
+    rf.set_params(n_jobs=1)
+
+    X_test = load_split()["test"][features]
+    rng = np.random.default_rng(0)
+    X_big = X_test.iloc[rng.integers(0, len(X_test), args.rows)].reset_index(drop=True)
+    noisy = [c for c in features if c not in ("weekday", "month", "is_weekend")]
+    X_big[noisy] = X_big[noisy] + rng.normal(0, 0.5, (len(X_big), len(noisy)))
+
+    rows = [
+        {"metric": "file size (MB)", "joblib": dir_size(MODEL_PATH) / 1e6, "flat": dir_size(FLAT_MODEL_PATH) / 1e6},
+        {"metric": "load time (s)", "joblib": t_joblib, "flat": t_flat},
+        {"metric": "load peak alloc (MB)", "joblib": m_joblib / 1e6, "flat": m_flat / 1e6},
+    ]
+
+    for name, X in [("test year", X_test), (f"{args.rows} rows", X_big)]:
+        a, t_a, _ = measured(lambda: rf.predict(X))
+        b, t_b, _ = measured(lambda: flat.predict(X))
+        rows.append({"metric": f"predict {name} (s)", "joblib": t_a, "flat": t_b})
+        # benzile P10/P50/P90: media + cuantilele pe arbori, pe bucăți de rânduri (memorie mărginită)
+        _, t_qa, m_qa = measured(lambda: forest_quantiles(rf, X))
+        _, t_qb, m_qb = measured(lambda: flat.predict_quantiles(X))
+        rows.append({"metric": f"quantiles {name} (s)", "joblib": t_qa, "flat": t_qb})
+        rows.append({"metric": f"quantiles {name} peak alloc (MB)", "joblib": m_qa / 1e6, "flat": m_qb / 1e6})
+        print(f"{name}: identical={np.array_equal(a, b)} max_abs_diff={np.max(np.abs(a - b)):.3g}")
+
+    print(pd.DataFrame(rows).round(3).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
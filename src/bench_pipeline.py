@@ -0,0 +1,230 @@
+﻿import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from instrument import stage, step
+from timeparse import KNOWN_FORMATS
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_PATH = "results/bench_pipeline.csv"
+# toate rândurile instrument.py din rulările de benchmark (pentru `instrument.py report --path ...`)
+STEPS_PATH = "results/bench_pipeline.jsonl"
+
+# coduri ENTSO-E din dump-urile Power Statistics; 01 păstrează toate țările, fiecare în partiția zone=XX
+COUNTRIES = ["AL", "AT", "BA", "BE", "BG", "CH", "CY", "CZ", "DE", "DK", "EE", "ES", "FI", "FR", "GB", "GR",
+             "HR", "HU", "IE", "IT", "LT", "LU", "LV", "ME", "MK", "NL", "NO", "PL", "PT", "RO", "RS", "SE",
+             "SI", "SK", "UA", "XK"]
+ENTSOE_COLUMNS = ["MeasureItem", "DateUTC", "DateShort", "TimeFrom", "TimeTo", "CountryCode", "Cov_ratio", "Value"]
+SEPARATORS = ["\t", ";", ","]
+START_YEAR = 1990
+# ore RO lipsă / dublate, ca 05 și repararea din 03/09 să aibă ce face
+MISSING_FRAC = 0.001
+DUP_FRAC = 0.0005
+
+# etapele măsurate, în ordinea pipeline-ului; "rows" = dimensiunea intrării, pentru throughput
+STAGES = [
+    ("01_ingest", "01_ingest_entsoe_powerstats.py", "csv_rows"),
+    ("05_quality", "05_data_quality.py", "hours"),
+    ("03_daily", "03_build_daily_dataset.py", "hours"),
+    ("09_hourly", "09_build_hourly_dataset.py", "hours"),
+    ("07_train", "07_train_and_save.py", "days"),
+    ("dashboard_query", "bench_pipeline.py --query", "days"),
+]
+
+def national_temp(hours: pd.DatetimeIndex, rng) -> np.ndarray:
+    doy = hours.dayofyear.to_numpy()
+    hod = hours.hour.to_numpy()
+    return 12 - 12 * np.cos(2 * np.pi * doy / 365.25) - 3 * np.cos(2 * np.pi * (hod - 3) / 24) + rng.normal(0, 2, len(hours))
+
+def write_stations(root: str, hours: pd.DatetimeIndex, temp: np.ndarray, n_stations: int, rng) -> int:
+    # un parquet per stație, cu schema din openmeteo.hourly_frame, plus lista de ponderi (populație)
+    out_dir = os.path.join(root, "data/raw/openmeteo/stations")
+    os.makedirs(out_dir)
+    n = len(hours)
+    stations = []
+    for i in range(n_stations):
+        name = f"st{i:03d}"
+        pd.DataFrame({
+            "time": hours,
+            "temp_c": (temp + rng.normal(0, 1.5) + rng.normal(0, 0.5, n)).round(1),
+            "precip_mm": np.where(rng.random(n) < 0.08, rng.exponential(1.2, n), 0.0).round(1),
+            "wind_ms": rng.gamma(2, 1.5, n).round(1),
+            "rh_pct": rng.integers(30, 100, n),
+        }).to_parquet(os.path.join(out_dir, f"{name}.parquet"), index=False)
+        stations.append({"station": name, "name": name, "lat": 44 + rng.random() * 4, "lon": 21 + rng.random() * 8,
+                         "population": int(rng.integers(100_000, 2_000_000))})
+    pd.DataFrame(stations).to_csv(os.path.join(root, "data/raw/openmeteo/stations_ro.csv"), index=False)
+    return n * n_stations
+
+def write_entsoe(root: str, hours: pd.DatetimeIndex, temp: np.ndarray, countries: list, rng) -> int:
+    # câte un CSV lunar cu toate țările; separatorul și formatul DateUTC se schimbă de la lună la lună
+    out_dir = os.path.join(root, "data/raw/entsoe")
+    os.makedirs(out_dir)
+    scale = dict(zip(countries, rng.uniform(0.2, 8.0, len(countries))))
+    scale["RO"] = 1.0
+    hod = hours.hour.to_numpy()
+    base = 6500 + 40 * np.abs(temp - 16) + 600 * np.sin(np.pi * np.clip(hod - 6, 0, 16) / 16)
+    base = base - 500 * (hours.weekday.to_numpy() >= 5)
+
+    rows = 0
+    month_key = hours.year.to_numpy() * 12 + hours.month.to_numpy() - 1
+    bounds = np.flatnonzero(np.diff(np.r_[-1, month_key, -1]))
+    for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+        h = hours[a:b]
+        fmt = KNOWN_FORMATS[i % len(KNOWN_FORMATS)]
+        sep = SEPARATORS[i % len(SEPARATORS)]
+        # formatăm cele ~744 de ore o singură dată și le repetăm pentru fiecare țară
+        stamp = h.strftime(fmt).to_numpy()
+        n_h = len(h)
+        frames = []
+        for code in countries:
+            keep = np.ones(n_h, dtype=bool)
+            if code == "RO":
+                keep &= rng.random(n_h) >= MISSING_FRAC
+            idx = np.flatnonzero(keep)
+            if code == "RO":
+                idx = np.sort(np.r_[idx, idx[rng.random(len(idx)) < DUP_FRAC]])
+            frames.append(pd.DataFrame({
+                "MeasureItem": "Monthly Hourly Load Values",
+                "DateUTC": stamp[idx],
+                "DateShort": h.strftime("%Y-%m-%d").to_numpy()[idx],
+                "TimeFrom": h.strftime("%H:%M").to_numpy()[idx],
+                "TimeTo": (h + pd.Timedelta(hours=1)).strftime("%H:%M").to_numpy()[idx],
+                "CountryCode": code,
+                "Cov_ratio": 100,
+                "Value": scale[code] * base[a:b][idx] + rng.normal(0, 150 * scale[code], len(idx)),
+            }))
+        df = pd.concat(frames, ignore_index=True)[ENTSOE_COLUMNS]
+        path = os.path.join(out_dir, f"monthly_hourly_load_values_{h[0].year}_{h[0].month:02d}.csv")
+        df.to_csv(path, sep=sep, index=False, float_format="%.2f")
+        rows += len(df)
+    return rows
+
+def generate(root: str, years: int, countries: list, n_stations: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    hours = pd.date_range(f"{START_YEAR}-01-01", f"{START_YEAR + years}-01-01", freq="h", inclusive="left")
+    temp = national_temp(hours, rng)
+    station_rows = write_stations(root, hours, temp, n_stations, rng)
+    csv_rows = write_entsoe(root, hours, temp, countries, rng)
+    os.makedirs(os.path.join(root, "results"))
+    os.makedirs(os.path.join(root, "models"))
+    return {"hours": len(hours), "days": len(hours) // 24, "csv_rows": csv_rows, "station_rows": station_rows}
+
+def dir_mb(path: str) -> float:
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, names in os.walk(path) for f in names) / 1024**2
+
+@stage("dashboard_query")
+def query():
+    # ce cer paginile dashboard-ului: un an din setul zilnic, o lună orară, scorurile de anomalii
+    from anomaly import load_scores
+    from features import TARGET
+    from storage import read_daily, read_hourly, time_bounds, daily_path
+
+    _, end = time_bounds(daily_path(), "date")
+    with step("daily_year") as rec:
+        rec["rows"] = len(read_daily(end - pd.Timedelta(days=365), end, ["date", TARGET, "temp_c_mean"]))
+    with step("hourly_month") as rec:
+        rec["rows"] = len(read_hourly(end - pd.Timedelta(days=31), end, ["time", "load_mw", "temp_c"]))
+    with step("anomaly_scores") as rec:
+        rec["rows"] = len(load_scores())
+
+def run_point(years: int, countries: list, n_stations: int, seed: int, run_id: str, workdir: str) -> tuple:
+    root = tempfile.mkdtemp(prefix=f"bench_{years}y_", dir=workdir)
+    try:
+        t0 = time.perf_counter()
+        sizes = generate(root, years, countries, n_stations, seed)
+        print(f"\n[{years}y] generated {sizes['csv_rows']:,} CSV rows ({dir_mb(os.path.join(root, 'data/raw/entsoe')):.0f} MB), "
+              f"{n_stations} stations in {time.perf_counter() - t0:.1f}s")
+
+        env = dict(os.environ, EWC_RUN_ID=run_id)
+        for name, script, _ in STAGES:
+            cmd = [sys.executable, os.path.join(SRC_DIR, script.split()[0])] + script.split()[1:]
+            proc = subprocess.run(cmd, cwd=root, env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise RuntimeError(f"{name} a eșuat la {years} ani:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}")
+            print(f"  {name} ok")
+
+        records = pd.read_json(os.path.join(root, "results/stage_timings.jsonl"), lines=True, dtype={"run_id": str})
+        records["years"] = years
+        rows = []
+        for name, _, size_key in STAGES:
+            total = records[(records["stage"] == name) & (records["step"] == "total")].iloc[-1]
+            rows.append({
+                "years": years, "countries": len(countries), "stations": n_stations, "stage": name,
+                "rows_in": sizes[size_key], "seconds": total["seconds"],
+                "rows_per_s": sizes[size_key] / total["seconds"], "peak_rss_mb": total["peak_rss_mb"],
+            })
+        return rows, records
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def compare_previous(res: pd.DataFrame, path: str = OUT_PATH) -> pd.DataFrame:
+    # timpul fiecărei etape față de ultima rulare cu aceeași scară (același număr de ani/țări/stații)
+    if not os.path.exists(path):
+        return None
+    prev = pd.read_csv(path)
+    keys = ["years", "countries", "stations", "stage"]
+    prev = prev.sort_values("run_at").groupby(keys).last().reset_index()
+    out = res.merge(prev[keys + ["seconds", "peak_rss_mb"]], on=keys, how="inner", suffixes=("", "_prev"))
+    if out.empty:
+        return None
+    out["time_ratio"] = out["seconds"] / out["seconds_prev"]
+    return out[keys + ["seconds_prev", "seconds", "time_ratio", "peak_rss_mb_prev", "peak_rss_mb"]]
+
+def main():
+    ap = argparse.ArgumentParser(description="pipeline-ul 01..07 + interogări dashboard pe date sintetice, la mai multe scări")
+    ap.add_argument("--years", type=int, nargs="+", default=[5, 10, 20])
+    ap.add_argument("--countries", type=int, default=len(COUNTRIES), help="câte țări în CSV-uri (RO e mereu inclusă)")
+    ap.add_argument("--stations", type=int, default=15)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workdir", default=None, help="unde se generează datele (implicit directorul temporar)")
+    ap.add_argument("--query", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.query:
+        query()
+        return
+
+    countries = ["RO"] + [c for c in COUNTRIES if c != "RO"][:max(args.countries - 1, 0)]
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+    rows, records = [], []
+    for years in args.years:
+        r, rec = run_point(years, countries, args.stations, args.seed, f"bench-{stamp}-{years}y", args.workdir)
+        rows.extend(r)
+        records.append(rec)
+
+    res = pd.DataFrame(rows)
+    pd.set_option("display.width", 200)
+    print()
+    print(res.round(3).to_string(index=False))
+
+    # scalare: timpul la fiecare scară raportat la cea mai mică (liniar = raportul anilor)
+    pivot = res.pivot(index="stage", columns="years", values="seconds").loc[[s[0] for s in STAGES]]
+    print("\nSeconds per stage vs years:")
+    print((pivot / pivot.iloc[:, [0]].to_numpy()).round(2).to_string())
+
+    prev = compare_previous(res)
+    if prev is not None:
+        print("\nVs previous run at the same scale:")
+        print(prev.round(3).to_string(index=False))
+
+    os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
+    res.insert(0, "run_at", datetime.now().isoformat(timespec="seconds"))
+    res.to_csv(OUT_PATH, mode="a", header=not os.path.exists(OUT_PATH), index=False)
+    with open(STEPS_PATH, "a", encoding="utf-8") as fh:
+        for rec in records:
+            for r in rec.to_dict("records"):
+                fh.write(json.dumps(r, default=str) + "\n")
+    print("\nSaved:", OUT_PATH, "|", STEPS_PATH)
+
+if __name__ == "__main__":
+    main()
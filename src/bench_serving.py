@@ -0,0 +1,80 @@
+﻿import argparse
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import requests
+
+from cache import load_split
+from serving import ARROW_TYPES, MODEL_PATH, load_payload, serve
+
+def encode(df: pd.DataFrame, fmt: str):
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8"), "text/csv"
+    if fmt == "arrow":
+        sink = io.BytesIO()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue(), ARROW_TYPES[0]
+    return df.to_json(orient="records").encode("utf-8"), "application/json"
+
+def main():
+    ap = argparse.ArgumentParser(description="Generator de încărcare pentru POST /predict")
+    ap.add_argument("--url", default=None, help="server deja pornit; implicit pornește unul în proces")
+    ap.add_argument("--model", default=MODEL_PATH)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--requests", type=int, default=400)
+    ap.add_argument("--rows", type=int, default=8, help="rânduri per cerere")
+    ap.add_argument("--format", choices=["json", "csv", "arrow"], default="json")
+    ap.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = ap.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        payload = load_payload(args.model)
+        server = serve(payload, port=0, max_wait_ms=args.max_wait_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    features = requests.get(f"{url}/health").json()["features"]
+    test = load_split()["test"][features]
+    rng = np.random.default_rng(0)
+    bodies = [encode(test.iloc[rng.integers(0, len(test), args.rows)], args.format) for _ in range(32)]
+
+    local = threading.local()
+
+    def one(i):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        body, ctype = bodies[i % len(bodies)]
+        t0 = time.perf_counter()
+        r = local.session.post(f"{url}/predict", data=body, headers={"Content-Type": ctype})
+        r.raise_for_status()
+        return time.perf_counter() - t0
+
+    one(0)  # încălzire
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        lat = np.array(list(pool.map(one, range(args.requests))))
+    elapsed = time.perf_counter() - t0
+
+    total_rows = args.requests * args.rows
+    print(f"{args.requests} requests x {args.rows} rows ({args.format}), concurrency {args.concurrency}")
+    print(f"Throughput: {total_rows / elapsed:,.0f} rows/s | {args.requests / elapsed:,.1f} req/s")
+    print(f"Latency ms: p50={np.percentile(lat, 50) * 1e3:.1f} p90={np.percentile(lat, 90) * 1e3:.1f} "
+          f"p99={np.percentile(lat, 99) * 1e3:.1f} max={lat.max() * 1e3:.1f}")
+    health = requests.get(f"{url}/health").json()
+    if health["batches"]:
+        print(f"Server batches: {health['batches']} (avg {health['rows'] / health['batches']:.1f} rows/batch)")
+
+    if server is not None:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
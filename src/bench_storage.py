@@ -0,0 +1,57 @@
+﻿import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from bench_daily import synthetic_hourly
+from hourly import add_calendar
+from storage import HOURLY_ROW_GROUP, read_range, write_partitioned
+
+def timed(fn):
+    # vârful alocărilor numpy/pandas (DataFrame-ul materializat), nu și bufferele interne arrow
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    out = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return out, elapsed, peak / 1e6
+
+def main():
+    ap = argparse.ArgumentParser(description="citirea unui an: store partiționat vs fișier unic, pe istorii tot mai lungi")
+    ap.add_argument("--years", type=int, nargs="+", default=[5, 20, 40])
+    ap.add_argument("--columns", nargs="+", default=["load_mw", "temp_c"])
+    args = ap.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for years in args.years:
+            load, meteo = synthetic_hourly(years)
+            df = add_calendar(load.merge(meteo, on="time"))
+            single = os.path.join(tmp, f"single_{years}.parquet")
+            store = os.path.join(tmp, f"store_{years}")
+            df.to_parquet(single, index=False)
+            write_partitioned(df, store, "time", HOURLY_ROW_GROUP)
+
+            # ultimul an complet din istoric
+            y = int(df["time"].dt.year.max())
+            start, end = pd.Timestamp(f"{y}-01-01"), pd.Timestamp(f"{y + 1}-01-01")
+
+            def full_then_filter():
+                d = pd.read_parquet(single)
+                return d[(d["time"] >= start) & (d["time"] < end)][["time"] + args.columns]
+
+            a, t_a, m_a = timed(full_then_filter)
+            b, t_b, m_b = timed(lambda: read_range(store, "time", start, end, args.columns))
+            assert len(a) == len(b)
+            rows.append({"years": years, "rows_total": len(df), "rows_read": len(b),
+                         "single_s": t_a, "store_s": t_b, "single_peak_MB": m_a, "store_peak_MB": m_b})
+            del df, load, meteo
+
+    print(pd.DataFrame(rows).round(4).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+﻿import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from timeparse import DateUTCParser
+
+def make_dates(n: int, fmt: str) -> pd.Series:
+    t = pd.date_range("1995-01-01", periods=n, freq="h")
+    return pd.Series(t.strftime(fmt), dtype=object)
+
+def old_parse(s: pd.Series) -> pd.Series:
+    # varianta veche din 01: două treceri complete + fillna
+    dt = pd.to_datetime(s, format="%d-%m-%Y %H:%M", errors="coerce")
+    dt2 = pd.to_datetime(s, format="%d/%m/%Y %H:%M", errors="coerce")
+    return dt.fillna(dt2)
+
+def new_parse(s: pd.Series) -> pd.Series:
+    return DateUTCParser().parse(s, key="bench")
+
+def best_of(fn, s, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(s)
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    cases = {
+        "dash (%d-%m-%Y)": make_dates(args.rows, "%d-%m-%Y %H:%M"),
+        "slash (%d/%m/%Y)": make_dates(args.rows, "%d/%m/%Y %H:%M"),
+    }
+    half = args.rows // 2
+    cases["mixed 50/50"] = pd.concat([cases["dash (%d-%m-%Y)"][:half], cases["slash (%d/%m/%Y)"][half:]])
+
+    rows = []
+    for name, s in cases.items():
+        t_old, a = best_of(old_parse, s, args.repeat)
+        t_new, b = best_of(new_parse, s, args.repeat)
+        same = bool(np.array_equal(a.to_numpy(), b.to_numpy()))
+        rows.append({
+            "case": name,
+            "rows": len(s),
+            "old_s": round(t_old, 3),
+            "new_s": round(t_new, 3),
+            "speedup": round(t_old / t_new, 1),
+            "identical": same,
+        })
+
+    print(pd.DataFrame(rows).to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+﻿import hashlib
+import inspect
+import json
+import os
+import threading
+
+import joblib
+
+import calendar_table
+import features
+from features import BASE_FEATURES, FEATURES, TARGET, add_features
+from storage import daily_path, files_for, read_range
+from zones import DEFAULT_ZONE
+
+CACHE_DIR = "cache"
+MAX_BYTES = 2 * 1024**3
+
+# parametri care nu schimbă modelul antrenat -> nu intră în cheie
+IGNORED_PARAMS = {"n_jobs", "verbose"}
+
+def file_hash(path: str) -> str:
+    # pentru un store partiționat: hash peste toate partițiile, în ordinea anilor
+    h = hashlib.sha256()
+    for f in files_for(path):
+        h.update(os.path.relpath(f, path).encode("utf-8") if os.path.isdir(path) else b"")
+        with open(f, "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b""):
+                h.update(block)
+    return h.hexdigest()
+
+def make_key(*parts) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:40]
+
+# dacă se schimbă codul din features.py sau calendar_table.py, se schimbă și cheile matricelor pregătite
+FEATURES_VERSION = make_key(inspect.getsource(features), inspect.getsource(calendar_table))
+
+class ArtifactCache:
+    # cache adresat prin conținut (cheie = hash), un fișier joblib per intrare;
+    # evicție LRU după dimensiunea totală pe disc (mtime = ultimul acces)
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.joblib")
+
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        # alt proces poate scoate intrarea între verificare și citire -> tratată ca lipsă
+        try:
+            os.utime(path)
+            return joblib.load(path)
+        except FileNotFoundError:
+            return default
+
+    def put(self, key: str, obj):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # scriere în fișier temporar + os.replace: un cititor vede intrarea veche sau pe cea completă
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        joblib.dump(obj, tmp)
+        os.replace(tmp, path)
+        self.evict()
+        return obj
+
+    def get_or_compute(self, key: str, fn):
+        obj = self.get(key)
+        if obj is None:
+            obj = self.put(key, fn())
+        return obj
+
+    def evict(self):
+        # mai multe procese (07 --zones, etapele paralele din pipeline) pot evacua același director
+        # simultan: o intrare dispărută între listare și stat/remove e pur și simplu sărită
+        entries = []
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".joblib"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+def load_split(data_path: str = None, cache: ArtifactCache = None, zone: str = DEFAULT_ZONE) -> dict:
+    # setul zilnic cu feature-uri, fără NaN, împărțit train (ani < ultimul) / test (ultimul an)
+    cache = cache or ArtifactCache()
+    data_path = data_path or daily_path(zone)
+    key = make_key("split:last_year", file_hash(data_path), FEATURES, TARGET, FEATURES_VERSION, zone)
+
+    def compute():
+        # doar coloanele din care add_features construiește FEATURES
+        df = add_features(read_range(data_path, "date", columns=["year", TARGET] + BASE_FEATURES), zone)
+        df = df.dropna(subset=FEATURES + [TARGET, "year"]).copy()
+        last_year = int(df["year"].max())
+        return {
+            "train": df[df["year"] < last_year].copy(),
+            "test": df[df["year"] == last_year].copy(),
+            "test_year": last_year,
+        }
+
+    split = cache.get_or_compute(key, compute)
+    split["key"] = key
+    return split
+
+def fit_model(estimator, split: dict, cache: ArtifactCache = None):
+    # modelul antrenat pe split["train"], refolosit dacă același estimator (clasă + parametri)
+    # a mai fost antrenat pe același split
+    cache = cache or ArtifactCache()
+    params = {k: v for k, v in estimator.get_params().items() if k not in IGNORED_PARAMS}
+    key = make_key("model", split["key"], type(estimator).__name__, params)
+
+    def compute():
+        train = split["train"]
+        return estimator.fit(train[FEATURES], train[TARGET])
+
+    return cache.get_or_compute(key, compute)
@@ -0,0 +1,185 @@
+﻿import argparse
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# tabelul calendaristic: un rând per zi pe mai multe decenii, indexat cu zile de la epoch (aceeași cheie
+# ca daily.day_groups). Un rând se găsește cu o scădere, deci join-ul pe un set de date e o indexare numpy.
+START_YEAR = 1980
+END_YEAR = 2060
+
+CALENDAR_FEATURES = ["is_holiday", "is_bridge", "is_school_vacation"]
+
+# tipul zilei pentru baseline-uri: 0-6 = ziua săptămânii, apoi sărbătoare legală în timpul săptămânii
+# și zi punte; fiecare tip nou are un tip de rezervă când nu există istoric (ex. o sărbătoare nouă)
+HOLIDAY_TYPE = 7
+BRIDGE_TYPE = 8
+N_DAY_TYPES = 9
+DAY_TYPE_FALLBACK = {HOLIDAY_TYPE: 6, BRIDGE_TYPE: 5}
+DAY_TYPE_NAMES = ["Luni", "Marți", "Miercuri", "Joi", "Vineri", "Sâmbătă", "Duminică", "Sărbătoare", "Zi punte"]
+
+# sărbătorile legale (Codul muncii, art. 139): (nume, lună, zi, din anul) și
+# (nume, decalaj față de Paștele ortodox, din anul); None = dinaintea tabelului
+RO_FIXED = [
+    ("Anul Nou", 1, 1, None),
+    ("Anul Nou (a doua zi)", 1, 2, None),
+    ("Boboteaza", 1, 6, 2024),
+    ("Sf. Ioan Botezătorul", 1, 7, 2024),
+    ("Ziua Unirii Principatelor", 1, 24, 2017),
+    ("Ziua Muncii", 5, 1, None),
+    ("Ziua Copilului", 6, 1, 2017),
+    ("Adormirea Maicii Domnului", 8, 15, 2009),
+    ("Sf. Andrei", 11, 30, 2012),
+    ("Ziua Națională", 12, 1, 1990),
+    ("Crăciunul", 12, 25, None),
+    ("Crăciunul (a doua zi)", 12, 26, None),
+]
+RO_EASTER = [
+    ("Vinerea Mare", -2, 2018),
+    ("Paștele", 0, None),
+    ("Paștele (a doua zi)", 1, None),
+    ("Rusaliile", 49, 2008),
+    ("Rusaliile (a doua zi)", 50, 2008),
+]
+
+def day_types(weekday: np.ndarray, is_holiday: np.ndarray, is_bridge: np.ndarray) -> np.ndarray:
+    # sărbătorile din weekend rămân sâmbătă/duminică (consumul e deja de weekend)
+    out = np.asarray(weekday).astype(np.int8)
+    out[(np.asarray(is_holiday) > 0) & (out < 5)] = HOLIDAY_TYPE
+    out[np.asarray(is_bridge) > 0] = BRIDGE_TYPE
+    return out
+
+def fill_day_types(means: np.ndarray) -> np.ndarray:
+    # means: (..., N_DAY_TYPES) cu NaN unde nu există istoric -> valoarea tipului de rezervă
+    out = np.array(means, dtype=float)
+    for t, fallback in DAY_TYPE_FALLBACK.items():
+        out[..., t] = np.where(np.isnan(out[..., t]), out[..., fallback], out[..., t])
+    return out
+
+def orthodox_easter(year: int) -> pd.Timestamp:
+    # algoritmul Meeus pentru calendarul iulian + 13 zile (valabil 1900-2099)
+    a, b, c = year % 4, year % 7, year % 19
+    d = (19 * c + 15) % 30
+    e = (2 * a + 4 * b - d + 34) % 7
+    month, day = divmod(d + e + 114, 31)
+    return pd.Timestamp(year=year, month=month, day=day + 1) + pd.Timedelta(days=13)
+
+def ro_holidays(year: int) -> list:
+    easter = orthodox_easter(year)
+    out = [(name, pd.Timestamp(year=year, month=m, day=d)) for name, m, d, since in RO_FIXED
+           if since is None or year >= since]
+    out += [(name, easter + pd.Timedelta(days=k)) for name, k, since in RO_EASTER if since is None or year >= since]
+    return out
+
+def ro_school_vacations(year: int) -> list:
+    # aproximare: structura anului școlar diferă de la an la an (ordinele ministerului), deci intervalele
+    # sunt cele tipice: iarna, săptămâna din februarie, în jurul Paștelui și vara
+    easter = orthodox_easter(year)
+    feb = pd.Timestamp(year=year, month=2, day=1)
+    feb_monday = feb + pd.Timedelta(days=(7 - feb.weekday()) % 7)
+    sep = pd.Timestamp(year=year, month=9, day=1)
+    second_monday = sep + pd.Timedelta(days=(7 - sep.weekday()) % 7 + 7)
+    return [
+        (pd.Timestamp(year=year, month=1, day=1), pd.Timestamp(year=year, month=1, day=7)),
+        (feb_monday, feb_monday + pd.Timedelta(days=6)),
+        (easter - pd.Timedelta(days=2), easter + pd.Timedelta(days=7)),
+        (pd.Timestamp(year=year, month=6, day=15), second_monday - pd.Timedelta(days=1)),
+        (pd.Timestamp(year=year, month=12, day=22), pd.Timestamp(year=year, month=12, day=31)),
+    ]
+
+# o țară nouă = încă o intrare; zonele fără reguli primesc doar zilele săptămânii (fără sărbători)
+COUNTRIES = {
+    "RO": {"holidays": ro_holidays, "school": ro_school_vacations},
+}
+
+EPOCH_ORDINAL = pd.Timestamp("1970-01-01").toordinal()
+
+def day_index(dates) -> np.ndarray:
+    # zile de la 1970-01-01 (int64)
+    return pd.to_datetime(dates).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+class CalendarTable:
+    def __init__(self, country: str, start_year: int = START_YEAR, end_year: int = END_YEAR):
+        self.country = country
+        days = pd.date_range(f"{start_year}-01-01", f"{end_year}-12-31", freq="D")
+        self.start = days[0].toordinal() - EPOCH_ORDINAL
+        n = len(days)
+        rules = COUNTRIES.get(country, {})
+
+        weekday = days.weekday.to_numpy().astype(np.int8)
+        # cod în self.holiday_names (0 = zi obișnuită)
+        holiday = np.zeros(n, dtype=np.int16)
+        school = np.zeros(n, dtype=np.int8)
+        self.holiday_names = [""]
+        codes = {}
+        # regulile dau câteva zeci de date pe an -> poziții calculate din ordinal, fără conversii pandas
+        at = lambda ts: ts.toordinal() - EPOCH_ORDINAL - self.start
+        for year in range(start_year, end_year + 1):
+            for name, date in rules.get("holidays", lambda y: [])(year):
+                code = codes.setdefault(name, len(codes) + 1)
+                holiday[at(date)] = code
+            for a, b in rules.get("school", lambda y: [])(year):
+                school[at(a):at(b) + 1] = 1
+        self.holiday_names += list(codes)
+
+        is_holiday = holiday > 0
+        off = is_holiday | (weekday >= 5)
+        # zi punte: zi lucrătoare între două zile libere (ex. lunea dinaintea unei sărbători de marți)
+        prev_off = np.r_[False, off[:-1]]
+        next_off = np.r_[off[1:], False]
+        is_bridge = ~off & prev_off & next_off
+
+        self.columns = {
+            "weekday": weekday,
+            "holiday": holiday,
+            "is_holiday": is_holiday.astype(np.int8),
+            "is_bridge": is_bridge.astype(np.int8),
+            "is_school_vacation": school,
+            "day_type": day_types(weekday, is_holiday, is_bridge),
+        }
+        self.end = self.start + n
+
+    def positions(self, days: np.ndarray) -> np.ndarray:
+        pos = np.asarray(days, dtype=np.int64) - self.start
+        if len(pos) and (pos.min() < 0 or pos.max() >= self.end - self.start):
+            raise ValueError(f"Date în afara tabelului calendaristic ({START_YEAR}-{END_YEAR})")
+        return pos
+
+    def lookup(self, dates, columns=CALENDAR_FEATURES) -> dict:
+        # {coloană: array} pentru fiecare dată; O(1) per rând (indexare directă, fără join pe date)
+        pos = self.positions(day_index(dates))
+        return {c: self.columns[c][pos] for c in columns}
+
+    def holiday_name(self, dates) -> np.ndarray:
+        return np.asarray(self.holiday_names, dtype=object)[self.lookup(dates, ["holiday"])["holiday"]]
+
+    def frame(self, start=None, end=None) -> pd.DataFrame:
+        out = pd.DataFrame(self.columns)
+        out.insert(0, "date", pd.to_datetime(np.arange(self.start, self.end).astype("datetime64[D]")))
+        out["holiday"] = np.asarray(self.holiday_names, dtype=object)[out["holiday"].to_numpy()]
+        if start is not None:
+            out = out[out["date"] >= pd.Timestamp(start)]
+        if end is not None:
+            out = out[out["date"] <= pd.Timestamp(end)]
+        return out.reset_index(drop=True)
+
+@lru_cache(maxsize=None)
+def calendar_table(country: str = "RO") -> CalendarTable:
+    # construit o singură dată per proces și țară
+    return CalendarTable(country.upper())
+
+def main():
+    ap = argparse.ArgumentParser(description="sărbătorile, zilele punte și vacanțele școlare dintr-un an")
+    ap.add_argument("year", type=int)
+    ap.add_argument("--country", default="RO")
+    args = ap.parse_args()
+
+    df = calendar_table(args.country).frame(f"{args.year}-01-01", f"{args.year}-12-31")
+    days = df[(df["is_holiday"] == 1) | (df["is_bridge"] == 1)].copy()
+    days["day_type"] = [DAY_TYPE_NAMES[t] for t in days["day_type"]]
+    print(days[["date", "holiday", "is_bridge", "day_type"]].to_string(index=False))
+    print(f"Zile de vacanță școlară: {int(df['is_school_vacation'].sum())}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+﻿import argparse
+
+import numpy as np
+import pandas as pd
+
+from calendar_table import (BRIDGE_TYPE, END_YEAR, HOLIDAY_TYPE, N_DAY_TYPES, START_YEAR, calendar_table,
+                            fill_day_types, orthodox_easter)
+
+# verificare a tabelului calendaristic contra datelor cunoscute: Paștele ortodox, sărbătorile legale
+# (inclusiv cele introduse pe parcurs), zilele punte și tipurile de zi folosite de baseline-uri
+EASTER = {
+    2016: "2016-05-01", 2017: "2017-04-16", 2018: "2018-04-08", 2019: "2019-04-28", 2020: "2020-04-19",
+    2021: "2021-05-02", 2022: "2022-04-24", 2023: "2023-04-16", 2024: "2024-05-05", 2025: "2025-04-20",
+}
+
+# sărbătorile legale complete pe câțiva ani (Codul muncii, art. 139, cu modificările din anul respectiv)
+RO_HOLIDAYS = {
+    # fără 24 ian. (din 2017), 1 iunie (din 2017), Vinerea Mare (din 2018); Paștele cade pe 1 mai
+    2016: ["01-01", "01-02", "05-01", "05-02", "06-19", "06-20", "08-15", "11-30", "12-01", "12-25", "12-26"],
+    2018: ["01-01", "01-02", "01-24", "04-06", "04-08", "04-09", "05-01", "05-27", "05-28", "06-01", "08-15",
+           "11-30", "12-01", "12-25", "12-26"],
+    # din 2024: Boboteaza și Sf. Ioan
+    2024: ["01-01", "01-02", "01-06", "01-07", "01-24", "05-01", "05-03", "05-05", "05-06", "06-01", "06-23",
+           "06-24", "08-15", "11-30", "12-01", "12-25", "12-26"],
+}
+
+# zile lucrătoare între două zile libere
+BRIDGES = ["2022-12-02", "2023-08-14", "2024-12-27"]
+NOT_BRIDGES = ["2023-12-04", "2024-08-14"]
+
+def check(cond: bool, msg: str):
+    if not cond:
+        raise AssertionError(msg)
+    print("OK:", msg)
+
+def main():
+    ap = argparse.ArgumentParser(description="verifică tabelul calendaristic RO contra datelor cunoscute")
+    ap.add_argument("--country", default="RO")
+    args = ap.parse_args()
+    table = calendar_table(args.country)
+
+    wrong = {y: str(orthodox_easter(y).date()) for y, d in EASTER.items() if str(orthodox_easter(y).date()) != d}
+    check(not wrong, f"Paștele ortodox {min(EASTER)}-{max(EASTER)} (Meeus + 13 zile): {wrong or 'toate corecte'}")
+
+    for year, days in RO_HOLIDAYS.items():
+        frame = table.frame(f"{year}-01-01", f"{year}-12-31")
+        got = sorted(frame.loc[frame["is_holiday"] == 1, "date"].dt.strftime("%m-%d"))
+        check(got == sorted(days), f"sărbători legale {year}: {len(days)} zile "
+                                   f"(lipsă {sorted(set(days) - set(got))}, în plus {sorted(set(got) - set(days))})")
+
+    names = dict(zip(["2016-01-24", "2018-04-06", "2024-01-06", "2023-04-16"],
+                     table.holiday_name(["2016-01-24", "2018-04-06", "2024-01-06", "2023-04-16"])))
+    check(names == {"2016-01-24": "", "2018-04-06": "Vinerea Mare", "2024-01-06": "Boboteaza",
+                    "2023-04-16": "Paștele"}, f"numele sărbătorilor: {names}")
+
+    bridge = table.lookup(BRIDGES + NOT_BRIDGES, ["is_bridge"])["is_bridge"]
+    check(bridge.tolist() == [1] * len(BRIDGES) + [0] * len(NOT_BRIDGES), f"zile punte: {BRIDGES}")
+
+    # sărbătoare în timpul săptămânii -> HOLIDAY_TYPE; în weekend rămâne sâmbătă/duminică; punte -> BRIDGE_TYPE
+    dates = ["2023-05-01", "2024-01-06", "2024-01-07", "2022-12-02", "2023-03-15"]
+    types = table.lookup(dates, ["day_type"])["day_type"].tolist()
+    check(types == [HOLIDAY_TYPE, 5, 6, BRIDGE_TYPE, 2], f"day_type {dict(zip(dates, types))}")
+
+    means = np.arange(N_DAY_TYPES, dtype=float)
+    means[[HOLIDAY_TYPE, BRIDGE_TYPE]] = np.nan
+    filled = fill_day_types(means)
+    check(filled[HOLIDAY_TYPE] == 6 and filled[BRIDGE_TYPE] == 5,
+          "fără istoric: sărbătoarea ia media duminicii, puntea pe a sâmbetei")
+
+    school = table.lookup(["2023-01-03", "2023-07-20", "2023-03-15", "2023-10-10"], ["is_school_vacation"])
+    check(school["is_school_vacation"].tolist() == [1, 1, 0, 0], "vacanțe școlare (iarna, vara) vs. zile de școală")
+
+    try:
+        table.lookup([pd.Timestamp(f"{END_YEAR + 1}-01-01")])
+    except ValueError:
+        check(True, f"date în afara {START_YEAR}-{END_YEAR} -> ValueError")
+    else:
+        check(False, f"o dată după {END_YEAR} ar trebui să eșueze")
+    print("Toate verificările au trecut.")
+
+if __name__ == "__main__":
+    main()
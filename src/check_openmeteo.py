@@ -0,0 +1,122 @@
+﻿import argparse
+import json
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from openmeteo import ARCHIVE_URL, HOURLY_VARS, OpenMeteoFetcher
+
+# verificare offline a OpenMeteoFetcher (concurență, retry, cache, contoare, --offline) contra unui
+# server HTTP local care răspunde din fixture: o zi în schema Open-Meteo archive, repetată pe intervalul cerut
+FIXTURE = "data/raw/openmeteo/fixtures/archive_day.json"
+
+STATIONS = pd.DataFrame({
+    "station": ["a", "b", "c", "d", "e"],
+    "lat": [44.43, 46.77, 47.16, 45.75, 44.18],
+    "lon": [26.10, 23.62, 27.59, 21.23, 28.65],
+})
+START, END = "2022-12-30", "2023-01-02"
+
+def make_handler(fixture: dict, seen: Counter, fail_first: bool):
+    day = fixture["hourly"]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            seen[url.query] += 1
+            # prima cerere pentru fiecare URL -> 503, ca să treacă prin retry
+            if fail_first and seen[url.query] == 1:
+                self.send_response(503)
+                self.end_headers()
+                return
+            hours = pd.date_range(q["start_date"], pd.Timestamp(q["end_date"]) + pd.Timedelta(hours=23), freq="h")
+            hourly = {"time": hours.strftime("%Y-%m-%dT%H:%M").tolist()}
+            for var in q["hourly"].split(","):
+                hourly[var] = [day[var][t.hour] for t in hours]
+            body = json.dumps(dict(fixture, latitude=float(q["latitude"]), longitude=float(q["longitude"]),
+                                   hourly=hourly)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+def check(cond: bool, msg: str):
+    if not cond:
+        raise AssertionError(msg)
+    print("OK:", msg)
+
+def main():
+    ap = argparse.ArgumentParser(description="verifică OpenMeteoFetcher offline, contra fixture-ului local")
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    with open(FIXTURE, encoding="utf-8") as fh:
+        fixture = json.load(fh)
+    seen = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(fixture, seen, fail_first=True))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1/archive"
+
+    # intervalul trece peste un an nou -> 2 cereri per stație
+    tasks = len(STATIONS) * 2
+    hours = pd.date_range(START, pd.Timestamp(END) + pd.Timedelta(hours=23), freq="h")
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            t0 = time.perf_counter()
+            cold = OpenMeteoFetcher(base_url, cache_dir, max_workers=args.workers, backoff=0)
+            frames = cold.fetch_many(STATIONS, START, END)
+            print(f"cold: {time.perf_counter() - t0:.2f}s")
+            check(cold.misses == tasks and cold.hits == 0, f"cache rece: {cold.misses} cereri HTTP, {cold.hits} din cache")
+            check(sum(seen.values()) == 2 * tasks, f"fiecare cerere a trecut prin retry după 503 ({sum(seen.values())} cereri)")
+            check(sorted(frames) == sorted(STATIONS["station"]), "un DataFrame per stație")
+            check(all(len(df) == len(hours) and df["time"].is_monotonic_increasing for df in frames.values()),
+                  f"{len(hours)} ore per stație, sortate, fără dubluri între bucățile anuale")
+            expected = np.array([fixture["hourly"]["temperature_2m"][t.hour] for t in hours])
+            check(np.allclose(frames["a"]["temp_c"], expected), "valorile din fixture ajung în coloanele noastre")
+            check(set(HOURLY_VARS.values()) <= set(frames["a"].columns), "toate variabilele orare")
+
+            served = sum(seen.values())
+            warm = OpenMeteoFetcher(base_url, cache_dir, max_workers=args.workers, backoff=0)
+            again = warm.fetch_many(STATIONS, START, END)
+            check(warm.hits == tasks and warm.misses == 0, f"cache cald: {warm.hits} din cache, {warm.misses} HTTP")
+            check(sum(seen.values()) == served, "nicio cerere HTTP nouă cu cache-ul cald")
+            check(all(again[s].equals(frames[s]) for s in frames), "aceleași date din cache")
+
+            offline = OpenMeteoFetcher(base_url, cache_dir, max_workers=args.workers, offline=True)
+            offline.fetch_many(STATIONS, START, END)
+            check(offline.hits == tasks, "--offline citește doar din cache")
+
+            try:
+                OpenMeteoFetcher(ARCHIVE_URL, cache_dir, offline=True).fetch_many(STATIONS, START, END)
+            except FileNotFoundError:
+                check(True, "răspunsurile serverului local nu sunt servite drept arhiva reală")
+            else:
+                check(False, "cache-ul serverului local nu trebuie să acopere arhiva reală")
+
+        with tempfile.TemporaryDirectory() as empty:
+            try:
+                OpenMeteoFetcher(base_url, empty, offline=True).fetch_many(STATIONS, START, END)
+            except FileNotFoundError:
+                check(True, "--offline cu cache gol -> FileNotFoundError, fără cereri HTTP")
+            else:
+                check(False, "--offline cu cache gol ar trebui să eșueze")
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("Toate verificările au trecut.")
+
+if __name__ == "__main__":
+    main()
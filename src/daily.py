@@ -0,0 +1,75 @@
+﻿import numpy as np
+import pandas as pd
+
+# agregatele de bază: coloană finală -> (coloană orară, funcție)
+METEO_AGGS = {
+    "temp_c_mean": ("temp_c", "mean"),
+    "temp_c_min": ("temp_c", "min"),
+    "temp_c_max": ("temp_c", "max"),
+    "precip_mm_sum": ("precip_mm", "sum"),
+    "wind_ms_mean": ("wind_ms", "mean"),
+    "rh_pct_mean": ("rh_pct", "mean"),
+}
+LOAD_AGGS = {
+    "load_mw_daily_mean": ("load_mw", "mean"),
+}
+
+# agregate suplimentare, toate calculate din aceeași grupare pe zi
+DAILY_EXTRAS = {
+    "temp_quantiles": (0.1, 0.9),
+    "hdh_base": 18.0,   # heating degree-hours: sum(max(base - temp, 0))
+    "cdh_base": 22.0,   # cooling degree-hours: sum(max(temp - base, 0))
+    "load_peak": True,  # vârf / minim zilnic + ora vârfului
+}
+
+def day_groups(times: pd.Series):
+    # cheie întreagă (zile de la epoch) -> o singură factorizare refolosită de toate agregatele
+    return pd.to_datetime(times).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+def _finish(out: pd.DataFrame) -> pd.DataFrame:
+    # zile fără niciun rând -> rânduri NaN, ca la resample("D")
+    out.index = pd.to_datetime(out.index.to_numpy().astype("datetime64[D]")).rename("time")
+    full = pd.date_range(out.index.min(), out.index.max(), freq="D", name="time")
+    return out.reindex(full)
+
+def daily_meteo(meteo: pd.DataFrame, extras=DAILY_EXTRAS) -> pd.DataFrame:
+    # meteo: coloane time + variabile orare
+    work = meteo.drop(columns=["time"])
+    named = dict(METEO_AGGS)
+
+    if extras.get("hdh_base") is not None:
+        col = f"hdh{extras['hdh_base']:g}"
+        work[col] = np.clip(extras["hdh_base"] - work["temp_c"], 0, None)
+        named[col] = (col, "sum")
+    if extras.get("cdh_base") is not None:
+        col = f"cdh{extras['cdh_base']:g}"
+        work[col] = np.clip(work["temp_c"] - extras["cdh_base"], 0, None)
+        named[col] = (col, "sum")
+
+    gb = work.groupby(day_groups(meteo["time"]), sort=True)
+    out = gb.agg(**named)
+
+    qs = extras.get("temp_quantiles") or ()
+    if qs:
+        q = gb["temp_c"].quantile(list(qs)).unstack()
+        for qq in qs:
+            out[f"temp_c_q{round(qq * 100):02d}"] = q[qq]
+
+    return _finish(out)
+
+def daily_load(load: pd.DataFrame, extras=DAILY_EXTRAS) -> pd.DataFrame:
+    # load: coloane time, load_mw
+    load = load.dropna(subset=["load_mw"]).reset_index(drop=True)
+    named = dict(LOAD_AGGS)
+    if extras.get("load_peak"):
+        named["load_mw_daily_max"] = ("load_mw", "max")
+        named["load_mw_daily_min"] = ("load_mw", "min")
+
+    gb = load.groupby(day_groups(load["time"]), sort=True)
+    out = gb.agg(**named)
+
+    if extras.get("load_peak"):
+        peak_rows = gb["load_mw"].idxmax().to_numpy()
+        out["load_peak_hour"] = pd.to_datetime(load["time"]).dt.hour.to_numpy()[peak_rows].astype(np.int8)
+
+    return _finish(out)
@@ -0,0 +1,47 @@
+﻿import numpy as np
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from anomaly import ROLL_WINDOW, load_scores
+from calendar_table import DAY_TYPE_NAMES
+from dashboard_pages.common import TARGET
+from storage import daily_path, version
+
+SCORE_COLS = {"global": "z_robust", f"local (fereastră mobilă {ROLL_WINDOW} zile)": "z_rolling"}
+
+@st.cache_resource
+def anomaly_scores(version: tuple, zone: str) -> pd.DataFrame:
+    # version = (fișier, mtime, size) pe partiții -> recalcul doar când se schimbă setul de date;
+    # scorurile nu depind de intervalul ales în sidebar
+    return load_scores(daily_path(zone), zone=zone)
+
+def render(d1, d2, zone):
+    scores = anomaly_scores(version(daily_path(zone)), zone)
+    dates = scores["date"]
+    lo = int(dates.searchsorted(pd.Timestamp(d1), side="left"))
+    hi = int(dates.searchsorted(pd.Timestamp(d2) + pd.Timedelta(days=1), side="left"))
+    view = scores.iloc[lo:hi]
+
+    st.subheader("Detecție anomalii (z-score robust pe reziduuri)")
+    st.caption("Baseline sezonier: media pe (lună, tip de zi) pe tot istoricul; tipul zilei e ziua săptămânii, "
+               "sărbătoare legală sau zi punte (src/calendar_table.py). Anomaliile sunt abateri mari față de baseline.")
+
+    kind = st.radio("Scor", list(SCORE_COLS), horizontal=True)
+    zcol = SCORE_COLS[kind]
+    thr = st.slider("Prag |z| pentru anomalii", min_value=2.0, max_value=6.0, value=3.5, step=0.1)
+    anom = view[np.abs(view[zcol]) >= thr].sort_values(zcol, ascending=False)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        fig = px.line(view, x="date", y="residual", title="Reziduu (consum - baseline)")
+        st.plotly_chart(fig, use_container_width=True)
+    with c2:
+        fig = px.scatter(view, x="date", y=zcol, title="z-score robust al reziduului")
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.write(f"Anomalii detectate: {len(anom)}")
+    show_cols = ["date", "day_type", "holiday", TARGET, "baseline_mw", "residual", zcol,
+                 "temp_c_mean", "precip_mm_sum", "wind_ms_mean"]
+    table = anom[show_cols].head(50).assign(day_type=lambda d: [DAY_TYPE_NAMES[t] for t in d["day_type"]])
+    st.dataframe(table, use_container_width=True)
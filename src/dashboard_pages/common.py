@@ -0,0 +1,30 @@
+﻿import pandas as pd
+import streamlit as st
+
+from storage import daily_path, daily_zones, read_range, time_bounds
+from zones import DEFAULT_ZONE
+
+TARGET = "load_mw_daily_mean"
+WEATHER_COLS = ["temp_c_mean","temp_c_min","temp_c_max","precip_mm_sum","wind_ms_mean","rh_pct_mean"]
+
+@st.cache_data
+def zones() -> list:
+    return daily_zones()
+
+@st.cache_resource
+def load_columns(columns: tuple, zone: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # tot istoricul zonei, doar coloanele paginii; obiectul e partajat între rerun-uri,
+    # deci paginile nu îl modifică pe loc (fac .copy() unde adaugă coloane)
+    return read_range(daily_path(zone), "date", columns=list(columns))
+
+@st.cache_data
+def date_bounds(zone: str = DEFAULT_ZONE):
+    # din statisticile parquet, fără să citească datele
+    lo, hi = time_bounds(daily_path(zone), "date")
+    return lo.date(), hi.date()
+
+@st.cache_data(max_entries=32)
+def date_view(columns: tuple, d1, d2, zone: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # doar store-ul zonei, iar în el partițiile (anii) și row group-urile care intersectează intervalul
+    end = pd.Timestamp(d2) + pd.Timedelta(days=1)
+    return read_range(daily_path(zone), "date", start=d1, end=end, columns=list(columns))
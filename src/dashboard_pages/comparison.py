@@ -0,0 +1,51 @@
+﻿import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from zones import DEFAULT_ZONE
+
+ZONE_METRICS = "results/zone_metrics.csv"
+
+def render(d1, d2, zone):
+    if zone != DEFAULT_ZONE:
+        render_zones(zone)
+        return
+
+    st.subheader("Compararea modelelor")
+    st.caption("Baseline vs Linear Regression vs Random Forest, evaluare pe ultimul an (test).")
+
+    try:
+        metrics = pd.read_csv("results/model_metrics.csv")
+        st.dataframe(metrics, use_container_width=True)
+
+        fig = px.bar(metrics, x="model", y="RMSE", title="RMSE pe modele (mai mic = mai bun)")
+        st.plotly_chart(fig, use_container_width=True)
+
+        fig = px.bar(metrics, x="model", y="MAE", title="MAE pe modele (mai mic = mai bun)")
+        st.plotly_chart(fig, use_container_width=True)
+
+        best = metrics.sort_values("RMSE").iloc[0]
+        st.success(f"Cel mai bun model (după RMSE): {best['model']} | RMSE={best['RMSE']:.2f}, MAE={best['MAE']:.2f}")
+
+        # benzile P10/P90 (doar modelele de tip pădure): acoperirea ar trebui să fie în jur de 80%
+        if "coverage_p10_p90" in metrics:
+            st.dataframe(metrics.dropna(subset=["coverage_p10_p90"])[
+                ["model", "coverage_p10_p90"] + [c for c in metrics if c.startswith("pinball_")]],
+                use_container_width=True)
+    except Exception as e:
+        st.error("Nu găsesc results/model_metrics.csv. Rulează: python src/08_model_comparison.py")
+        st.write("Eroare:", e)
+
+def render_zones(zone):
+    # 08 compară modelele doar pe zona implicită; pentru celelalte, modelul final al fiecărei zone (07 --zones)
+    st.subheader("Modelul final pe zone")
+    try:
+        metrics = pd.read_csv(ZONE_METRICS)
+    except FileNotFoundError:
+        st.error(f"Nu găsesc {ZONE_METRICS}. Rulează: python src/07_train_and_save.py --zones all")
+        return
+
+    st.dataframe(metrics.style.apply(lambda r: ["font-weight: bold" if r["zone"] == zone else ""] * len(r), axis=1),
+                 use_container_width=True)
+    fig = px.bar(metrics, x="zone", y="MAE", color=metrics["zone"] == zone, title="MAE pe zone (anul de test)")
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,33 @@
+﻿import plotly.express as px
+import streamlit as st
+
+from dashboard_pages.common import TARGET, WEATHER_COLS, date_view
+
+COLUMNS = ("date", TARGET, *WEATHER_COLS, "weekday", "month")
+
+def render(d1, d2, zone):
+    view = date_view(COLUMNS, d1, d2, zone)
+
+    st.subheader("Relații și sezonalitate")
+    x_col = st.selectbox("Variabilă meteo (X)", ["temp_c_mean","precip_mm_sum","wind_ms_mean","rh_pct_mean"], index=0)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        fig = px.scatter(view, x=x_col, y=TARGET, trendline="ols", title=f"{x_col} vs consum (MW)")
+        st.plotly_chart(fig, use_container_width=True)
+    with c2:
+        corr = view[[TARGET] + WEATHER_COLS].corr(numeric_only=True)
+        fig = px.imshow(corr, text_auto=True, aspect="auto", title="Corelații (Pearson)")
+        st.plotly_chart(fig, use_container_width=True)
+
+    c3, c4 = st.columns(2)
+    with c3:
+        wd = view.groupby("weekday")[TARGET].mean().reset_index()
+        wd["day"] = wd["weekday"].map({0:"L",1:"Ma",2:"Mi",3:"J",4:"V",5:"S",6:"D"})
+        fig = px.line(wd, x="day", y=TARGET, markers=True, title="Consum mediu pe zi a săptămânii")
+        st.plotly_chart(fig, use_container_width=True)
+
+    with c4:
+        mo = view.groupby("month")[TARGET].mean().reset_index()
+        fig = px.bar(mo, x="month", y=TARGET, title="Consum mediu pe lună")
+        st.plotly_chart(fig, use_container_width=True)
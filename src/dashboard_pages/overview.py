@@ -0,0 +1,26 @@
+﻿import plotly.express as px
+import streamlit as st
+
+from dashboard_pages.common import TARGET, date_view
+
+COLUMNS = ("date", TARGET, "temp_c_mean", "precip_mm_sum")
+
+def render(d1, d2, zone):
+    view = date_view(COLUMNS, d1, d2, zone)
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Zile în interval", f"{len(view)}")
+    c2.metric("Consum mediu (MW)", f"{view[TARGET].mean():.1f}")
+    c3.metric("Temp medie (°C)", f"{view['temp_c_mean'].mean():.1f}")
+    c4.metric("Precip total (mm)", f"{view['precip_mm_sum'].sum():.1f}")
+
+    fig = px.line(view, x="date", y=TARGET, title="Consum zilnic mediu (MW)")
+    st.plotly_chart(fig, use_container_width=True)
+
+    c1, c2 = st.columns(2)
+    with c1:
+        fig = px.line(view, x="date", y="temp_c_mean", title="Temperatura medie zilnică (°C)")
+        st.plotly_chart(fig, use_container_width=True)
+    with c2:
+        fig = px.bar(view, x="date", y="precip_mm_sum", title="Precipitații zilnice (mm)")
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,117 @@
+﻿import os
+
+import joblib
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from dashboard_pages.common import TARGET, load_columns
+from features import BASE_FEATURES, add_features
+from forest import FlatForest, forest_quantiles
+from scenarios import RH_DELTAS, TEMP_DELTAS, TEMP_DELTAS_COARSE, ScenarioSurface
+from zones import model_paths
+
+# coloanele din care add_features reconstruiește feature-urile modelului
+COLUMNS = ("date", "year", TARGET, *BASE_FEATURES)
+
+@st.cache_resource
+def load_featured(zone: str):
+    # lag-uri/rolling/degree-days cerute de modelul salvat
+    return add_features(load_columns(COLUMNS, zone), zone)
+
+@st.cache_resource
+def load_model(zone: str):
+    # formatul aplatizat (memory-mapped) dacă există, altfel payload-ul joblib
+    model_path, flat_path = model_paths(zone)
+    if os.path.isdir(flat_path):
+        model = FlatForest.load(flat_path)
+        return dict(model.meta, model=model)
+    return joblib.load(model_path)
+
+def model_key(zone: str):
+    # identifică versiunea modelului salvat fără să citim tot fișierul
+    model_path, flat_path = model_paths(zone)
+    path = os.path.join(flat_path, "value.npy") if os.path.isdir(flat_path) else model_path
+    st_ = os.stat(path)
+    return f"{path}:{st_.st_size}:{st_.st_mtime_ns}"
+
+@st.cache_resource(max_entries=8)
+def scenario_surface(_model, _X, features, key, d1, d2, grids):
+    # un singur predict batch pe toată grila, cache per (model, interval de date, grilă)
+    return ScenarioSurface(_model, _X, features, {v: np.asarray(a) for v, a in grids})
+
+def rmse(y_true, y_pred):
+    return float(np.sqrt(mean_squared_error(y_true, y_pred)))
+
+def render(d1, d2, zone):
+    df = load_featured(zone)
+
+    st.subheader("Predicții (modelul salvat)")
+    try:
+        payload = load_model(zone)
+        model = payload["model"]
+        FEATURES = payload["features"]
+        test_year = payload["test_year"]
+    except Exception as e:
+        st.error(f"Nu găsesc modelul salvat. Rulează: python src/07_train_and_save.py --zones {zone}. Eroare: {e}")
+        st.stop()
+
+    st.caption(f"Model: {payload.get('model_name', 'RandomForest')}. Train years: {payload['train_years']}. Test year: {test_year}.")
+
+    test = df[df["year"] == test_year].copy()
+    test = test[(test["date"].dt.date >= d1) & (test["date"].dt.date <= d2)].copy()
+
+    if len(test) == 0:
+        st.warning("Intervalul selectat nu conține date din anul de test. Selectează un interval care include anul de test.")
+        st.stop()
+
+    X = test[FEATURES]
+    y = test[TARGET]
+    # pădurile dau și benzile P10/P50/P90 (cuantilele pe arbori), din aceeași trecere ca media
+    bands = forest_quantiles(model, X)
+    pred = bands[0] if bands is not None else model.predict(X)
+
+    mae = mean_absolute_error(y, pred)
+    r = rmse(y, pred)
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("MAE (test)", f"{mae:.2f}")
+    c2.metric("RMSE (test)", f"{r:.2f}")
+    c3.metric("n (test)", f"{len(test)}")
+
+    plot_df = test[["date", TARGET]].copy()
+    plot_df["pred_rf"] = pred
+    fig = px.line(plot_df, x="date", y=[TARGET, "pred_rf"], title="Real vs Predicție (RF)")
+    if bands is not None:
+        q = bands[1]
+        c4.metric("Acoperire P10–P90", f"{np.mean((y >= q[:, 0]) & (y <= q[:, -1])):.0%}")
+        fig.add_trace(go.Scatter(x=plot_df["date"], y=q[:, -1], mode="lines", line=dict(width=0),
+                                 showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=plot_df["date"], y=q[:, 0], mode="lines", line=dict(width=0), fill="tonexty",
+                                 fillcolor="rgba(99, 110, 250, 0.2)", name="P10–P90"))
+    else:
+        c4.caption("Benzile P10/P90 sunt disponibile doar pentru modelele de tip pădure.")
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Simulare: ce se întâmplă dacă schimbăm temperatura?")
+    st.caption("Ajustează temperatura (medie/min/max, mediile mobile și degree-days) cu un delta și vezi efectul estimat asupra predicției.")
+
+    # toate deltele sunt prezise o singură dată; slider-ul doar citește din grilă
+    mkey = model_key(zone)
+    temp_grid = (("temp", tuple(TEMP_DELTAS)),)
+    surface = scenario_surface(model, X, FEATURES, mkey, d1, d2, temp_grid)
+
+    delta = st.slider("Delta temperatură (°C)", -10.0, 10.0, 0.0, 0.5)
+    pred_sim = surface.lookup(delta)
+
+    if st.checkbox("Simulare combinată temperatură × umiditate"):
+        rh_delta = st.slider("Delta umiditate relativă (pp)", -20.0, 20.0, 0.0, 1.0)
+        grid_2d = (("temp", tuple(TEMP_DELTAS_COARSE)), ("rh", tuple(RH_DELTAS)))
+        pred_sim = scenario_surface(model, X, FEATURES, mkey, d1, d2, grid_2d).lookup(delta, rh_delta)
+
+    sim_df = plot_df.copy()
+    sim_df["pred_rf_temp_shift"] = pred_sim
+    fig = px.line(sim_df, x="date", y=["pred_rf", "pred_rf_temp_shift"], title="Predicție RF: original vs temperatură modificată")
+    st.plotly_chart(fig, use_container_width=True)
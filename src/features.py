@@ -0,0 +1,81 @@
+﻿import numpy as np
+import pandas as pd
+
+from calendar_table import CALENDAR_FEATURES, calendar_table
+from zones import DEFAULT_ZONE
+
+TARGET = "load_mw_daily_mean"
+
+BASE_FEATURES = [
+    "temp_c_mean","temp_c_min","temp_c_max",
+    "precip_mm_sum","wind_ms_mean","rh_pct_mean",
+    "weekday","month","is_weekend"
+]
+
+# lag-uri și ferestre în zile; ferestrele pe consum sunt decalate cu o zi (fără leakage)
+LOAD_LAGS = (1, 7, 14)
+LOAD_WINDOWS = (7, 28)
+TEMP_WINDOWS = (3, 7)
+HDD_BASE = 18.0
+CDD_BASE = 22.0
+
+DEGREE_FEATURES = ["hdd", "cdd"]
+LAG_FEATURES = [f"load_lag{k}" for k in LOAD_LAGS]
+ROLL_FEATURES = [f"load_roll{w}" for w in LOAD_WINDOWS] + [f"temp_roll{w}" for w in TEMP_WINDOWS]
+
+# sărbători, zile punte, vacanțe școlare: din tabelul calendaristic al țării, indexat pe zi
+FEATURES = BASE_FEATURES + DEGREE_FEATURES + LAG_FEATURES + ROLL_FEATURES + CALENDAR_FEATURES
+
+# câte zile din urmă sunt necesare ca să calculăm feature-urile unei zile noi
+LOOKBACK = max(max(LOAD_LAGS), max(LOAD_WINDOWS) + 1, max(TEMP_WINDOWS))
+
+def add_features(df: pd.DataFrame, country: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # df: setul zilnic din 03 (o linie per zi); întoarce o copie cu feature-urile derivate
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date").reset_index(drop=True)
+
+    # lag-urile se calculează pe axa calendaristică, ca o zi lipsă să nu mute valorile
+    full = pd.date_range(df["date"].iloc[0], df["date"].iloc[-1], freq="D")
+    pos = full.get_indexer(df["date"])
+    load = np.full(len(full), np.nan)
+    load[pos] = df[TARGET].to_numpy(dtype=float)
+    temp = np.full(len(full), np.nan)
+    temp[pos] = df["temp_c_mean"].to_numpy(dtype=float)
+    load, temp = pd.Series(load), pd.Series(temp)
+
+    t = df["temp_c_mean"].to_numpy(dtype=float)
+    df["hdd"] = np.clip(HDD_BASE - t, 0, None)
+    df["cdd"] = np.clip(t - CDD_BASE, 0, None)
+
+    for k in LOAD_LAGS:
+        df[f"load_lag{k}"] = load.shift(k).to_numpy()[pos]
+    prev = load.shift(1)
+    for w in LOAD_WINDOWS:
+        df[f"load_roll{w}"] = prev.rolling(w, min_periods=w).mean().to_numpy()[pos]
+    for w in TEMP_WINDOWS:
+        df[f"temp_roll{w}"] = temp.rolling(w, min_periods=w).mean().to_numpy()[pos]
+
+    # day_type nu e feature de model, dar îl folosesc baseline-urile din 06/08
+    cal = calendar_table(country).lookup(df["date"], CALENDAR_FEATURES + ["day_type"])
+    for col, values in cal.items():
+        df[col] = values
+
+    return df
+
+def append_features(featured: pd.DataFrame, new_days: pd.DataFrame, country: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # adaugă zile noi la un set deja calculat: recalculăm doar ultimele LOOKBACK zile + zilele noi
+    if featured.empty:
+        return add_features(new_days, country)
+    new_days = new_days.copy()
+    new_days["date"] = pd.to_datetime(new_days["date"])
+    last = featured["date"].max()
+    new_days = new_days[new_days["date"] > last]
+    if new_days.empty:
+        return featured
+
+    tail = featured[featured["date"] > last - pd.Timedelta(days=LOOKBACK)]
+    window = pd.concat([tail[new_days.columns.intersection(tail.columns)], new_days], ignore_index=True)
+    fresh = add_features(window, country)
+    fresh = fresh[fresh["date"] > last]
+    return pd.concat([featured, fresh[featured.columns]], ignore_index=True)
@@ -0,0 +1,172 @@
+﻿import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from calendar_table import CALENDAR_FEATURES, calendar_table
+from daily import METEO_AGGS
+from features import CDD_BASE, HDD_BASE, LOAD_LAGS, LOAD_WINDOWS, LOOKBACK, TARGET, TEMP_WINDOWS
+from forest import forest_quantiles
+from openmeteo import hourly_frame
+from serving import Predictor
+from weather import WEATHER_VARS
+from zones import DEFAULT_ZONE
+
+# prognozele meteo, citite offline: câte un răspuns JSON Open-Meteo (API-ul forecast sau
+# historical-forecast, aceeași schemă) per stație și dată de emitere: <dir>/<stație>/<YYYY-MM-DD>.json
+FORECAST_DIR = "data/raw/openmeteo/forecasts"
+HORIZON = 14
+# o zi din prognoză contează doar dacă are destule ore (ultima zi a răspunsului e uneori trunchiată)
+MIN_HOURS = 20
+METEO_COLS = list(METEO_AGGS)
+
+def forecast_files(forecast_dir: str, stations) -> pd.DataFrame:
+    # (station, issue, path); data emiterii vine din numele fișierului
+    rows = []
+    for station in stations:
+        for path in sorted(glob.glob(os.path.join(forecast_dir, station, "*.json"))):
+            issue = pd.to_datetime(os.path.splitext(os.path.basename(path))[0], errors="coerce")
+            if pd.notna(issue):
+                rows.append((station, issue.normalize(), path))
+    return pd.DataFrame(rows, columns=["station", "issue", "path"])
+
+def read_forecasts(files: pd.DataFrame) -> pd.DataFrame:
+    # toate fișierele într-un singur DataFrame lung (issue, station, time, variabile)
+    frames = []
+    for r in files.itertuples():
+        with open(r.path, encoding="utf-8") as fh:
+            df = hourly_frame(json.load(fh)).reindex(columns=["time"] + WEATHER_VARS)
+        df["station"] = r.station
+        df["issue"] = r.issue
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=["time"] + WEATHER_VARS + ["station", "issue"])
+    return pd.concat(frames, ignore_index=True)
+
+def forecast_daily(long: pd.DataFrame, weights: pd.Series) -> pd.DataFrame:
+    # media ponderată pe stații pentru fiecare (emitere, oră), apoi agregatele din daily.METEO_AGGS
+    # pe (emitere, zi) -> index (issue, date), coloanele METEO_COLS; o singură grupare pentru toate emiterile
+    w = long["station"].map(weights).fillna(0).to_numpy(dtype=float)
+    vals = long[WEATHER_VARS].to_numpy(dtype=float)
+    valid = ~np.isnan(vals)
+    keys = [long["issue"], long["time"]]
+    num = pd.DataFrame(np.where(valid, vals, 0) * w[:, None], columns=WEATHER_VARS).groupby(keys).sum()
+    den = pd.DataFrame(valid * w[:, None], columns=WEATHER_VARS).groupby(keys).sum()
+    hourly = (num / den.where(den > 0)).reset_index()
+
+    hourly["date"] = hourly["time"].dt.normalize()
+    gb = hourly.groupby(["issue", "date"])
+    out = gb.agg(**METEO_AGGS)
+    return out[gb["temp_c"].count() >= MIN_HOURS]
+
+def weather_cube(daily: pd.DataFrame, issues: pd.DatetimeIndex, horizon: int) -> np.ndarray:
+    # (issue, date) -> (n_issues, horizon, METEO_COLS), NaN acolo unde prognoza lipsește
+    cube = np.full((len(issues), horizon, len(METEO_COLS)), np.nan)
+    if daily.empty:
+        return cube
+    i = issues.get_indexer(daily.index.get_level_values("issue"))
+    lead = (daily.index.get_level_values("date") - daily.index.get_level_values("issue")).days.to_numpy()
+    keep = (i >= 0) & (lead >= 0) & (lead < horizon)
+    cube[i[keep], lead[keep]] = daily[METEO_COLS].to_numpy(dtype=float)[keep]
+    return cube
+
+class History:
+    # setul zilnic din 03 pe axa calendaristică: consum și meteo observate, indexabile vectorizat
+    # după (emitere, zi relativă) -> fereastra din urmă a tuturor emiterilor într-o singură indexare
+
+    def __init__(self, df: pd.DataFrame, until: pd.Timestamp):
+        df = df.sort_values("date")
+        self.days = pd.date_range(df["date"].iloc[0], max(df["date"].iloc[-1], until), freq="D")
+        pos = self.days.get_indexer(df["date"])
+        self.load = np.full(len(self.days), np.nan)
+        self.load[pos] = df[TARGET].to_numpy(dtype=float)
+        self.meteo = np.full((len(self.days), len(METEO_COLS)), np.nan)
+        self.meteo[pos] = df[METEO_COLS].to_numpy(dtype=float)
+
+    def positions(self, issues: pd.DatetimeIndex) -> np.ndarray:
+        return self.days.get_indexer(issues)
+
+    def window(self, values: np.ndarray, pos: np.ndarray, start: int, stop: int) -> np.ndarray:
+        # values[p + start : p + stop] pentru fiecare emitere p, NaN în afara axei
+        idx = pos[:, None] + np.arange(start, stop)
+        ok = (idx >= 0) & (idx < len(values))
+        out = np.full(idx.shape + values.shape[1:], np.nan)
+        out[ok] = values[idx[ok]]
+        return out
+
+def recursive_forecast(payload: dict, history: History, issues: pd.DatetimeIndex, weather: np.ndarray,
+                       horizon: int = HORIZON, country: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # emiterea D: consum observat până în D-1, meteo din `weather` (n, horizon, METEO_COLS) pentru D..D+h-1.
+    # Bucla e pe pașii orizontului, nu pe emiteri: la pasul h toate emiterile intră într-un singur predict,
+    # iar predicțiile devin lag-urile / ferestrele de consum ale pașilor următori.
+    features = list(payload["features"])
+    model = payload["model"]
+    predictor = Predictor(payload)
+    calendar = calendar_table(country)
+    pos = history.positions(issues)
+    n = len(issues)
+
+    load = np.concatenate([history.window(history.load, pos, -LOOKBACK, 0), np.full((n, horizon), np.nan)], axis=1)
+    t_mean = METEO_COLS.index("temp_c_mean")
+    temp = np.concatenate([history.window(history.meteo, pos, -LOOKBACK, 0)[..., t_mean],
+                           weather[..., t_mean]], axis=1)
+
+    parts = []
+    for h in range(horizon):
+        c = LOOKBACK + h
+        target = issues + pd.Timedelta(days=h)
+        cols = {col: weather[:, h, j] for j, col in enumerate(METEO_COLS)}
+        cols["weekday"] = target.weekday.to_numpy(dtype=float)
+        cols["month"] = target.month.to_numpy(dtype=float)
+        cols["is_weekend"] = (target.weekday >= 5).astype(float)
+        cols.update(calendar.lookup(target, CALENDAR_FEATURES))
+        t = temp[:, c]
+        cols["hdd"] = np.clip(HDD_BASE - t, 0, None)
+        cols["cdd"] = np.clip(t - CDD_BASE, 0, None)
+        for k in LOAD_LAGS:
+            cols[f"load_lag{k}"] = load[:, c - k]
+        for w in LOAD_WINDOWS:
+            cols[f"load_roll{w}"] = load[:, c - w:c].mean(axis=1)
+        for w in TEMP_WINDOWS:
+            cols[f"temp_roll{w}"] = temp[:, c - w + 1:c + 1].mean(axis=1)
+
+        X = np.column_stack([cols[f] for f in features])
+        # o valoare lipsă (consum observat sau prognoză) -> fără predicție, iar golul se propagă mai departe
+        ok = ~np.isnan(X).any(axis=1)
+        pred = np.full(n, np.nan)
+        p10 = np.full(n, np.nan)
+        p90 = np.full(n, np.nan)
+        if ok.any():
+            bands = forest_quantiles(model, X[ok], (0.1, 0.9))
+            if bands is None:
+                pred[ok] = predictor.predict(X[ok])
+            else:
+                pred[ok], q = bands
+                p10[ok], p90[ok] = q[:, 0], q[:, 1]
+        load[:, c] = pred
+
+        parts.append(pd.DataFrame({"issue_date": issues, "target_date": target, "lead": h,
+                                   "pred": pred, "p10": p10, "p90": p90}))
+
+    out = pd.concat(parts, ignore_index=True).sort_values(["issue_date", "lead"], ignore_index=True)
+    if out["p10"].isna().all():
+        out = out.drop(columns=["p10", "p90"])
+    return out
+
+def lead_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    # df: predicțiile backfill-ului + coloana actual -> erori pe fiecare zi de orizont
+    df = df.dropna(subset=["pred", "actual"])
+    err = df["pred"] - df["actual"]
+    g = df.assign(abs_err=err.abs(), sq_err=err ** 2, err=err).groupby("lead")
+    out = pd.DataFrame({
+        "n": g.size(),
+        "MAE": g["abs_err"].mean(),
+        "RMSE": np.sqrt(g["sq_err"].mean()),
+        "bias": g["err"].mean(),
+    })
+    if "p10" in df.columns:
+        inside = (df["actual"] >= df["p10"]) & (df["actual"] <= df["p90"])
+        out["coverage_p10_p90"] = inside.groupby(df["lead"]).mean()
+    return out.reset_index()
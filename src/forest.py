@@ -0,0 +1,179 @@
+﻿import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# un RandomForestRegressor aplatizat în array-uri contigue (toți arborii concatenați),
+# salvate ca .npy separate ca să poată fi memory-mapped la încărcare.
+# Nodurile sunt renumerotate pe niveluri astfel încât copiii fiecărui nod să fie adiacenți:
+# copilul stâng e child[i], cel drept child[i] + 1; frunzele au feature = -2 (ca în sklearn).
+ARRAYS = ["feature", "threshold", "child", "missing_left", "value", "roots"]
+ROW_CHUNK = 1024
+SKLEARN_ROW_CHUNK = 8 * ROW_CHUNK
+# benzile de predicție: cuantilele predicțiilor arborilor (P10/P50/P90)
+QUANTILES = (0.1, 0.5, 0.9)
+
+def tree_mean(per_tree: np.ndarray) -> np.ndarray:
+    # sumă secvențială pe arbori, în aceeași ordine ca sklearn -> aceleași valori bit cu bit
+    acc = np.zeros(len(per_tree))
+    for j in range(per_tree.shape[1]):
+        acc += per_tree[:, j]
+    return acc / per_tree.shape[1]
+
+def _level_order(tree) -> np.ndarray:
+    # ordinea nouă a nodurilor (BFS), cu frații consecutivi
+    left, right = tree.children_left, tree.children_right
+    order, level = [np.array([0])], np.array([0])
+    while True:
+        internal = level[left[level] != -1]
+        if not len(internal):
+            break
+        level = np.column_stack([left[internal], right[internal]]).ravel()
+        order.append(level)
+    return np.concatenate(order)
+
+def flatten_forest(model) -> dict:
+    trees = [est.tree_ for est in model.estimators_]
+    sizes = np.array([t.node_count for t in trees], dtype=np.int64)
+    roots = np.r_[0, np.cumsum(sizes)[:-1]].astype(np.int64)
+    n = int(sizes.sum())
+
+    feature = np.empty(n, dtype=np.int32)
+    threshold = np.empty(n, dtype=np.float64)
+    child = np.empty(n, dtype=np.int32)
+    missing_left = np.zeros(n, dtype=np.bool_)
+    value = np.empty(n, dtype=np.float64)
+
+    for t, off in zip(trees, roots):
+        old = _level_order(t)
+        new_id = np.empty_like(old)
+        new_id[old] = np.arange(len(old))
+
+        sl = slice(off, off + t.node_count)
+        leaf = t.children_left[old] == -1
+        feature[sl] = np.where(leaf, -2, t.feature[old])
+        threshold[sl] = t.threshold[old]
+        child[sl] = np.where(leaf, -1, new_id[t.children_left[old]] + off)
+        if hasattr(t, "missing_go_to_left"):
+            missing_left[sl] = t.missing_go_to_left[old].astype(bool)
+        value[sl] = t.value[old, 0, 0]
+
+    return {
+        "feature": feature,
+        "threshold": threshold,
+        "child": child,
+        "missing_left": missing_left,
+        "value": value,
+        "roots": roots,
+        "max_depth": int(max(est.tree_.max_depth for est in model.estimators_)),
+    }
+
+def export_forest(model, out_dir: str, meta: dict = None):
+    # meta: restul payload-ului din 07 (features, target, ani), fără modelul în sine
+    flat = flatten_forest(model)
+    os.makedirs(out_dir, exist_ok=True)
+    # array-uri rămase de la un format mai vechi (ex. left/right înainte de child) -> șterse
+    for stale in set(os.listdir(out_dir)) - {f"{name}.npy" for name in ARRAYS}:
+        if stale.endswith(".npy"):
+            os.remove(os.path.join(out_dir, stale))
+    for name in ARRAYS:
+        np.save(os.path.join(out_dir, f"{name}.npy"), flat[name])
+    meta = dict(meta or {})
+    meta["max_depth"] = flat["max_depth"]
+    meta["n_trees"] = len(flat["roots"])
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+
+class FlatForest:
+    # predictor vectorizat: toate rândurile x toți arborii avansează simultan, câte un nivel pe pas
+
+    def __init__(self, arrays: dict, meta: dict):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.features = meta.get("features")
+        self.n_estimators = len(self.roots)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in ARRAYS}
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        return cls(arrays, meta)
+
+    def _as_array(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            X = X[self.features] if self.features else X
+            X = X.to_numpy()
+        # sklearn compară în float32 (X) vs float64 (prag) -> aceeași conversie pentru rezultate identice
+        return np.asarray(X, dtype=np.float32).astype(np.float64)
+
+    def leaf_chunks(self, X):
+        # (m, n_trees) indicii globali ai frunzelor, pe bucăți de ROW_CHUNK rânduri;
+        # la fiecare pas avansează doar perechile (rând, arbore) care nu au ajuns încă într-o frunză
+        X = self._as_array(X)
+        n_feat = X.shape[1]
+        has_nan = bool(np.isnan(X).any())
+        if not len(X):
+            yield np.empty((0, self.n_estimators), dtype=np.int64)
+
+        for a in range(0, len(X), ROW_CHUNK):
+            flat_x = X[a:a + ROW_CHUNK].ravel()
+            m = len(flat_x) // n_feat
+            node = np.tile(self.roots, m)
+            base = np.repeat(np.arange(m, dtype=np.int64) * n_feat, self.n_estimators)
+
+            active = np.flatnonzero(self.feature[node] >= 0)
+            while active.size:
+                nd = node[active]
+                x = flat_x[base[active] + self.feature[nd]]
+                go_right = ~(x <= self.threshold[nd])
+                if has_nan:
+                    go_right &= ~(np.isnan(x) & self.missing_left[nd])
+                nd = self.child[nd] + go_right
+                node[active] = nd
+                active = active[self.feature[nd] >= 0]
+
+            yield node.reshape(m, self.n_estimators)
+
+    def leaves(self, X) -> np.ndarray:
+        # (n, n_trees) indicii globali ai frunzelor
+        return np.concatenate(list(self.leaf_chunks(X)))
+
+    def predict_trees(self, X) -> np.ndarray:
+        # (n, n_trees) predicția fiecărui arbore
+        return self.value[self.leaves(X)]
+
+    def predict(self, X) -> np.ndarray:
+        # memoria pe bucăți (ROW_CHUNK x n_trees), nu pe toată matricea rânduri x arbori
+        return np.concatenate([tree_mean(self.value[nodes]) for nodes in self.leaf_chunks(X)])
+
+    def predict_quantiles(self, X, quantiles=QUANTILES) -> tuple:
+        # (predicția medie, (n, len(quantiles)) cuantilele pe arbori) din aceeași trecere prin arbori
+        means, qs = [], []
+        for nodes in self.leaf_chunks(X):
+            per_tree = self.value[nodes]
+            means.append(tree_mean(per_tree))
+            qs.append(np.quantile(per_tree, quantiles, axis=1).T)
+        return np.concatenate(means), np.concatenate(qs)
+
+def forest_quantiles(model, X, quantiles=QUANTILES):
+    # FlatForest sau pădurea sklearn -> (medie, cuantile); None pentru modele fără arbori independenți (ex. HGB)
+    if isinstance(model, FlatForest):
+        return model.predict_quantiles(X, quantiles)
+    if not isinstance(getattr(model, "estimators_", None), list):
+        return None
+    # validarea o singură dată, apoi direct tree_.predict (fără verificările per arbore din est.predict)
+    X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    # bucăți mai mari decât ROW_CHUNK: costul e dominat de apelurile per arbore, nu de rânduri
+    means, qs = [], []
+    for a in range(0, len(X), SKLEARN_ROW_CHUNK):
+        xc = X[a:a + SKLEARN_ROW_CHUNK]
+        per_tree = np.empty((len(xc), len(model.estimators_)))
+        for j, est in enumerate(model.estimators_):
+            per_tree[:, j] = est.tree_.predict(xc)[:, 0]
+        means.append(tree_mean(per_tree))
+        qs.append(np.quantile(per_tree, quantiles, axis=1).T)
+    return np.concatenate(means), np.concatenate(qs)
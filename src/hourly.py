@@ -0,0 +1,72 @@
+﻿import os
+
+import numpy as np
+import pandas as pd
+
+from quality import load_config, validate_and_repair
+from weather import WEATHER_VARS, weighted_hourly
+from zones import DEFAULT_ZONE, STATIONS_DIR, load_path, stations_list
+
+# o singură stație (București), folosită pentru zona implicită când nu există stațiile
+METEO_IN  = "data/raw/openmeteo/openmeteo_bucharest_hourly.parquet"
+
+# aceleași convenții ca FEATURES/TARGET din 07, la rezoluție orară
+HOURLY_FEATURES = WEATHER_VARS + ["hour", "weekday", "month", "is_weekend"]
+HOURLY_TARGET = "load_mw"
+
+# tipuri compacte: meteo float32, calendar int8
+FEATURE_DTYPES = {
+    "temp_c": np.float32,
+    "precip_mm": np.float32,
+    "wind_ms": np.float32,
+    "rh_pct": np.float32,
+    "hour": np.int8,
+    "weekday": np.int8,
+    "month": np.int8,
+    "is_weekend": np.int8,
+    "year": np.int16,
+}
+
+def read_hourly_load(repair: bool = True, zone: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # partiția zonei din store-ul scris de 01 (zone=/year=/month=); pentru RO, store-ul vechi ca fallback
+    path = load_path(zone)
+    if os.path.isdir(path):
+        load = pd.read_parquet(path, columns=["time", "load_mw"])
+    else:
+        load = pd.read_parquet(path)
+    load["time"] = pd.to_datetime(load["time"])
+    if repair:
+        # grilă orară completă: dubluri comasate, goluri scurte interpolate, outlieri scoși doar cu
+        # 05 --drop-outliers (setările din ultima rulare a lui 05, altfel quality.LIMITS)
+        return validate_and_repair(load[["time", "load_mw"]], **load_config())[0]
+    return load.drop_duplicates().sort_values("time")
+
+def read_hourly_meteo(repair: bool = True, zone: str = DEFAULT_ZONE) -> pd.DataFrame:
+    # medie ponderată cu populația peste stațiile zonei; fallback RO: o singură stație (București)
+    weights = stations_list(zone)
+    if os.path.isdir(STATIONS_DIR) and os.path.exists(weights):
+        meteo = weighted_hourly(STATIONS_DIR, pd.read_csv(weights))
+    elif zone == DEFAULT_ZONE:
+        meteo = pd.read_parquet(METEO_IN)
+    else:
+        raise FileNotFoundError(f"Nu găsesc stațiile zonei {zone}: {weights}")
+    meteo["time"] = pd.to_datetime(meteo["time"])
+    if repair:
+        return validate_and_repair(meteo[["time"] + WEATHER_VARS], **load_config())[0]
+    return meteo.sort_values("time")
+
+def add_calendar(df: pd.DataFrame) -> pd.DataFrame:
+    t = df["time"].dt
+    df["hour"] = t.hour
+    df["weekday"] = t.weekday
+    df["month"] = t.month
+    df["year"] = t.year
+    df["is_weekend"] = (df["weekday"] >= 5)
+    return df
+
+def build_hourly_dataset(load: pd.DataFrame, meteo: pd.DataFrame) -> pd.DataFrame:
+    df = load.merge(meteo[["time"] + WEATHER_VARS], on="time", how="inner")
+    df = add_calendar(df)
+    df = df.astype(FEATURE_DTYPES)
+    df[HOURLY_TARGET] = df[HOURLY_TARGET].astype(np.float32)
+    return df[["time", HOURLY_TARGET, "year"] + HOURLY_FEATURES].reset_index(drop=True)
@@ -0,0 +1,194 @@
+﻿import argparse
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+OUT_PATH = "results/stage_timings.jsonl"
+PROFILE_DIR = "results/profiles"
+
+# EWC_RUN_ID: o rulare = mai multe procese (pipeline.py îl setează pentru toate etapele);
+# EWC_PROFILE=1 -> cProfile per etapă, EWC_TRACEMALLOC=1 -> top alocări per etapă
+RUN_ID = os.environ.get("EWC_RUN_ID") or datetime.now().strftime("%Y%m%dT%H%M%S") + f"-{os.getpid()}"
+PROFILE = os.environ.get("EWC_PROFILE") == "1"
+TRACEMALLOC = os.environ.get("EWC_TRACEMALLOC") == "1"
+
+_STACK = []
+_STAGE = {"name": None}
+
+def _status_kb(field: str):
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+def rss_mb() -> float:
+    kb = _status_kb("VmRSS:")
+    if kb is not None:
+        return kb / 1024
+    import psutil
+    return psutil.Process().memory_info().rss / 1024**2
+
+def peak_rss_mb() -> float:
+    # vârful RSS de la ultima resetare (Linux: VmHWM); pe alte sisteme, vârful procesului
+    kb = _status_kb("VmHWM:")
+    if kb is not None:
+        return kb / 1024
+    import psutil
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss) / 1024**2
+
+def _reset_peak():
+    # Linux >= 4.0: "5" în clear_refs resetează VmHWM, deci fiecare pas își vede propriul vârf
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+def emit(record: dict, path: str = OUT_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record, default=str) + "\n")
+
+@contextmanager
+def step(name: str, rows: int = None, stage: str = None):
+    # with step("read load") as rec: ...; rec["rows"] = len(df)
+    if _STACK:
+        _STACK[-1]["peak"] = max(_STACK[-1]["peak"], peak_rss_mb())
+    _reset_peak()
+    rec = {"rows": rows}
+    frame = {"peak": 0.0}
+    _STACK.append(frame)
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    finally:
+        seconds = time.perf_counter() - t0
+        _STACK.pop()
+        peak = max(frame["peak"], peak_rss_mb())
+        if _STACK:
+            _STACK[-1]["peak"] = max(_STACK[-1]["peak"], peak)
+        emit({
+            "run_id": RUN_ID,
+            "stage": stage or _STAGE["name"] or os.path.basename(sys.argv[0]),
+            "step": name,
+            "rows": rec.get("rows"),
+            "seconds": round(seconds, 6),
+            "rss_mb": round(rss_mb(), 1),
+            "peak_rss_mb": round(peak, 1),
+            # 0 = pas fără părinte (ex. "total" al unei etape); pașii imbricați sunt deja incluși în părinte
+            "depth": len(_STACK),
+            **{k: v for k, v in rec.items() if k != "rows"},
+            "ts": datetime.now().isoformat(timespec="seconds"),
+        })
+
+def timed(name: str = None):
+    # decorator: fiecare apel devine un pas
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with step(name or fn.__name__):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+def stage(name: str):
+    # decorator pentru main() al unei etape: pasul "total" + profilare opțională
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            _STAGE["name"] = name
+            prof = cProfile.Profile() if PROFILE else None
+            if TRACEMALLOC:
+                tracemalloc.start(25)
+            try:
+                with step("total") as rec:
+                    if prof:
+                        prof.enable()
+                    try:
+                        return fn(*args, **kwargs)
+                    finally:
+                        if prof:
+                            prof.disable()
+                        if TRACEMALLOC:
+                            rec["tracemalloc_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024**2, 1)
+            finally:
+                _dump_profiles(name, prof)
+        return inner
+    return wrap
+
+def _dump_profiles(name: str, prof):
+    if not (prof or TRACEMALLOC):
+        return
+    out_dir = os.path.join(PROFILE_DIR, RUN_ID)
+    os.makedirs(out_dir, exist_ok=True)
+    if prof:
+        prof.dump_stats(os.path.join(out_dir, f"{name}.prof"))
+    if TRACEMALLOC:
+        top = tracemalloc.take_snapshot().statistics("lineno")[:30]
+        tracemalloc.stop()
+        with open(os.path.join(out_dir, f"{name}_tracemalloc.txt"), "w", encoding="utf-8") as fh:
+            fh.write("\n".join(str(s) for s in top) + "\n")
+    print("Profiles ->", out_dir)
+
+# --- raport ---
+
+def load_records(path: str = OUT_PATH) -> pd.DataFrame:
+    return pd.read_json(path, lines=True, dtype={"run_id": str})
+
+def top_level(df: pd.DataFrame) -> pd.DataFrame:
+    # doar pașii fără părinte, ca timpul unei rulări să nu fie numărat de mai multe ori;
+    # înregistrările mai vechi, fără "depth": pasul "total" al fiecărei etape
+    depth = df["depth"] if "depth" in df.columns else pd.Series(float("nan"), index=df.index)
+    return df[depth.eq(0) | (depth.isna() & df["step"].eq("total"))]
+
+def diff_runs(df: pd.DataFrame, run_a: str, run_b: str) -> pd.DataFrame:
+    # pe (etapă, pas): sumă de secunde (pașii repetați se adună), vârful maxim de memorie
+    agg = {"seconds": "sum", "peak_rss_mb": "max", "rows": "max"}
+    a = df[df["run_id"] == run_a].groupby(["stage", "step"]).agg(agg)
+    b = df[df["run_id"] == run_b].groupby(["stage", "step"]).agg(agg)
+    out = a.join(b, how="outer", lsuffix="_a", rsuffix="_b")
+    out["delta_s"] = out["seconds_b"] - out["seconds_a"]
+    out["delta_pct"] = 100 * out["delta_s"] / out["seconds_a"]
+    out["delta_peak_mb"] = out["peak_rss_mb_b"] - out["peak_rss_mb_a"]
+    cols = ["seconds_a", "seconds_b", "delta_s", "delta_pct", "peak_rss_mb_a", "peak_rss_mb_b", "delta_peak_mb", "rows_b"]
+    return out[cols].sort_values("delta_s", ascending=False, key=lambda s: s.abs())
+
+def main():
+    ap = argparse.ArgumentParser(description="rapoarte din results/stage_timings.jsonl")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("runs", help="rulările înregistrate")
+    rep = sub.add_parser("report", help="diferențele dintre două rulări (implicit ultimele două)")
+    rep.add_argument("run_a", nargs="?")
+    rep.add_argument("run_b", nargs="?")
+    ap.add_argument("--path", default=OUT_PATH)
+    args = ap.parse_args()
+
+    df = load_records(args.path)
+    runs = df.groupby("run_id", sort=False).agg(start=("ts", "min"), stages=("stage", "nunique"))
+    runs["seconds"] = top_level(df).groupby("run_id")["seconds"].sum()
+    runs = runs.sort_values("start")
+    if args.cmd == "runs":
+        print(runs.to_string())
+        return
+
+    run_a = args.run_a or runs.index[-2]
+    run_b = args.run_b or runs.index[-1]
+    print(f"A = {run_a}\nB = {run_b}\n")
+    pd.set_option("display.width", 200)
+    print(diff_runs(df, run_a, run_b).round(2).to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+﻿import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+CACHE_DIR = "data/raw/openmeteo/cache"
+TIMEZONE = "Europe/Bucharest"
+
+# variabilă Open-Meteo -> coloană în parquet-urile noastre
+HOURLY_VARS = {
+    "temperature_2m": "temp_c",
+    "precipitation": "precip_mm",
+    "windspeed_10m": "wind_ms",
+    "relative_humidity_2m": "rh_pct",
+}
+
+def year_ranges(start: str, end: str, years_per_chunk: int = 1) -> list:
+    # împarte [start, end] în bucăți de câte `years_per_chunk` ani calendaristici
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    out = []
+    cur = start
+    while cur <= end:
+        stop = min(pd.Timestamp(year=cur.year + years_per_chunk - 1, month=12, day=31), end)
+        out.append((cur.strftime("%Y-%m-%d"), stop.strftime("%Y-%m-%d")))
+        cur = stop + pd.Timedelta(days=1)
+    return out
+
+def cache_key(lat: float, lon: float, start: str, end: str, variables, timezone: str = TIMEZONE,
+              base_url: str = ARCHIVE_URL) -> str:
+    # alt server (ex. un stand-in local) -> alte chei, ca răspunsurile lui să nu fie servite drept arhiva reală;
+    # arhiva implicită păstrează cheile de până acum, deci cache-urile existente rămân valide
+    parts = [round(lat, 4), round(lon, 4), start, end, sorted(variables), timezone]
+    if base_url.rstrip("/") != ARCHIVE_URL:
+        parts.append(base_url.rstrip("/"))
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()[:32]
+
+def hourly_frame(data: dict) -> pd.DataFrame:
+    # răspuns JSON Open-Meteo (archive sau forecast) -> DataFrame orar cu coloanele noastre
+    hourly = data["hourly"]
+    df = pd.DataFrame({"time": pd.to_datetime(hourly["time"])})
+    for var, col in HOURLY_VARS.items():
+        if var in hourly:
+            df[col] = hourly[var]
+    return df
+
+class OpenMeteoFetcher:
+    # cereri concurente (thread pool + pool de conexiuni limitat), retry cu backoff exponențial
+    # și cache pe disc: un fișier JSON per (lat, lon, interval, variabile, server)
+
+    def __init__(self, base_url: str = ARCHIVE_URL, cache_dir: str = CACHE_DIR, max_workers: int = 4,
+                 retries: int = 5, backoff: float = 1.0, timeout: float = 120, offline: bool = False):
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.offline = offline
+        os.makedirs(cache_dir, exist_ok=True)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # contoarele sunt actualizate din firele pool-ului
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def fetch_range(self, lat: float, lon: float, start: str, end: str, variables=HOURLY_VARS) -> dict:
+        key = cache_key(lat, lon, start, end, variables, base_url=self.base_url)
+        path = self._cache_path(key)
+        if os.path.exists(path):
+            self._count(hit=True)
+            with open(path, encoding="utf-8") as fh:
+                return json.load(fh)
+
+        if self.offline:
+            raise FileNotFoundError(f"Lipsește din cache (mod offline): {lat},{lon} {start}..{end}")
+
+        params = {
+            "latitude": lat,
+            "longitude": lon,
+            "start_date": start,
+            "end_date": end,
+            "hourly": ",".join(variables),
+            "timezone": TIMEZONE,
+        }
+        r = self.session.get(self.base_url, params=params, timeout=self.timeout)
+        r.raise_for_status()
+        data = r.json()
+        self._count(hit=False)
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh)
+        os.replace(tmp, path)
+        return data
+
+    def fetch_many(self, stations: pd.DataFrame, start: str, end: str, years_per_chunk: int = 1) -> dict:
+        # stations: coloane station, lat, lon -> {station: DataFrame orar}
+        ranges = year_ranges(start, end, years_per_chunk)
+        tasks = [(row.station, row.lat, row.lon, s, e) for row in stations.itertuples() for s, e in ranges]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self.fetch_range, lat, lon, s, e) for _, lat, lon, s, e in tasks]
+            results = [f.result() for f in futures]
+
+        parts = {}
+        for (station, *_), data in zip(tasks, results):
+            parts.setdefault(station, []).append(hourly_frame(data))
+
+        return {
+            station: pd.concat(dfs, ignore_index=True).drop_duplicates("time").sort_values("time").reset_index(drop=True)
+            for station, dfs in parts.items()
+        }
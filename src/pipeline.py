@@ -0,0 +1,274 @@
+﻿import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from instrument import RUN_ID
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_PATH = "cache/pipeline_state.json"
+LOG_DIR = "cache/pipeline_logs"
+
+# sursele de date: store-urile noi și fișierele vechi (fallback); cele care lipsesc sunt ignorate
+LOAD_IN = ["data/processed/entsoe_hourly", "data/processed/entsoe_ro_hourly", "data/processed/entsoe_ro_hourly.parquet"]
+# listele de stații pe zone (stations_<zonă>.csv)
+STATION_LISTS = sorted(os.path.relpath(p, ROOT).replace(os.sep, "/")
+                       for p in glob.glob(os.path.join(ROOT, "data/raw/openmeteo/stations_*.csv")))
+METEO_IN = ["data/raw/openmeteo/stations", "data/raw/openmeteo/openmeteo_bucharest_hourly.parquet"] + STATION_LISTS
+DAILY_IN = ["data/final/daily", "data/final/zones", "data/final/dataset_daily.parquet"]
+HOURLY_IN = ["data/final/hourly", "data/final/dataset_hourly.parquet"]
+BEST_IN = ["results/best_config.json"]
+# modelul din 07: 08 rulează după el și citește din ArtifactCache același estimator antrenat pe același
+# split, în loc să-l antreneze în paralel a doua oară
+MODEL_IN = ["models/rf_model.joblib"]
+# limitele de reparare alese în 05, citite de 03/09
+QUALITY_IN = ["results/quality_config.json"]
+
+def _src(*names) -> list:
+    return [f"src/{n}" for n in names]
+
+# fiecare etapă: scriptul, intrările (date + codul de care depinde) și ieșirile.
+# Dependențele dintre etape rezultă din căi: B depinde de A dacă o intrare a lui B e o ieșire a lui A.
+# default=False -> etapa rulează doar dacă e cerută explicit (sau cu --all)
+STAGES = {
+    "01_ingest": {
+        "script": "01_ingest_entsoe_powerstats.py",
+        "inputs": ["data/raw/entsoe"] + _src("01_ingest_entsoe_powerstats.py", "timeparse.py", "zones.py"),
+        "outputs": ["data/processed/entsoe_hourly", "data/processed/entsoe_manifest.json"],
+    },
+    "02_fetch": {
+        "script": "02_fetch_openmeteo.py",
+        "inputs": STATION_LISTS + _src("02_fetch_openmeteo.py", "openmeteo.py", "zones.py"),
+        "outputs": ["data/raw/openmeteo/stations", "data/raw/openmeteo/openmeteo_bucharest_hourly.parquet"],
+        # descărcare din rețea: datele noi nu se văd în fișierele locale, deci se cere explicit
+        "default": False,
+    },
+    "05_quality": {
+        "script": "05_data_quality.py",
+        "inputs": LOAD_IN + METEO_IN + _src("05_data_quality.py", "quality.py", "hourly.py", "weather.py", "zones.py"),
+        "outputs": ["results/quality_coverage.csv", "results/quality_issues.csv", "results/quality_summary.json",
+                    "results/quality_config.json"],
+    },
+    "03_daily": {
+        "script": "03_build_daily_dataset.py",
+        "inputs": LOAD_IN + METEO_IN + QUALITY_IN + _src("03_build_daily_dataset.py", "daily.py", "hourly.py",
+                                                         "quality.py", "weather.py", "storage.py", "zones.py"),
+        "outputs": ["data/final/daily"],
+    },
+    "09_hourly": {
+        "script": "09_build_hourly_dataset.py",
+        "inputs": LOAD_IN + METEO_IN + QUALITY_IN + _src("09_build_hourly_dataset.py", "hourly.py", "quality.py",
+                                                         "weather.py", "storage.py", "zones.py"),
+        "outputs": ["data/final/hourly"],
+    },
+    "04_model": {
+        "script": "04_model.py",
+        "inputs": DAILY_IN + _src("04_model.py", "cache.py", "features.py", "calendar_table.py", "storage.py",
+                                  "zones.py"),
+        "outputs": [],
+    },
+    "06_baseline": {
+        "script": "06_baseline.py",
+        "inputs": DAILY_IN + _src("06_baseline.py", "cache.py", "features.py", "calendar_table.py", "storage.py",
+                                  "zones.py"),
+        "outputs": [],
+    },
+    "07_train": {
+        "script": "07_train_and_save.py",
+        "inputs": DAILY_IN + BEST_IN + _src("07_train_and_save.py", "cache.py", "features.py", "calendar_table.py",
+                                            "forest.py", "tuning.py", "storage.py", "zones.py"),
+        "outputs": ["models/rf_model.joblib", "models/rf_model_flat"],
+    },
+    "08_compare": {
+        "script": "08_model_comparison.py",
+        "inputs": DAILY_IN + BEST_IN + MODEL_IN + _src("08_model_comparison.py", "cache.py", "features.py",
+                                                       "calendar_table.py", "forest.py", "tuning.py", "storage.py",
+                                                       "zones.py"),
+        "outputs": ["results/model_metrics.csv"],
+    },
+    "10_train_hourly": {
+        "script": "10_train_hourly.py",
+        "inputs": HOURLY_IN + _src("10_train_hourly.py", "hourly.py", "storage.py", "zones.py"),
+        "outputs": ["models/rf_hourly_model.joblib"],
+    },
+    "11_backtest": {
+        "script": "11_backtest.py",
+        "inputs": DAILY_IN + _src("11_backtest.py", "backtest.py", "features.py", "calendar_table.py", "storage.py",
+                                  "zones.py"),
+        "outputs": ["results/backtest_folds.csv", "results/backtest_summary.csv"],
+        "default": False,
+    },
+    "13_tune": {
+        "script": "13_tune.py",
+        "inputs": DAILY_IN + _src("13_tune.py", "tuning.py", "backtest.py", "cache.py", "features.py",
+                                  "calendar_table.py", "storage.py", "zones.py"),
+        "outputs": ["results/tuning_results.csv", "results/best_config.json"],
+        "default": False,
+    },
+}
+
+def _abs(path: str) -> str:
+    return os.path.join(ROOT, path)
+
+def list_files(paths: list) -> list:
+    # fișierele concrete din spatele căilor (directoarele se parcurg recursiv), sortate
+    out = []
+    for p in paths:
+        full = _abs(p)
+        if os.path.isfile(full):
+            out.append(full)
+        elif os.path.isdir(full):
+            for dirpath, _, names in os.walk(full):
+                out.extend(os.path.join(dirpath, n) for n in names if not n.endswith(".tmp"))
+    return sorted(out)
+
+def content_hash(files: list) -> str:
+    h = hashlib.sha256()
+    for f in files:
+        h.update(os.path.relpath(f, ROOT).encode("utf-8"))
+        with open(f, "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b""):
+                h.update(block)
+    return h.hexdigest()
+
+def data_inputs(stage: dict) -> list:
+    return [p for p in stage["inputs"] if not p.startswith("src/")]
+
+def depends_on(b: dict, a: dict) -> bool:
+    return any(i == o or i.startswith(o.rstrip("/") + "/") for i in b["inputs"] for o in a["outputs"])
+
+def select(names: list, include_all: bool) -> list:
+    # etapele cerute + tot ce e în amonte de ele, în ordinea din STAGES
+    if not names:
+        names = [n for n, s in STAGES.items() if include_all or s.get("default", True)]
+    chosen = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for n in list(chosen):
+            for m, s in STAGES.items():
+                if m not in chosen and s.get("default", True) and depends_on(STAGES[n], s):
+                    chosen.add(m)
+                    changed = True
+    return [n for n in STAGES if n in chosen]
+
+def freshness(name: str, state: dict, force: bool) -> tuple:
+    # -> (motiv de skip sau None, hash-ul intrărilor)
+    stage = STAGES[name]
+    if not list_files(data_inputs(stage)):
+        return "no inputs", None
+    if force:
+        return None, None
+    inputs = list_files(stage["inputs"])
+    outputs = list_files(stage["outputs"])
+    outputs_ok = all(os.path.exists(_abs(o)) for o in stage["outputs"])
+
+    if stage["outputs"] and outputs_ok and outputs:
+        newest_in = max(os.path.getmtime(f) for f in inputs)
+        oldest_out = min(os.path.getmtime(f) for f in outputs)
+        if newest_in <= oldest_out:
+            return "fresh (mtime)", None
+
+    digest = content_hash(inputs)
+    if outputs_ok and state.get(name) == digest:
+        return "fresh (hash)", digest
+    return None, digest
+
+def run_stage(name: str, state: dict, force: bool, dry_run: bool) -> dict:
+    t0 = time.perf_counter()
+    reason, digest = freshness(name, state, force)
+    if reason:
+        return {"stage": name, "status": f"skipped: {reason}", "seconds": time.perf_counter() - t0}
+    if dry_run:
+        return {"stage": name, "status": "would run", "seconds": time.perf_counter() - t0}
+
+    os.makedirs(_abs(LOG_DIR), exist_ok=True)
+    # același run id pentru toate etapele -> `instrument.py report` compară două rulări ale pipeline-ului
+    env = dict(os.environ, EWC_RUN_ID=RUN_ID)
+    log_path = _abs(os.path.join(LOG_DIR, f"{name}.log"))
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run([sys.executable, os.path.join("src", STAGES[name]["script"])],
+                              cwd=ROOT, stdout=log, stderr=subprocess.STDOUT, env=env)
+    status = "ran" if proc.returncode == 0 else f"FAILED ({proc.returncode})"
+    if proc.returncode == 0:
+        state[name] = digest or content_hash(list_files(STAGES[name]["inputs"]))
+    return {"stage": name, "status": status, "seconds": time.perf_counter() - t0, "log": os.path.relpath(log_path, ROOT)}
+
+def load_state() -> dict:
+    path = _abs(STATE_PATH)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+def save_state(state: dict):
+    path = _abs(STATE_PATH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=2, sort_keys=True)
+
+def run(names: list, jobs: int, force, dry_run: bool) -> pd.DataFrame:
+    # etapele pornesc când toate dependențele lor (dintre cele selectate) s-au terminat;
+    # cele independente rulează în paralel, fiecare în propriul proces Python
+    deps = {n: [m for m in names if m != n and depends_on(STAGES[n], STAGES[m])] for n in names}
+    state = load_state()
+    results, pending, running = {}, list(names), {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for n in list(pending):
+                if any(d not in results for d in deps[n]):
+                    continue
+                pending.remove(n)
+                failed = [d for d in deps[n] if results[d]["status"].startswith(("FAILED", "blocked"))]
+                if failed:
+                    results[n] = {"stage": n, "status": f"blocked by {failed[0]}", "seconds": 0.0}
+                    continue
+                running[pool.submit(run_stage, n, state, force is True or n in force, dry_run)] = n
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                n = running.pop(fut)
+                results[n] = fut.result()
+                print(f"[{results[n]['status']:>22}] {n} ({results[n]['seconds']:.1f}s)", flush=True)
+
+    if not dry_run:
+        save_state(state)
+    return pd.DataFrame([results[n] for n in names])
+
+def main():
+    ap = argparse.ArgumentParser(description="rulează etapele 01..13 în ordinea dependențelor, doar pe cele neactualizate")
+    ap.add_argument("stages", nargs="*", help=f"implicit: toate etapele default ({', '.join(STAGES)})")
+    ap.add_argument("--all", action="store_true", help="include și etapele opționale (02_fetch, 11_backtest, 13_tune)")
+    ap.add_argument("--force", nargs="*", default=None, help="etape rulate oricum; fără nume = toate")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count())
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+
+    unknown = [s for s in args.stages + (args.force or []) if s not in STAGES]
+    if unknown:
+        ap.error(f"etape necunoscute: {unknown}")
+    # --force fără nume -> toate etapele selectate
+    force = set(args.force or []) if args.force != [] else True
+
+    names = select(args.stages, args.all)
+    print(f"Stages: {', '.join(names)} | jobs: {args.jobs}")
+    t0 = time.perf_counter()
+    summary = run(names, args.jobs, force, args.dry_run)
+    print()
+    print(summary.drop(columns=["log"], errors="ignore").round(2).to_string(index=False))
+    print(f"Total: {time.perf_counter() - t0:.1f}s")
+    if summary["status"].str.startswith("FAILED").any():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+﻿import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# câte ore consecutive lipsă se completează prin interpolare liniară, per coloană;
+# golurile mai lungi rămân NaN (și apar ca atare în raport)
+LIMITS = {
+    "load_mw": 3,
+    "temp_c": 6,
+    "precip_mm": 0,
+    "wind_ms": 6,
+    "rh_pct": 6,
+}
+# valori imposibile fizic -> tratate ca lipsă
+BOUNDS = {
+    "load_mw": (0.0, None),
+    "precip_mm": (0.0, None),
+    "wind_ms": (0.0, None),
+    "rh_pct": (0.0, 100.0),
+}
+# abatere robustă față de mediana pe (lună, oră) peste care o valoare e outlier; doar pentru consum
+# (la meteo valorile extreme, ex. furtunile, sunt reale). Outlierii apar mereu în raport, dar sunt
+# scoși (și completați ca golurile) doar cu drop_outliers=True / `05 --drop-outliers`: altfel ținta rămâne neatinsă
+OUTLIER_Z = {"load_mw": 8.0}
+MAD_SCALE = 1.4826
+
+# ora locală a datelor; golurile/dublurile aflate la o schimbare de oră sunt marcate separat
+TZ = "Europe/Bucharest"
+DST_WINDOW_H = 2
+
+STEP = np.int64(3600 * 10**9)
+
+# setările reparării alese la ultima rulare a lui 05 (--limit, --drop-outliers); 03/09 le citesc prin
+# hourly.read_*, deci raportul și seturile de date folosesc aceleași setări. Fără fișier -> LIMITS, fără outlieri scoși.
+QUALITY_CONFIG = "results/quality_config.json"
+
+def save_config(limits: dict, drop_outliers: bool = False, path: str = QUALITY_CONFIG) -> dict:
+    config = {"limits": dict(limits), "drop_outliers": bool(drop_outliers)}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(config, fh, indent=2)
+    return config
+
+def load_config(path: str = QUALITY_CONFIG) -> dict:
+    # -> argumentele pentru validate_and_repair
+    config = {"limits": dict(LIMITS), "drop_outliers": False}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as fh:
+            saved = json.load(fh)
+        config["limits"].update(saved.get("limits", {}))
+        config["drop_outliers"] = bool(saved.get("drop_outliers", False))
+    return config
+
+def runs(mask: np.ndarray) -> tuple:
+    # run-length pe un vector boolean -> (început, lungime) pentru fiecare secvență de True
+    d = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    starts = np.flatnonzero(d == 1)
+    return starts, np.flatnonzero(d == -1) - starts
+
+def dedupe(df: pd.DataFrame, time_col: str) -> tuple:
+    # un rând per timestamp (media valorilor ne-NaN); întoarce și timestamp-urile duplicate
+    t = df[time_col].to_numpy().astype("datetime64[ns]").astype(np.int64)
+    keys, inv, counts = np.unique(t, return_inverse=True, return_counts=True)
+    out = {time_col: keys.astype("datetime64[ns]")}
+    for col in df.columns.drop(time_col):
+        v = df[col].to_numpy(dtype=float)
+        ok = ~np.isnan(v)
+        s = np.bincount(inv, weights=np.where(ok, v, 0.0), minlength=len(keys))
+        n = np.bincount(inv, weights=ok, minlength=len(keys))
+        with np.errstate(invalid="ignore"):
+            out[col] = np.where(n > 0, s / np.maximum(n, 1), np.nan)
+    return pd.DataFrame(out), keys[counts > 1]
+
+def dst_transitions(start, end, tz: str = TZ) -> np.ndarray:
+    # schimbările de oră din baza tz (fără reguli scrise de mână), în ora locală a datelor (ns):
+    # ora care lipsește primăvara / se repetă toamna (ex. 03:00 la București) = momentul UTC + offset-ul mai mic
+    hours = pd.date_range(pd.Timestamp(start).floor("D") - pd.Timedelta(days=1),
+                          pd.Timestamp(end).ceil("D") + pd.Timedelta(days=1), freq="h", tz="UTC")
+    utc = hours.tz_localize(None).to_numpy().astype(np.int64)
+    offset = hours.tz_convert(tz).tz_localize(None).to_numpy().astype(np.int64) - utc
+    change = np.flatnonzero(np.diff(offset) != 0) + 1
+    return utc[change] + np.minimum(offset[change - 1], offset[change])
+
+def near(points: np.ndarray, marks: np.ndarray, window: np.int64) -> np.ndarray:
+    # pentru fiecare punct: există o schimbare de oră la cel mult `window`? (căutare binară)
+    if not len(marks):
+        return np.zeros(len(points), dtype=bool)
+    i = np.searchsorted(marks, points)
+    right = np.abs(marks[np.minimum(i, len(marks) - 1)] - points)
+    left = np.abs(points - marks[np.maximum(i - 1, 0)])
+    return np.minimum(left, right) <= window
+
+def _issues(column: str, kind, starts: np.ndarray, hours) -> pd.DataFrame:
+    return pd.DataFrame({"column": column, "kind": kind, "start": starts.astype(np.int64), "hours": hours})
+
+def robust_outliers(values: np.ndarray, month: np.ndarray, hour: np.ndarray, z: float) -> np.ndarray:
+    key = pd.Series(month * 24 + hour)
+    s = pd.Series(values)
+    med = s.groupby(key).transform("median").to_numpy()
+    mad = (s - med).abs().groupby(key).transform("median").to_numpy()
+    with np.errstate(invalid="ignore"):
+        return np.abs(values - med) > z * MAD_SCALE * np.where(mad > 0, mad, np.nan)
+
+def fill_short(values: np.ndarray, limit: int) -> tuple:
+    # interpolare liniară doar în golurile interioare de cel mult `limit` ore
+    missing = np.isnan(values)
+    filled = np.zeros(len(values), dtype=bool)
+    if limit <= 0 or missing.all() or not missing.any():
+        return values, filled
+    starts, lengths = runs(missing)
+    ok = (lengths <= limit) & (starts > 0) & (starts + lengths < len(values))
+    filled[missing] = np.repeat(ok, lengths)
+
+    pos = np.arange(len(values))
+    out = values.copy()
+    out[filled] = np.interp(pos[filled], pos[~missing], values[~missing])
+    return out, filled
+
+def validate_and_repair(df: pd.DataFrame, time_col: str = "time", limits: dict = LIMITS,
+                        outlier_z: dict = OUTLIER_Z, drop_outliers: bool = False, tz: str = TZ) -> tuple:
+    # -> (serie orară pe grilă completă, reparată; tabel de probleme; acoperire pe an/lună)
+    cols = list(df.columns.drop(time_col))
+    dedup, dup_times = dedupe(df, time_col)
+
+    t = dedup[time_col].to_numpy().astype(np.int64)
+    off_grid = t % STEP != 0
+    t0, t1 = t[~off_grid].min(), t[~off_grid].max()
+    n = int((t1 - t0) // STEP) + 1
+    pos = (t[~off_grid] - t0) // STEP
+    grid = t0 + STEP * np.arange(n, dtype=np.int64)
+    stamps = pd.DatetimeIndex(grid.astype("datetime64[ns]"))
+    month, hour = stamps.month.to_numpy(), stamps.hour.to_numpy()
+
+    transitions = dst_transitions(stamps[0], stamps[-1], tz)
+    window = np.int64(DST_WINDOW_H) * STEP
+
+    issues = [
+        _issues("*", np.where(near(dup_times, transitions, window), "dst_duplicate", "duplicate"), dup_times, 1),
+        _issues("*", "off_grid", t[off_grid], 1),
+    ]
+
+    absent = np.ones(n, dtype=bool)
+    absent[pos] = False
+    g_starts, g_lengths = runs(absent)
+    dst_gap = near(grid[g_starts], transitions, window) & (g_lengths <= DST_WINDOW_H)
+    issues.append(_issues("*", np.where(dst_gap, "dst_gap", "gap"), grid[g_starts], g_lengths))
+
+    out = {time_col: stamps}
+    per_col = {}
+    for col in cols:
+        v = np.full(n, np.nan)
+        v[pos] = dedup[col].to_numpy(dtype=float)[~off_grid]
+        present = ~np.isnan(v)
+
+        # valorile imposibile fizic se scot mereu; outlierii statistici doar cu drop_outliers
+        bad = np.zeros(n, dtype=bool)
+        lo, hi = BOUNDS.get(col, (None, None))
+        if lo is not None:
+            bad |= v < lo
+        if hi is not None:
+            bad |= v > hi
+        flagged = bad.copy()
+        if outlier_z.get(col):
+            flagged |= robust_outliers(v, month, hour, outlier_z[col])
+        if drop_outliers:
+            bad = flagged
+        o_starts, o_lengths = runs(flagged)
+        issues.append(_issues(col, "outlier", grid[o_starts], o_lengths))
+        v[bad] = np.nan
+
+        # golurile din coloană (pe lângă orele absente) -> run-uri separate în raport
+        m_starts, m_lengths = runs(np.isnan(v) & ~absent & ~bad)
+        issues.append(_issues(col, "nan", grid[m_starts], m_lengths))
+
+        v, filled = fill_short(v, limits.get(col, 0))
+        out[col] = v
+        per_col[col] = (present, filled, flagged, np.isnan(v))
+
+    repaired = pd.DataFrame(out)
+
+    # un run e "filled" dacă toate orele lui au fost completate (în coloana lui; "*" = în toate coloanele)
+    issues = pd.concat(issues, ignore_index=True)
+    st = issues["start"].to_numpy(dtype=np.int64)
+    idx = ((st - t0) // STEP).clip(0, n - 1)
+    end_idx = np.minimum(idx + issues["hours"].to_numpy(dtype=np.int64), n)
+    on_grid = issues["kind"].isin(["gap", "dst_gap", "nan", "outlier"]).to_numpy()
+    masks = {c: f for c, (_, f, _, _) in per_col.items()}
+    masks["*"] = np.logical_and.reduce(list(masks.values())) if masks else np.zeros(n, dtype=bool)
+    filled = np.zeros(len(issues), dtype=bool)
+    column = issues["column"].to_numpy()
+    for c, f in masks.items():
+        sel = column == c
+        cum = np.r_[0, np.cumsum(f)]
+        filled[sel] = cum[end_idx[sel]] - cum[idx[sel]] == end_idx[sel] - idx[sel]
+    issues["filled"] = on_grid & filled
+    issues["start"] = pd.to_datetime(st)
+    issues["end"] = issues["start"] + pd.to_timedelta(issues["hours"], unit="h")
+    issues = issues.sort_values(["start", "column"], kind="stable").reset_index(drop=True)
+
+    coverage = coverage_report(stamps, per_col, dup_times)
+    return repaired, issues, coverage
+
+def coverage_report(stamps: pd.DatetimeIndex, per_col: dict, dup_times: np.ndarray) -> pd.DataFrame:
+    # per (an, lună, coloană): ore așteptate, prezente, outlieri, completate, rămase lipsă
+    ym = stamps.year.to_numpy() * 12 + stamps.month.to_numpy() - 1
+    base = ym.min()
+    key = ym - base
+    k = int(key.max()) + 1
+    expected = np.bincount(key, minlength=k)
+    dup_key = pd.DatetimeIndex(dup_times.astype("datetime64[ns]"))
+    dups = np.bincount(np.clip(dup_key.year * 12 + dup_key.month - 1 - base, 0, k - 1), minlength=k) \
+        if len(dup_times) else np.zeros(k, dtype=int)
+
+    frames = []
+    for col, (present, filled, bad, missing) in per_col.items():
+        frames.append(pd.DataFrame({
+            "year": (np.arange(k) + base) // 12,
+            "month": (np.arange(k) + base) % 12 + 1,
+            "column": col,
+            "expected_hours": expected,
+            "present_hours": np.bincount(key, weights=present, minlength=k).astype(int),
+            "duplicate_hours": dups,
+            "outlier_hours": np.bincount(key, weights=bad, minlength=k).astype(int),
+            "filled_hours": np.bincount(key, weights=filled, minlength=k).astype(int),
+            "missing_hours": np.bincount(key, weights=missing, minlength=k).astype(int),
+        }))
+    cov = pd.concat(frames, ignore_index=True)
+    cov = cov[cov["expected_hours"] > 0].reset_index(drop=True)
+    cov["coverage_pct"] = 100.0 * (1 - cov["missing_hours"] / cov["expected_hours"])
+    return cov
@@ -0,0 +1,66 @@
+﻿import numpy as np
+import pandas as pd
+
+from features import CDD_BASE, HDD_BASE
+
+# ce coloane se mută împreună pentru fiecare variabilă de scenariu
+SHIFT_COLUMNS = {
+    "temp": ["temp_c_mean", "temp_c_min", "temp_c_max", "temp_roll3", "temp_roll7"],
+    "rh": ["rh_pct_mean"],
+}
+CLIP = {"rh_pct_mean": (0.0, 100.0)}
+
+TEMP_DELTAS = np.round(np.arange(-10.0, 10.0 + 1e-9, 0.5), 2)
+# grila 2-D (temp x umiditate) e mai rară: nodurile se înmulțesc, restul vine din interpolare
+TEMP_DELTAS_COARSE = np.round(np.arange(-10.0, 10.0 + 1e-9, 2.0), 2)
+RH_DELTAS = np.round(np.arange(-20.0, 20.0 + 1e-9, 5.0), 2)
+
+def _shifted(X: np.ndarray, features: list, shifts: dict) -> np.ndarray:
+    # X: (n, f); shifts: {var: vector de delte (k,)} -> (k1, k2, ..., n, f) prin broadcasting
+    grids = np.meshgrid(*shifts.values(), indexing="ij") if shifts else []
+    shape = grids[0].shape if grids else ()
+    out = np.broadcast_to(X, shape + X.shape).copy()
+
+    for var, grid in zip(shifts, grids):
+        for col in SHIFT_COLUMNS[var]:
+            if col in features:
+                j = features.index(col)
+                out[..., j] += grid[..., None]
+                if col in CLIP:
+                    np.clip(out[..., j], *CLIP[col], out=out[..., j])
+
+    # degree-days derivate din temperatura medie
+    if "temp_c_mean" in features:
+        t = out[..., features.index("temp_c_mean")]
+        if "hdd" in features:
+            out[..., features.index("hdd")] = np.clip(HDD_BASE - t, 0, None)
+        if "cdd" in features:
+            out[..., features.index("cdd")] = np.clip(t - CDD_BASE, 0, None)
+    return out
+
+class ScenarioSurface:
+    # predicțiile modelului pe o grilă de delte, calculate într-un singur predict batch;
+    # mutarea slider-ului devine un lookup în array (+ interpolare liniară între nodurile grilei)
+
+    def __init__(self, model, X: pd.DataFrame, features: list, grids: dict):
+        self.vars = list(grids)
+        self.axes = [np.asarray(grids[v], dtype=float) for v in self.vars]
+        Xn = X[features].to_numpy(dtype=float)
+
+        big = _shifted(Xn, features, dict(zip(self.vars, self.axes)))
+        shape = big.shape[:-1]
+        pred = model.predict(pd.DataFrame(big.reshape(-1, len(features)), columns=features))
+        self.pred = pred.reshape(shape)
+
+    def lookup(self, *deltas) -> np.ndarray:
+        # interpolare (bi)liniară pe grilă; exact pe noduri
+        out = self.pred
+        for axis, d in zip(self.axes, deltas):
+            d = float(np.clip(d, axis[0], axis[-1]))
+            i = int(np.clip(np.searchsorted(axis, d) - 1, 0, len(axis) - 2)) if len(axis) > 1 else 0
+            if len(axis) == 1:
+                out = out[0]
+                continue
+            w = (d - axis[i]) / (axis[i + 1] - axis[i])
+            out = out[i] * (1 - w) + out[i + 1] * w
+        return out
@@ -0,0 +1,192 @@
+﻿import io
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from forest import FlatForest
+
+MODEL_PATH = "models/rf_model.joblib"
+FLAT_MODEL_PATH = "models/rf_model_flat"
+
+MAX_BATCH_ROWS = 8192
+MAX_WAIT_MS = 5.0
+
+ARROW_TYPES = ("application/vnd.apache.arrow.stream", "application/vnd.apache.arrow.file")
+
+def load_payload(path: str = MODEL_PATH) -> dict:
+    # director -> pădurea aplatizată din 07 (meta.json are aceleași chei ca payload-ul joblib)
+    if os.path.isdir(path):
+        model = FlatForest.load(path)
+        return dict(model.meta, model=model)
+    return joblib.load(path)
+
+def read_rows(body: bytes, content_type: str) -> pd.DataFrame:
+    # JSON: listă de rânduri, {"rows": [...]} sau {coloană: [valori]}; CSV cu header; Arrow IPC
+    content_type = (content_type or "application/json").split(";")[0].strip().lower()
+    if content_type in ARROW_TYPES:
+        return pa.ipc.open_stream(body).read_pandas() if content_type.endswith("stream") \
+            else pa.ipc.open_file(body).read_pandas()
+    if content_type in ("text/csv", "application/csv"):
+        return pd.read_csv(io.BytesIO(body))
+    if content_type == "application/json":
+        data = json.loads(body)
+        if isinstance(data, dict) and "rows" in data:
+            data = data["rows"]
+        return pd.DataFrame(data)
+    raise ValueError(f"Content-Type nesuportat: {content_type}")
+
+def read_file(path: str) -> pd.DataFrame:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    types = {".csv": "text/csv", ".json": "application/json", ".arrow": ARROW_TYPES[1], ".arrows": ARROW_TYPES[0]}
+    if ext not in types:
+        raise ValueError(f"Extensie nesuportată: {ext}")
+    with open(path, "rb") as fh:
+        return read_rows(fh.read(), types[ext])
+
+def validate(df: pd.DataFrame, features: list) -> np.ndarray:
+    # matricea în ordinea din payload["features"]; coloanele în plus sunt ignorate
+    # tot ce poate strica un lot comun e respins aici, înainte de coadă
+    if len(df) == 0:
+        raise ValueError("Niciun rând de prezis")
+    missing = [c for c in features if c not in df.columns]
+    if missing:
+        raise ValueError(f"Lipsesc coloanele: {missing}")
+    with np.errstate(over="ignore"):
+        X = df[features].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    # NaN = lipsă/nenumeric; inf = infinit sau în afara float32
+    bad = ~np.isfinite(X).all(axis=0)
+    if bad.any():
+        raise ValueError(f"Valori lipsă, nenumerice sau infinite în: {[f for f, b in zip(features, bad) if b]}")
+    return X
+
+class Predictor:
+    def __init__(self, payload: dict):
+        self.model = payload["model"]
+        self.features = list(payload["features"])
+        self.target = payload.get("target")
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        # sklearn primește DataFrame cu numele din fit (altfel warning); FlatForest ia direct array-ul
+        if not isinstance(self.model, FlatForest):
+            X = pd.DataFrame(X, columns=self.features)
+        return np.asarray(self.model.predict(X), dtype=float)
+
+class MicroBatcher:
+    # cererile concurente intră într-o coadă; un singur thread le adună (până la max_rows sau
+    # max_wait_ms de la prima) și evaluează arborii o dată pe tot lotul
+    def __init__(self, predictor: Predictor, max_rows: int = MAX_BATCH_ROWS, max_wait_ms: float = MAX_WAIT_MS):
+        self.predictor = predictor
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.rows = 0
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, X: np.ndarray) -> Future:
+        fut = Future()
+        self.queue.put((X, fut))
+        return fut
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.submit(X).result()
+
+    def _loop(self):
+        while True:
+            items = [self.queue.get()]
+            n = len(items[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while n < self.max_rows:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                try:
+                    items.append(self.queue.get(timeout=left))
+                except queue.Empty:
+                    break
+                n += len(items[-1][0])
+
+            try:
+                pred = self.predictor.predict(np.concatenate([x for x, _ in items]))
+            except Exception:
+                # lotul a eșuat -> fiecare cerere din nou, separat, ca eroarea să ajungă doar la cea vinovată
+                for x, fut in items:
+                    self._predict_one(x, fut)
+                continue
+            self.batches += 1
+            self.rows += n
+            bounds = np.cumsum([0] + [len(x) for x, _ in items])
+            for (_, fut), a, b in zip(items, bounds[:-1], bounds[1:]):
+                fut.set_result(pred[a:b])
+
+    def _predict_one(self, X: np.ndarray, fut: Future):
+        try:
+            pred = self.predictor.predict(X)
+        except Exception as e:
+            fut.set_exception(e)
+            return
+        self.batches += 1
+        self.rows += len(X)
+        fut.set_result(pred)
+
+def make_handler(batcher: MicroBatcher):
+    predictor = batcher.predictor
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, code: int, obj: dict):
+            body = json.dumps(obj).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"features": predictor.features, "target": predictor.target,
+                                 "batches": batcher.batches, "rows": batcher.rows})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"error": "not found"})
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                X = validate(read_rows(body, self.headers.get("Content-Type")), predictor.features)
+            except Exception as e:
+                self._send(400, {"error": str(e)})
+                return
+            try:
+                pred = batcher.predict(X)
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, {"predictions": pred.tolist()})
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+def serve(payload: dict, host: str = "127.0.0.1", port: int = 8000,
+          max_rows: int = MAX_BATCH_ROWS, max_wait_ms: float = MAX_WAIT_MS) -> ThreadingHTTPServer:
+    batcher = MicroBatcher(Predictor(payload), max_rows=max_rows, max_wait_ms=max_wait_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(batcher))
+    server.daemon_threads = True
+    return server
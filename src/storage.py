@@ -0,0 +1,118 @@
+﻿import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from zones import DEFAULT_ZONE
+
+# seturile finale, partiționate pe ani: <root>/year=YYYY/part-0.parquet, sortate după timp.
+# Fișierele unice vechi rămân ca fallback dacă store-ul nu a fost încă scris.
+DAILY_STORE = "data/final/daily"
+DAILY_LEGACY = "data/final/dataset_daily.parquet"
+HOURLY_STORE = "data/final/hourly"
+HOURLY_LEGACY = "data/final/dataset_hourly.parquet"
+# celelalte zone: data/final/zones/zone=XX/daily/year=YYYY/ (zona implicită rămâne în DAILY_STORE)
+ZONE_STORE = "data/final/zones"
+
+# row group ~ o lună: statisticile min/max per row group permit sărirea lunilor din afara intervalului
+DAILY_ROW_GROUP = 31
+HOURLY_ROW_GROUP = 31 * 24
+
+def daily_store(zone: str = DEFAULT_ZONE) -> str:
+    return DAILY_STORE if zone == DEFAULT_ZONE else os.path.join(ZONE_STORE, f"zone={zone}", "daily")
+
+def daily_path(zone: str = DEFAULT_ZONE) -> str:
+    store = daily_store(zone)
+    return store if os.path.isdir(store) or zone != DEFAULT_ZONE else DAILY_LEGACY
+
+def daily_zones() -> list:
+    # zonele cu set zilnic construit, zona implicită prima
+    zones = [DEFAULT_ZONE] if os.path.exists(daily_path()) else []
+    if os.path.isdir(ZONE_STORE):
+        zones += sorted(d.split("=", 1)[1] for d in os.listdir(ZONE_STORE)
+                        if d.startswith("zone=") and os.path.isdir(daily_store(d.split("=", 1)[1])))
+    return zones
+
+def hourly_path() -> str:
+    return HOURLY_STORE if os.path.isdir(HOURLY_STORE) else HOURLY_LEGACY
+
+def write_partitioned(df: pd.DataFrame, root: str, time_col: str, row_group_rows: int):
+    # rescrie tot store-ul într-un director temporar, apoi îl înlocuiește pe cel vechi
+    df = df.sort_values(time_col)
+    tmp = f"{root}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    for year, part in df.groupby(df[time_col].dt.year, sort=True):
+        out_dir = os.path.join(tmp, f"year={year}")
+        os.makedirs(out_dir)
+        table = pa.Table.from_pandas(part, preserve_index=False)
+        pq.write_table(table, os.path.join(out_dir, "part-0.parquet"),
+                       row_group_size=row_group_rows, write_statistics=True)
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(os.path.dirname(root) or ".", exist_ok=True)
+    os.replace(tmp, root)
+
+def partitions(root: str) -> dict:
+    # {an: fișier}, citit doar din numele directoarelor
+    out = {}
+    for name in sorted(os.listdir(root)):
+        if name.startswith("year="):
+            out[int(name.split("=", 1)[1])] = os.path.join(root, name, "part-0.parquet")
+    return out
+
+def files_for(path: str, start=None, end=None) -> list:
+    if not os.path.isdir(path):
+        return [path]
+    parts = partitions(path)
+    lo = pd.Timestamp(start).year if start is not None else min(parts, default=0)
+    hi = pd.Timestamp(end).year if end is not None else max(parts, default=0)
+    return [f for y, f in parts.items() if lo <= y <= hi]
+
+def read_range(path: str, time_col: str, start=None, end=None, columns=None) -> pd.DataFrame:
+    # [start, end) pe time_col; partițiile din afara anilor ceruți nu se deschid deloc,
+    # iar în fișierele rămase pyarrow sare row group-urile pe baza statisticilor
+    # niciun an în interval -> se deschide o singură partiție, doar pentru schemă
+    files = files_for(path, start, end) or files_for(path)[:1]
+    if columns is not None and time_col not in columns:
+        columns = [time_col] + list(columns)
+    dataset = ds.dataset(files, format="parquet")
+    field_type = dataset.schema.field(time_col).type
+
+    flt = None
+    if start is not None:
+        flt = ds.field(time_col) >= pa.scalar(pd.Timestamp(start), type=field_type)
+    if end is not None:
+        cond = ds.field(time_col) < pa.scalar(pd.Timestamp(end), type=field_type)
+        flt = cond if flt is None else flt & cond
+
+    df = dataset.to_table(columns=columns, filter=flt).to_pandas()
+    return df.sort_values(time_col).reset_index(drop=True)
+
+def time_bounds(path: str, time_col: str) -> tuple:
+    # (min, max) din statisticile row group-urilor, fără să citească datele
+    files = files_for(path)
+    lo, hi = [], []
+    for f in (files[0], files[-1]):
+        meta = pq.read_metadata(f)
+        j = meta.schema.to_arrow_schema().get_field_index(time_col)
+        for i in range(meta.num_row_groups):
+            stats = meta.row_group(i).column(j).statistics
+            lo.append(pd.Timestamp(stats.min))
+            hi.append(pd.Timestamp(stats.max))
+    return min(lo), max(hi)
+
+def version(path: str) -> tuple:
+    # identifică o versiune a setului (ieftin, doar stat pe fișiere)
+    out = []
+    for f in files_for(path):
+        info = os.stat(f)
+        out.append((f, info.st_mtime_ns, info.st_size))
+    return tuple(out)
+
+def read_daily(start=None, end=None, columns=None, zone: str = DEFAULT_ZONE) -> pd.DataFrame:
+    return read_range(daily_path(zone), "date", start, end, columns)
+
+def read_hourly(start=None, end=None, columns=None) -> pd.DataFrame:
+    return read_range(hourly_path(), "time", start, end, columns)
@@ -0,0 +1,148 @@
+﻿from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# formatele întâlnite în dump-urile ENTSO-E (ex: 01-01-2019 00:00 sau 10/08/2021 00:00)
+KNOWN_FORMATS = [
+    "%d-%m-%Y %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%d.%m.%Y %H:%M",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+]
+SAMPLE_SIZE = 64
+MAX_EXAMPLES = 5
+
+_WIDTH = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+_NS = {"H": 3_600 * 10**9, "M": 60 * 10**9, "S": 10**9}
+
+def fixed_layout(fmt: str):
+    # (lățime totală, {token: (offset, width)}, [(offset, caracter literal)])
+    # None dacă formatul are tokenuri de lățime variabilă
+    fields, lits, pos, i = {}, [], 0, 0
+    while i < len(fmt):
+        if fmt[i] == "%":
+            tok = fmt[i + 1]
+            if tok not in _WIDTH:
+                return None
+            fields[tok] = (pos, _WIDTH[tok])
+            pos += _WIDTH[tok]
+            i += 2
+        else:
+            lits.append((pos, ord(fmt[i])))
+            pos += 1
+            i += 1
+    return pos, fields, lits
+
+def parse_fixed(values: pd.Series, layout) -> np.ndarray:
+    # parse vectorizat pentru formate cu lățime fixă: citim codepoint-urile ca matrice (n x width)
+    # și calculăm câmpurile cu aritmetică pe întregi; rezultat datetime64[ns] cu NaT unde nu se potrivește
+    width, fields, lits = layout
+    out = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+
+    ok = (values.str.len() == width).to_numpy(dtype=bool, na_value=False)
+    if not ok.any():
+        return out
+
+    codes = values[ok].to_numpy(dtype=f"U{width}").view(np.uint32).reshape(-1, width)
+    valid = np.ones(len(codes), dtype=bool)
+    for pos, ch in lits:
+        valid &= codes[:, pos] == ch
+
+    nums = {}
+    for tok, (pos, w) in fields.items():
+        digits = codes[:, pos:pos + w].astype(np.int64) - 48
+        valid &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        nums[tok] = digits @ (10 ** np.arange(w - 1, -1, -1))
+
+    year, month, day = nums["Y"], nums["m"], nums["d"]
+    valid &= (month >= 1) & (month <= 12) & (day >= 1)
+    months = np.where(valid, (year - 1970) * 12 + (month - 1), 0)
+    first = months.astype("datetime64[M]").astype("datetime64[D]")
+    days_in_month = ((months + 1).astype("datetime64[M]").astype("datetime64[D]") - first).astype(np.int64)
+    valid &= day <= days_in_month
+
+    ns = first.astype("datetime64[ns]").astype(np.int64) + (day - 1) * 86_400 * 10**9
+    for tok, limit in (("H", 23), ("M", 59), ("S", 59)):
+        if tok in nums:
+            valid &= nums[tok] <= limit
+            ns = ns + nums[tok] * _NS[tok]
+
+    parsed = ns.view("datetime64[ns]").copy()
+    parsed[~valid] = np.datetime64("NaT")
+    out[ok] = parsed
+    return out
+
+class DateUTCParser:
+    # detectează formatul o singură dată per fișier (cheie), îl ține în cache și parsează fiecare
+    # valoare o singură dată; ce nu se potrivește cu niciun format e numărat, nu ascuns în NaT
+
+    def __init__(self, formats=KNOWN_FORMATS, sample_size: int = SAMPLE_SIZE):
+        self.formats = list(formats)
+        self.layouts = {fmt: fixed_layout(fmt) for fmt in self.formats}
+        self.sample_size = sample_size
+        self.cache = {}
+        self.rows = Counter()
+        self.unknown = Counter()
+        self.examples = {}
+
+    def _parse_one(self, values: pd.Series, fmt: str) -> np.ndarray:
+        layout = self.layouts[fmt]
+        if layout is not None:
+            return parse_fixed(values, layout)
+        return pd.to_datetime(values, format=fmt, errors="coerce").to_numpy(dtype="datetime64[ns]")
+
+    def detect(self, values: pd.Series):
+        sample = values.dropna().head(self.sample_size)
+        if sample.empty:
+            return None
+        best, best_hits = None, 0
+        for fmt in self.formats:
+            hits = int((~np.isnat(self._parse_one(sample, fmt))).sum())
+            if hits > best_hits:
+                best, best_hits = fmt, hits
+            if hits == len(sample):
+                break
+        return best
+
+    def parse(self, values: pd.Series, key=None) -> pd.Series:
+        fmt = self.cache.get(key)
+        if fmt is None:
+            fmt = self.detect(values)
+            if fmt is not None:
+                self.cache[key] = fmt
+
+        out = np.full(len(values), np.datetime64("NaT"), dtype="datetime64[ns]")
+        todo = np.asarray(values.notna(), dtype=bool)
+
+        # formatul din cache primul, apoi restul doar pe valorile rămase (fișiere cu formate amestecate)
+        order = ([fmt] if fmt else []) + [f for f in self.formats if f != fmt]
+        for f in order:
+            if not todo.any():
+                break
+            idx = np.flatnonzero(todo)
+            parsed = self._parse_one(values if len(idx) == len(values) else values.iloc[idx], f)
+            hit = ~np.isnat(parsed)
+            out[idx[hit]] = parsed[hit]
+            todo[idx[hit]] = False
+
+        self.rows[key] += len(values)
+        n_bad = int(todo.sum())
+        if n_bad:
+            self.unknown[key] += n_bad
+            ex = self.examples.setdefault(key, [])
+            ex.extend(values[todo].head(max(0, MAX_EXAMPLES - len(ex))).tolist())
+
+        return pd.Series(out, index=values.index, name=values.name)
+
+    def report(self) -> pd.DataFrame:
+        keys = sorted(self.rows, key=str)
+        return pd.DataFrame({
+            "key": keys,
+            "format": [self.cache.get(k) for k in keys],
+            "rows": [self.rows[k] for k in keys],
+            "unknown": [self.unknown[k] for k in keys],
+            "examples": [self.examples.get(k, []) for k in keys],
+        })
@@ -0,0 +1,142 @@
+﻿import json
+import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+
+from backtest import make_folds, run_backtest
+
+BEST_CONFIG = "results/best_config.json"
+
+ESTIMATORS = {
+    "RandomForest": RandomForestRegressor,
+    "HistGradientBoosting": HistGradientBoostingRegressor,
+}
+
+# spațiul de căutare: fiecare candidat ia câte o valoare din fiecare listă
+SPACE = {
+    "RandomForest": {
+        "n_estimators": [200, 300, 500, 800],
+        "max_depth": [None, 12, 20],
+        "min_samples_leaf": [1, 2, 5, 10],
+        "max_features": [1.0, 0.6, 0.33],
+        "max_samples": [None, 0.5, 0.8],
+    },
+    "HistGradientBoosting": {
+        "learning_rate": [0.03, 0.05, 0.1, 0.2],
+        "max_iter": [200, 400, 800],
+        "max_leaf_nodes": [15, 31, 63],
+        "min_samples_leaf": [5, 10, 20, 40],
+        "l2_regularization": [0.0, 0.1, 1.0],
+    },
+}
+# parametri ficși (reproductibilitate; paralelismul e între procese, nu în interiorul modelului)
+FIXED = {
+    "RandomForest": {"random_state": 42, "n_jobs": 1},
+    "HistGradientBoosting": {"random_state": 42, "early_stopping": False},
+}
+
+def sample_configs(models: list, n: int, seed: int = 0) -> list:
+    # n candidați distincți, împărțiți cât mai egal între modele
+    rng = np.random.default_rng(seed)
+    out, seen = [], set()
+    for _ in range(n * 20):
+        if len(out) >= n:
+            break
+        model = models[len(out) % len(models)]
+        params = {k: v[rng.integers(len(v))] for k, v in SPACE[model].items()}
+        params = {k: (v.item() if isinstance(v, np.generic) else v) for k, v in params.items()}
+        key = (model, json.dumps(params, sort_keys=True))
+        if key not in seen:
+            seen.add(key)
+            out.append({"id": f"c{len(out):03d}", "model": model, "params": params})
+    return out
+
+def make_estimator(config: dict):
+    return ESTIMATORS[config["model"]](**config["params"], **FIXED[config["model"]])
+
+def tuning_folds(dates: pd.Series, months: int, min_train_days: int = 2 * 365) -> list:
+    # fold-uri lunare expanding pe ultimele `months` luni din train; cel mai recent primul,
+    # ca rundele mici de successive halving să evalueze pe datele cele mai apropiate de test
+    folds = make_folds(dates, freq="month", mode="expanding", min_train_days=min_train_days)
+    return folds[-months:][::-1]
+
+def full_search(X: np.ndarray, y: np.ndarray, folds: list, configs: list, workers: int = None) -> pd.DataFrame:
+    # varianta naivă: fiecare candidat pe toate fold-urile
+    by_id = {c["id"]: c for c in configs}
+    models = {cid: partial(make_estimator, c) for cid, c in by_id.items()}
+    res = run_backtest(X, y, folds, models, workers=workers)
+    res["rung"] = 0
+    return rank_results(res, by_id)
+
+def successive_halving(X: np.ndarray, y: np.ndarray, folds: list, configs: list, eta: int = 3,
+                       min_folds: int = 1, workers: int = None, log=print) -> pd.DataFrame:
+    # resursa = numărul de fold-uri evaluate; la fiecare rundă rămâne cel mai bun 1/eta din candidați,
+    # iar supraviețuitorii sunt evaluați doar pe fold-urile noi (cele vechi sunt deja calculate)
+    by_id = {c["id"]: c for c in configs}
+    alive = list(by_id)
+    done = []
+    rung, n_folds = 0, min_folds
+
+    while True:
+        n_folds = min(n_folds, len(folds))
+        have = {(r["fold"], r["model"]) for r in done}
+        pairs = [(f, cid) for cid in alive for f in folds[:n_folds] if (f[0], cid) not in have]
+        # toate perechile (fold, candidat) ale rundei într-un singur pool de procese
+        models = {cid: partial(make_estimator, by_id[cid]) for cid in alive}
+        res = run_backtest(X, y, folds[:n_folds], models, workers=workers, pairs=pairs)
+        res["rung"] = rung
+        done.extend(res.to_dict("records"))
+
+        scores = pd.DataFrame(done)
+        scores = scores[scores["model"].isin(alive) & scores["fold"].isin([f[0] for f in folds[:n_folds]])]
+        ranked = scores.groupby("model")["RMSE"].mean().sort_values()
+        log(f"rung {rung}: {len(alive)} candidates x {n_folds} folds | best RMSE {ranked.iloc[0]:.2f} ({ranked.index[0]})")
+
+        if len(alive) <= 1 or n_folds >= len(folds):
+            break
+        alive = ranked.index[:max(1, len(alive) // eta)].tolist()
+        rung += 1
+        n_folds *= eta
+
+    return rank_results(pd.DataFrame(done), by_id)
+
+def rank_results(per_fold: pd.DataFrame, by_id: dict) -> pd.DataFrame:
+    agg = per_fold.groupby("model").agg(
+        folds=("fold", "count"), RMSE_mean=("RMSE", "mean"), RMSE_std=("RMSE", "std"),
+        MAE_mean=("MAE", "mean"), fit_seconds=("fit_seconds", "sum"), rung=("rung", "max"),
+    ).reset_index().rename(columns={"model": "id"})
+    agg["model"] = agg["id"].map(lambda c: by_id[c]["model"])
+    agg["params"] = agg["id"].map(lambda c: json.dumps(by_id[c]["params"], sort_keys=True))
+    # candidații care au ajuns mai departe au fost evaluați pe mai multe fold-uri -> primii în clasament
+    agg = agg.sort_values(["folds", "RMSE_mean"], ascending=[False, True]).reset_index(drop=True)
+    agg.insert(0, "rank", np.arange(1, len(agg) + 1))
+    return agg
+
+def save_best(ranked: pd.DataFrame, path: str = BEST_CONFIG, extra: dict = None):
+    best = ranked.iloc[0]
+    config = {"model": best["model"], "params": json.loads(best["params"]),
+              "RMSE_mean": float(best["RMSE_mean"]), "folds": int(best["folds"])}
+    config.update(extra or {})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(config, fh, indent=2)
+    return config
+
+def load_best(path: str = BEST_CONFIG):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+def final_estimator(path: str = BEST_CONFIG) -> tuple:
+    # configurația aleasă de 13_tune.py; fără ea, RF-ul implicit (500 de arbori) folosit până acum în 07/08
+    best = load_best(path)
+    if best is None:
+        return "RandomForest", RandomForestRegressor(n_estimators=500, random_state=42, n_jobs=-1)
+    est = make_estimator(best)
+    if "n_jobs" in est.get_params():
+        est.set_params(n_jobs=-1)
+    return best["model"], est
@@ -0,0 +1,59 @@
+﻿import os
+
+import numpy as np
+import pandas as pd
+
+WEATHER_VARS = ["temp_c", "precip_mm", "wind_ms", "rh_pct"]
+
+def read_station_frames(station_dir: str, stations) -> pd.DataFrame:
+    # toate stațiile într-un singur DataFrame lung (station, time, variabile)
+    frames = []
+    for station in stations:
+        path = os.path.join(station_dir, f"{station}.parquet")
+        if not os.path.exists(path):
+            print("Lipsește stația:", path)
+            continue
+        df = pd.read_parquet(path, columns=["time"] + WEATHER_VARS)
+        df["station"] = station
+        frames.append(df)
+    if not frames:
+        raise FileNotFoundError(f"Nu găsesc nicio stație în {station_dir}")
+    return pd.concat(frames, ignore_index=True)
+
+def stack_stations(long: pd.DataFrame, stations, variables=WEATHER_VARS):
+    # (station x hour x var) float32; o singură scriere vectorizată, fără join-uri între stații
+    times = pd.DatetimeIndex(np.unique(pd.to_datetime(long["time"]).to_numpy()))
+    s_idx = pd.Index(stations).get_indexer(long["station"])
+    t_idx = times.get_indexer(pd.to_datetime(long["time"]))
+
+    stack = np.full((len(stations), len(times), len(variables)), np.nan, dtype=np.float32)
+    stack[s_idx, t_idx, :] = long[variables].to_numpy(dtype=np.float32)
+    return times, stack
+
+def weighted_reduce(stack: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    # medie ponderată pe axa stațiilor; ponderile se renormalizează acolo unde lipsesc valori
+    s = stack.shape[0]
+    flat = stack.reshape(s, -1)
+    valid = ~np.isnan(flat)
+    w = np.asarray(weights, dtype=np.float32)
+
+    num = w @ np.where(valid, flat, 0).astype(np.float32)
+    den = w @ valid.astype(np.float32)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(den > 0, num / den, np.nan)
+    return out.reshape(stack.shape[1:])
+
+def weighted_hourly(station_dir: str, weights: pd.DataFrame, weight_col: str = "population") -> pd.DataFrame:
+    # weights: coloane station + weight_col (ex. populația) -> semnal meteo orar național
+    weights = weights[weights[weight_col] > 0]
+    stations = weights["station"].tolist()
+    long = read_station_frames(station_dir, stations)
+
+    present = [s for s in stations if s in set(long["station"])]
+    w = weights.set_index("station").loc[present, weight_col].to_numpy(dtype=np.float64)
+    times, stack = stack_stations(long, present)
+    values = weighted_reduce(stack, w / w.sum())
+
+    out = pd.DataFrame(values.astype(np.float64), columns=WEATHER_VARS)
+    out.insert(0, "time", times)
+    return out
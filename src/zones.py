@@ -0,0 +1,72 @@
+﻿import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from threadpoolctl import threadpool_limits
+
+# zona implicită păstrează căile de dinainte (date/modele RO fără sufix de zonă)
+DEFAULT_ZONE = "RO"
+
+# consumul orar al tuturor țărilor, scris de 01 într-o singură trecere: zone=XX/year=YYYY/month=MM/
+LOAD_STORE = "data/processed/entsoe_hourly"
+LOAD_LEGACY_RO = ["data/processed/entsoe_ro_hourly", "data/processed/entsoe_ro_hourly.parquet"]
+
+# stațiile meteo: un parquet per stație (partajat între zone), iar lista stațiilor unei zone,
+# cu ponderile (populația), în stations_<zonă>.csv
+STATIONS_DIR = "data/raw/openmeteo/stations"
+STATIONS_LIST = "data/raw/openmeteo/stations_{zone}.csv"
+
+MODELS_DIR = "models"
+ZONE_MODELS = "models/zones"
+
+def load_path(zone: str = DEFAULT_ZONE):
+    path = os.path.join(LOAD_STORE, f"zone={zone}")
+    if os.path.isdir(path):
+        return path
+    if zone == DEFAULT_ZONE:
+        return next((p for p in LOAD_LEGACY_RO if os.path.exists(p)), path)
+    return path
+
+def stations_list(zone: str = DEFAULT_ZONE) -> str:
+    return STATIONS_LIST.format(zone=zone.lower())
+
+def load_zones() -> list:
+    # zonele cu consum ingerat (din numele directoarelor, fără să citească datele)
+    zones = sorted(d.split("=", 1)[1] for d in os.listdir(LOAD_STORE) if d.startswith("zone=")) \
+        if os.path.isdir(LOAD_STORE) else []
+    if DEFAULT_ZONE not in zones and os.path.exists(load_path(DEFAULT_ZONE)):
+        zones = [DEFAULT_ZONE] + zones
+    return zones
+
+def station_zones() -> list:
+    # zonele care au o listă de stații
+    pattern = STATIONS_LIST.format(zone="*")
+    prefix, suffix = pattern.split("*")
+    return sorted(p[len(prefix):-len(suffix)].upper() for p in glob.glob(pattern))
+
+def available_zones() -> list:
+    # consum + meteo -> se poate construi setul zilnic
+    with_stations = set(station_zones())
+    return [z for z in load_zones() if z in with_stations]
+
+def model_paths(zone: str = DEFAULT_ZONE) -> tuple:
+    # (payload joblib, pădurea aplatizată)
+    root = MODELS_DIR if zone == DEFAULT_ZONE else os.path.join(ZONE_MODELS, f"zone={zone}")
+    return os.path.join(root, "rf_model.joblib"), os.path.join(root, "rf_model_flat")
+
+def parse_zones(items, default) -> list:
+    # --zones RO DE ... ; "all" sau nimic -> default (ex. toate zonele disponibile)
+    if not items or items == ["all"]:
+        return list(default)
+    return [z.upper() for z in items]
+
+def _init_worker():
+    # un fir BLAS/OpenMP per proces: paralelismul e între zone
+    threadpool_limits(1)
+
+def map_zones(fn, zones: list, workers: int = None) -> dict:
+    # fn(zone) pentru fiecare zonă; o singură zonă (sau workers=1) -> în procesul curent
+    if len(zones) <= 1 or workers == 1:
+        return {z: fn(z) for z in zones}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return dict(zip(zones, pool.map(fn, zones)))